@@ -0,0 +1,85 @@
+"""
+Compare the decoding of Orders API responses with and without the session decoder.
+
+``response.json()`` decodes the body to text and then parses it with the standard
+library. The session decoder parses the body bytes directly, using `orjson` if it is
+installed.
+
+Run with::
+
+    python -m benchmarks.bench_json_decoding --per-page 100 500 1000
+"""
+
+import argparse
+import json
+import timeit
+
+import requests
+
+from pywowcher.wowcher_session import get_default_json_decoder
+
+from .bench_order_memory import load_order_data
+
+
+def make_response(per_page):
+    """Return a :class:`requests.Response` containing a page of per_page orders."""
+    body = {
+        "message": "Orders retrieved",
+        "data": {
+            "total": per_page,
+            "per_page": per_page,
+            "current_page": 1,
+            "last_page": 1,
+            "next_page_url": None,
+            "prev_page_url": None,
+            "from": 1,
+            "to": per_page,
+            "data": load_order_data(per_page),
+        },
+    }
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+def measure(function, repeat, number):
+    """Return the fastest time per call of function in milliseconds."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--per-page", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    decoder = get_default_json_decoder()
+    decoder_name = "{}.{}".format(decoder.__module__, decoder.__name__)
+    print("session decoder: {}".format(decoder_name))
+    print(
+        "{:>10}{:>12}{:>20}{:>20}{:>10}".format(
+            "per_page", "KiB", "response.json() ms", "session ms", "speedup"
+        )
+    )
+    for per_page in args.per_page:
+        response = make_response(per_page)
+
+        def response_json():
+            response._content_consumed = True
+            response.encoding = None
+            return response.json()
+
+        old = measure(response_json, args.repeat, args.number)
+        new = measure(lambda: decoder(response.content), args.repeat, args.number)
+        print(
+            "{:>10}{:>12.0f}{:>20.2f}{:>20.2f}{:>9.1f}x".format(
+                per_page, len(response.content) / 1024, old, new, old / new
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compare the memory use and construction time of WowcherOrder and WowcherItem.
+
+The current slot based classes are compared with equivalent classes that store their
+attributes in a per-instance ``__dict__``, as the classes did before they used
+``__slots__``, and with LazyWowcherOrder before any attribute has been read. The
+order dicts kept by LazyWowcherOrder exist before measurement and are not counted.
+
+Run with::
+
+    python -m benchmarks.bench_order_memory --orders 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import timeit
+import tracemalloc
+
+from pywowcher import WowcherItem, WowcherOrder
+from pywowcher.operations.getorders import LazyWowcherOrder
+
+ORDER_RESPONSE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "order_response.json",
+)
+
+
+class DictWowcherItem:
+    """A WowcherItem storing its attributes in a ``__dict__``."""
+
+    def __init__(self, item_data):
+        self.sku = item_data[WowcherItem.SKU]
+        self.quantity = item_data[WowcherItem.QUANTITY]
+        self.options = item_data[WowcherItem.OPTIONS]
+
+
+class DictWowcherOrder:
+    """A WowcherOrder storing its attributes in a ``__dict__``."""
+
+    fields = WowcherOrder.fields
+
+    def __init__(self, order_data):
+        self.order_id = order_data["id"]
+        self.items = [DictWowcherItem(item_data) for item_data in order_data["items"]]
+        for field in self.fields:
+            setattr(self, field, order_data[field])
+
+
+def load_order_data(count):
+    """Return a list of count distinct order dicts based on the test response."""
+    with open(ORDER_RESPONSE, "r") as f:
+        template = json.load(f)["data"]["data"]
+    orders = []
+    for i in range(count):
+        order = dict(template[i % len(template)])
+        order["id"] = str(i)
+        order["wowcher_code"] = "CODE-{:08d}".format(i)
+        order["items"] = [dict(item) for item in order["items"]]
+        orders.append(order)
+    return orders
+
+
+def measure_memory(order_class, order_data):
+    """Return the bytes allocated to hold instances of order_class for order_data."""
+    gc.collect()
+    tracemalloc.start()
+    orders = [order_class(data) for data in order_data]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return size
+
+
+def measure_time(order_class, order_data, repeat):
+    """Return the fastest time taken to create instances of order_class."""
+    return min(
+        timeit.repeat(
+            lambda: [order_class(data) for data in order_data], number=1, repeat=repeat
+        )
+    )
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    order_data = load_order_data(args.orders)
+    results = {}
+    for name, order_class in (
+        ("dict", DictWowcherOrder),
+        ("slots", WowcherOrder),
+        ("lazy", LazyWowcherOrder),
+    ):
+        results[name] = (
+            measure_memory(order_class, order_data),
+            measure_time(order_class, order_data, args.repeat),
+        )
+    print("{} orders".format(args.orders))
+    print(
+        "{:<8}{:>16}{:>16}{:>16}".format("class", "total MiB", "bytes/order", "build s")
+    )
+    for name, (size, seconds) in results.items():
+        print(
+            "{:<8}{:>16.1f}{:>16.0f}{:>16.3f}".format(
+                name, size / 2**20, size / args.orders, seconds
+            )
+        )
+    dict_size, dict_time = results["dict"]
+    slots_size, slots_time = results["slots"]
+    print(
+        "slots use {:.0%} of the memory and {:.0%} of the time.".format(
+            slots_size / dict_size, slots_time / dict_time
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Measure the throughput of get_orders and set_order_status against a local fake server.
+
+A :class:`pywowcher.fakeserver.FakeWowcherServer` serves synthetic pages of orders
+with a configurable page count, page size, latency and payload size. For each
+`max_workers` setting the benchmark reports orders per second, requests per second,
+request latency percentiles and peak Python memory. Peak memory is measured in a
+separate run because tracing allocations slows the client.
+
+Run with::
+
+    python -m benchmarks.bench_throughput --pages 50 --per-page 100 --latency 0.02
+"""
+
+import argparse
+import threading
+import time
+import tracemalloc
+
+import pywowcher
+from pywowcher import hooks
+from pywowcher.fakeserver import FakeWowcherServer
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class LatencyRecorder:
+    """Record the latency of every API request using the session hooks."""
+
+    def __init__(self):
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        pywowcher.session.hooks.register(hooks.AFTER_RESPONSE, self.record)
+        return self
+
+    def __exit__(self, *args):
+        pywowcher.session.hooks.unregister(hooks.AFTER_RESPONSE, self.record)
+
+    def record(self, event):
+        with self._lock:
+            self.latencies.append(event.total_time)
+
+
+def use_server(server):
+    """Send pywowcher requests to server."""
+    pywowcher.session.set_credentials(
+        live_key="live",
+        live_secret_token="live",
+        staging_key="staging",
+        staging_secret_token="staging",
+        use_staging=True,
+    )
+    pywowcher.session.STAGING_DOMAIN = server.url
+    pywowcher.session.configure_transport(pool_maxsize=64)
+
+
+def run(function, repeat):
+    """
+    Call function repeat times and return the fastest result.
+
+    :returns: (seconds, requests, latencies) for the fastest run.
+    """
+    best = None
+    for _ in range(repeat):
+        with LatencyRecorder() as recorder:
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+        result = (seconds, len(recorder.latencies), recorder.latencies)
+        if best is None or seconds < best[0]:
+            best = result
+    return best
+
+
+def peak_memory(function):
+    """Return the peak Python memory allocated while calling function, in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def print_header(title):
+    print(title)
+    print(
+        "{:>8}{:>12}{:>12}".format("workers", "orders/s", "requests/s")
+        + "".join("{:>10}".format("p{} ms".format(p)) for p in PERCENTILES)
+        + "{:>12}".format("peak MiB")
+    )
+
+
+def print_row(workers, items, seconds, requests, latencies, memory):
+    print(
+        "{:>8}{:>12.0f}{:>12.1f}".format(
+            workers or 1, items / seconds, requests / seconds
+        )
+        + "".join(
+            "{:>10.1f}".format(percentile(latencies, p) * 1000) for p in PERCENTILES
+        )
+        + "{:>12.1f}".format(memory / 2**20)
+    )
+
+
+def bench_get_orders(server, max_workers, repeat):
+    """Print the throughput of get_orders for each max_workers setting."""
+    print_header(
+        "get_orders: {} pages of {} orders".format(server.last_page, server.per_page)
+    )
+    for workers in max_workers:
+
+        def get_orders():
+            orders = pywowcher.get_orders(
+                deal_id=1, max_workers=workers, per_page=server.per_page
+            )
+            assert len(orders) == server.orders
+
+        seconds, requests, latencies = run(get_orders, repeat)
+        memory = peak_memory(get_orders)
+        print_row(workers, server.orders, seconds, requests, latencies, memory)
+
+
+def bench_set_order_status(orders, chunk_size, max_workers, repeat):
+    """Print the throughput of set_order_status for each max_workers setting."""
+    updates = [
+        pywowcher.make_order_status(
+            reference="CODE-{:010d}".format(i), status=pywowcher.DISPATCHED
+        )
+        for i in range(orders)
+    ]
+    print_header(
+        "set_order_status: {} orders in chunks of {}".format(orders, chunk_size)
+    )
+    for workers in max_workers:
+
+        def set_order_status():
+            pywowcher.set_order_status(
+                updates, chunk_size=chunk_size, max_workers=workers
+            )
+
+        seconds, requests, latencies = run(set_order_status, repeat)
+        memory = peak_memory(set_order_status)
+        print_row(workers, orders, seconds, requests, latencies, memory)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--max-workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--status-orders", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with FakeWowcherServer(
+        orders=args.pages * args.per_page,
+        per_page=args.per_page,
+        latency=args.latency,
+        padding=args.padding,
+    ) as server:
+        use_server(server)
+        print("latency {:.0f} ms".format(args.latency * 1000))
+        bench_get_orders(server, args.max_workers, args.repeat)
+        print()
+        bench_set_order_status(
+            args.status_orders, args.chunk_size, args.max_workers, args.repeat
+        )
+        pywowcher.session.close()
+
+
+if __name__ == "__main__":
+    main()
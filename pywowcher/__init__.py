@@ -9,8 +9,16 @@ Features
 Pywowcher allows you to:
 
 - Retrieve orders for a current deal (:func:`pywowcher.get_orders`).
+- Stream orders for a deal page by page (:func:`pywowcher.iter_orders`).
+- Retrieve only new or changed orders for a deal (:func:`pywowcher.sync_orders`).
+- Retrieve orders for many deals at once (:func:`pywowcher.get_orders_for_deals`).
+- Export the orders for a deal to an NDJSON or CSV file (:func:`pywowcher.export_orders`).
 - Update the status of an order (:func:`pywowcher.set_order_status`).
+- Send status updates made one at a time in batches (:class:`pywowcher.StatusWriter`).
+- Update only the orders whose status would change
+  (:func:`pywowcher.reconcile_order_status`).
 - Make an echo test to the Wowcher server (:func:`pywowcher.echo_test`).
+- Do all of the above from :mod:`asyncio` code (:mod:`pywowcher.aio`).
 
 """
 
@@ -21,9 +29,19 @@ from .__version__ import __copyright__, __license__, __release__  # NOQA
 import logging
 from .wowcher_session import session  # NOQA
 from . import api_methods  # NOQA
+from . import credentials  # NOQA
+from .concurrency import AdaptiveConcurrency  # NOQA
+from .pagesize import PageSizeTuner  # NOQA
 from .operations.echotest import echo_test  # NOQA
-from .operations.getorders import get_orders, WowcherOrder, WowcherItem  # NOQA
+from .operations.getorders import get_orders, iter_orders  # NOQA
+from .operations.getorders import WowcherOrder, WowcherItem  # NOQA
+from .operations.syncorders import sync_orders  # NOQA
+from .operations.getordersfordeals import get_orders_for_deals  # NOQA
+from .operations.exportorders import export_orders  # NOQA
 from .operations.setorderstatus import set_order_status, make_order_status  # NOQA
+from .operations.statuswriter import StatusWriter  # NOQA
+from .operations.reconcilestatus import reconcile_order_status  # NOQA
+from . import aio  # NOQA
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
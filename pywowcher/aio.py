@@ -0,0 +1,284 @@
+"""
+Asynchronous versions of the pywowcher operations.
+
+These mirror :func:`pywowcher.get_orders`, :func:`pywowcher.set_order_status` and
+:func:`pywowcher.echo_test` but must be awaited from a running :mod:`asyncio` event
+loop. Requests are made using :attr:`pywowcher.session.async_transport` unless another
+:class:`pywowcher.transport.AsyncWowcherTransport` is passed. The `aiohttp` package is
+required.
+"""
+
+import asyncio
+
+from pywowcher import api_methods
+from pywowcher.operations.getorders import GetOrders
+from pywowcher.operations.setorderstatus import (
+    SetOrderStatus,
+    StatusChunkResult,
+    StatusReport,
+)
+
+
+class AsyncGetOrders(GetOrders):
+    """Request all pages for an Orders API method call asynchronously."""
+
+    def __init__(
+        self,
+        *,
+        deal_id,
+        from_date=None,
+        start_date=None,
+        end_date=None,
+        max_concurrency=None,
+        transport=None
+    ):
+        """
+        Set the request parameters. Await :meth:`run` to collect the orders.
+
+        :param deal_id: The ID of the Wowcher deal for which to collect orders.
+        :type deal_id: str or int
+
+        :param from_date: When to retrieve orders from.
+        :type from_date: datetime.datetime
+
+        :param start_date: Filter orders using a start date.
+        :type start_date: datetime.datetime
+
+        :param end_date: Filter orders using a end date.
+        :type end_date: datetime.datetime
+
+        :param max_concurrency: The maximum number of pages to request at once. If None
+            all remaining pages are requested at once, limited only by the transport's
+            connection pool.
+        :type max_concurrency: int or None
+
+        :param transport: The transport with which to make requests.
+        :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+        """
+        self.set_parameters(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self.orders = []
+
+    async def run(self):
+        """
+        Request every page of orders and return the collected orders.
+
+        :rtype: list of :class:`pywowcher.WowcherOrder`
+        """
+        response_data = await self.make_order_request_async(1)
+        self.set_page_count(response_data)
+        self.add_orders(response_data)
+        if self.max_concurrency is None:
+            semaphore = None
+        else:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        pages = range(2, self.page_count + 1)
+        responses = await asyncio.gather(
+            *(self.make_order_request_async(page, semaphore) for page in pages)
+        )
+        for response_data in responses:
+            self.add_orders(response_data)
+        return self.orders
+
+    async def make_order_request_async(self, page, semaphore=None):
+        """
+        Return the response to an Orders request for a page of orders.
+
+        :pram page: Page number to request.
+        :type page: int
+
+        :param semaphore: A semaphore to acquire while the request is made.
+        :type semaphore: :class:`asyncio.Semaphore` or None
+
+        :rtype: dict
+        """
+        method = self.make_orders_method(page)
+        if semaphore is None:
+            return await method.call_async(transport=self.transport)
+        async with semaphore:
+            return await method.call_async(transport=self.transport)
+
+
+class AsyncSetOrderStatus(SetOrderStatus):
+    """Set the status of one or more orders asynchronously."""
+
+    def __init__(
+        self,
+        *,
+        orders,
+        chunk_size=None,
+        max_concurrency=None,
+        raise_errors=True,
+        transport=None
+    ):
+        """
+        Prepare the orders. Await :meth:`run` to send the update.
+
+        :param orders: list containing dicts of orders formatted for a status update.
+            These can be created with :func:`pywowcher.make_order_status`.
+
+        :param chunk_size: The maximum number of orders to send in a single request. If
+            None all orders are sent in one request.
+        :type chunk_size: int or None
+
+        :param max_concurrency: The maximum number of chunks to send at once. If None
+            chunks are sent one at a time.
+        :type max_concurrency: int or None
+
+        :param raise_errors: If True an exception is raised after every chunk has been
+            sent if any chunk failed, as by
+            :meth:`pywowcher.operations.setorderstatus.StatusReport.raise_for_errors`.
+        :type raise_errors: bool
+
+        :param transport: The transport with which to make requests.
+        :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+
+        :ivar report: The :class:`pywowcher.operations.setorderstatus.StatusReport`
+            for the update, once :meth:`run` has completed.
+        """
+        self.orders = orders
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.raise_errors = raise_errors
+        self.transport = transport
+        self.orders_to_send = self.prepare_orders(orders)
+        self.report = None
+
+    async def run(self):
+        """
+        Send each chunk of the status update and return the report.
+
+        :rtype: :class:`pywowcher.operations.setorderstatus.StatusReport`
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency or 1)
+        results = await asyncio.gather(
+            *(
+                self.send_chunk_async(index, chunk, semaphore)
+                for index, chunk in enumerate(self.make_chunks())
+            )
+        )
+        self.report = StatusReport(results)
+        if self.raise_errors:
+            self.report.raise_for_errors()
+        return self.report
+
+    async def send_chunk_async(self, index, orders, semaphore):
+        """
+        Send a status update for orders and return a :class:`StatusChunkResult`.
+
+        :param semaphore: A semaphore to acquire while the request is made.
+        :type semaphore: :class:`asyncio.Semaphore`
+        """
+        method = self.make_status_method(orders)
+        try:
+            async with semaphore:
+                response = await method.call_async(transport=self.transport)
+        except Exception as e:
+            return StatusChunkResult(index=index, orders=orders, error=e)
+        return StatusChunkResult(index=index, orders=orders, response=response)
+
+
+async def echo_test(message, *, transport=None):
+    """
+    Make an echo test to the Wowcher servers asynchronously.
+
+    See :func:`pywowcher.echo_test`.
+
+    :param message: Data to be sent as JSON to Wowcher.
+    :type message: dict or list
+
+    :param transport: The transport with which to make the request.
+    :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+
+    :rtype: dict or list
+    """
+    return await api_methods.EchoTest(message).call_async(transport=transport)
+
+
+async def get_orders(
+    *,
+    deal_id,
+    from_date=None,
+    start_date=None,
+    end_date=None,
+    max_concurrency=None,
+    transport=None
+):
+    """
+    Return a list of customer orders for a Wowcher deal asynchronously.
+
+    After the first page has been received all remaining pages are requested
+    concurrently. See :func:`pywowcher.get_orders`.
+
+    :param deal_id: The ID of the Wowcher deal for which to collect orders.
+    :type deal_id: int or str
+
+    :param from_date: When to retrieve orders from.
+    :type from_date:  :class:`datetime.datetime` or None
+
+    :param start_date: Filter orders using a start date.
+    :type start_date:  :class:`datetime.datetime` or None
+
+    :param end_date: Filter orders using a end date.
+    :type end_date:  :class:`datetime.datetime` or None
+
+    :param max_concurrency: The maximum number of pages to request at once.
+    :type max_concurrency: int or None
+
+    :param transport: The transport with which to make requests.
+    :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+
+    :rtype: list of :class:`pywowcher.WowcherOrder`
+    """
+    return await AsyncGetOrders(
+        deal_id=deal_id,
+        from_date=from_date,
+        start_date=start_date,
+        end_date=end_date,
+        max_concurrency=max_concurrency,
+        transport=transport,
+    ).run()
+
+
+async def set_order_status(
+    orders, *, chunk_size=None, max_concurrency=None, raise_errors=True, transport=None
+):
+    """
+    Set the status of one or more orders asynchronously.
+
+    Updates are split into chunks as by :func:`pywowcher.set_order_status`. A failed
+    chunk does not prevent the other chunks being sent.
+
+    :param orders: list containing dicts of orders formatted for a status update. These
+        can be created with :func:`pywowcher.make_order_status`.
+
+    :param chunk_size: The maximum number of orders to send in a single request. If
+        None all orders are sent in one request.
+    :type chunk_size: int or None
+
+    :param max_concurrency: The maximum number of chunks to send at once. If None
+        chunks are sent one at a time.
+    :type max_concurrency: int or None
+
+    :param raise_errors: If True an exception is raised once every chunk has been sent
+        if any chunk failed, as by :func:`pywowcher.set_order_status`.
+    :type raise_errors: bool
+
+    :param transport: The transport with which to make requests.
+    :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+
+    :rtype: :class:`pywowcher.operations.setorderstatus.StatusReport`
+    """
+    return await AsyncSetOrderStatus(
+        orders=orders,
+        chunk_size=chunk_size,
+        max_concurrency=max_concurrency,
+        raise_errors=raise_errors,
+        transport=transport,
+    ).run()
@@ -1,9 +1,12 @@
 """The BaseAPIMethod class."""
 
 import logging
+import time
 
 import requests
 
+from .. import hooks
+from ..transport import RetryPolicy
 from ..wowcher_session import session
 
 logger = logging.getLogger(__name__)
@@ -24,14 +27,118 @@ class BaseAPIMethod:
 
     request_methods = {POST: requests.post, GET: requests.get, PUT: requests.put}
 
+    retry_policy = RetryPolicy()
+
+    cacheable = False
+    use_cache = True
+
     def __init__(self, *args, **kwargs):
         """Create API request."""
         self.prepare_data(*args, **kwargs)
 
     def call(self):
         """Make the API request."""
-        self.response = self.make_request()
-        return self.process_response(self.response)
+        event = self.make_event()
+        try:
+            hit, cached_response = self.get_cached_response()
+            if hit:
+                return cached_response
+            self.before_request(event)
+            self.response = self.make_request()
+            processed_response = self.after_response(event)
+        except Exception as e:
+            self.on_error(event, e)
+            raise
+        self.update_cache(processed_response)
+        return processed_response
+
+    async def call_async(self, transport=None):
+        """
+        Make the API request asynchronously.
+
+        :param transport: The transport with which to make the request. If None
+            :attr:`pywowcher.session.async_transport` will be used.
+        :type transport: :class:`pywowcher.transport.AsyncWowcherTransport` or None
+        """
+        event = self.make_event()
+        try:
+            hit, cached_response = self.get_cached_response()
+            if hit:
+                return cached_response
+            self.before_request(event)
+            self.response = await self.make_request_async(transport=transport)
+            processed_response = self.after_response(event)
+        except Exception as e:
+            self.on_error(event, e)
+            raise
+        self.update_cache(processed_response)
+        return processed_response
+
+    def get_cache_key(self):
+        """Return the key under which the response to the request is cached."""
+        return (
+            self.method,
+            self.get_URL(),
+            tuple(sorted((self.data or {}).items())),
+            tuple(sorted((self.params or {}).items())),
+        )
+
+    def get_cached_response(self):
+        """
+        Return (True, response) if the processed response is in the session's cache.
+
+        Returns (False, None) if the method is not cacheable, caching is disabled for
+        the request or the response is not cached.
+        """
+        cache = session.response_cache
+        if cache is None or not self.cacheable or not self.use_cache:
+            return False, None
+        return cache.get(self.get_cache_key())
+
+    def update_cache(self, processed_response):
+        """Add a processed response to the session's response cache if caching is on."""
+        cache = session.response_cache
+        if cache is not None and self.cacheable and self.use_cache:
+            cache.set(self.get_cache_key(), processed_response)
+
+    def get_page(self):
+        """Return the page number requested, or None if the method is not paginated."""
+        if self.params is None:
+            return None
+        return self.params.get("page")
+
+    def make_event(self):
+        """
+        Return a :class:`pywowcher.hooks.RequestEvent` for the request.
+
+        Its URL is set by :meth:`before_request`, so that an error raised while
+        preparing the request is dispatched to the
+        :attr:`pywowcher.hooks.ON_ERROR` hook.
+        """
+        return hooks.RequestEvent(
+            api_method=self, method=self.method, url=None, page=self.get_page()
+        )
+
+    def before_request(self, event):
+        """Set the URL of event and dispatch it."""
+        event.url = self.get_URL()
+        session.hooks.dispatch(hooks.BEFORE_REQUEST, event)
+
+    def after_response(self, event):
+        """Process the response, dispatch the event and return the processed data."""
+        start = time.perf_counter()
+        processed_response = self.process_response(self.response)
+        event.decode_time = time.perf_counter() - start
+        event.add_response(self.response)
+        session.hooks.dispatch(hooks.AFTER_RESPONSE, event)
+        return processed_response
+
+    def on_error(self, event, exception):
+        """Add exception to the event and dispatch it."""
+        event.exception = exception
+        response = getattr(exception, "response", None)
+        event.add_response(self.response if response is None else response)
+        session.hooks.dispatch(hooks.ON_ERROR, event)
 
     def prepare_data(self, *args, **kwargs):
         """Prepare request data."""
@@ -55,30 +162,55 @@ class BaseAPIMethod:
         """Process the request response."""
         return response
 
+    def decode_response(self, response):
+        """Return the body of a JSON response decoded with the session's decoder."""
+        return session.decode_json(response.content)
+
     @classmethod
     def get_URL(cls):
         """Return the complete URL for the API method."""
         return "{}{}".format(session.domain, cls.uri)
 
-    def make_request(self):
-        """Make an API request."""
+    def get_request_kwargs(self):
+        """Return the keyword arguments with which to make the request."""
         session.get_credentials()
-        headers = session.get_auth_headers()
         url = self.get_URL()
-        logger.info("Making request to {}".format(url))
-        logger.debug("Sending request data {} to {}".format(self.data, url))
-        self.response = requests.request(
-            method=self.method,
-            url=url,
-            data=self.data,
-            json=self.json,
-            params=self.params,
-            headers=headers,
-        )
-        logger.debug(
-            ("Recieved response from {} Status: " "{} text: {}").format(
-                url, self.response.status_code, self.response.text
+        logger.info("Making request to %s", url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending request data {} to {}".format(self.data, url))
+        return {
+            "method": self.method,
+            "url": url,
+            "data": self.data,
+            "json": self.json,
+            "params": self.params,
+            "headers": session.get_auth_headers(),
+        }
+
+    def check_response(self, response):
+        """Log the response and raise an exception if it has an error status."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                ("Recieved response from {} Status: " "{} text: {}").format(
+                    response.url, response.status_code, response.text
+                )
             )
+        response.raise_for_status()
+
+    def make_request(self):
+        """Make an API request."""
+        self.response = session.transport.request(
+            retry_policy=self.retry_policy, **self.get_request_kwargs()
+        )
+        self.check_response(self.response)
+        return self.response
+
+    async def make_request_async(self, transport=None):
+        """Make an API request asynchronously."""
+        if transport is None:
+            transport = session.async_transport
+        self.response = await transport.request(
+            retry_policy=self.retry_policy, **self.get_request_kwargs()
         )
-        self.response.raise_for_status()
+        self.check_response(self.response)
         return self.response
@@ -16,4 +16,4 @@ class EchoTest(BaseAPIMethod):
 
     def process_response(self, response):
         """Process echo response."""
-        return response.json()["data"]
+        return self.decode_response(response)["data"]
@@ -1,6 +1,10 @@
 """The Orders API method."""
+
 import datetime
 
+from .. import hooks
+from ..streaming import PageParser
+from ..wowcher_session import session
 from .api_method import BaseAPIMethod
 
 
@@ -22,6 +26,13 @@ class Orders(BaseAPIMethod):
     uri = "/v1/orders"
     method = BaseAPIMethod.GET
 
+    cacheable = True
+
+    STREAM_CHUNK_SIZE = 65536
+    STREAM_HEADERS = {"Accept-Encoding": "gzip"}
+
+    page = None
+
     def get_data(self, *, page, per_page, from_date, start_date, end_date, deal_id):
         """
         Return data to be passed in the request.
@@ -55,4 +66,60 @@ class Orders(BaseAPIMethod):
 
     def process_response(self, response):
         """Process echo response."""
-        return response.json()
+        return self.decode_response(response)
+
+    def update_cache(self, processed_response):
+        """Cache the page, tagged with its deal and the Wowcher codes of its orders."""
+        cache = session.response_cache
+        if cache is None or not self.use_cache:
+            return
+        references = [
+            order_data.get("wowcher_code")
+            for order_data in processed_response["data"]["data"]
+        ]
+        cache.set(
+            self.get_cache_key(),
+            processed_response,
+            deal_id=self.data["deal_id"],
+            references=references,
+        )
+
+    def call_streaming(self):
+        """
+        Make the request and yield the data of each order as soon as it is received.
+
+        The body is requested gzip compressed and decompressed and parsed as it
+        arrives, so the whole page is never held in memory. Once every order has been
+        yielded :attr:`page` holds the rest of the response, including `last_page`.
+        Streamed pages are not read from or added to the response cache.
+
+        The request is made when iteration starts and the
+        :attr:`pywowcher.hooks.AFTER_RESPONSE` hook is dispatched when the body has
+        been read. Its `bytes_received` is the size of the decompressed body.
+
+        :rtype: iterator of dict
+        """
+        event = self.make_event()
+        parser = None
+        try:
+            self.before_request(event)
+            kwargs = self.get_request_kwargs()
+            kwargs["headers"] = dict(kwargs["headers"], **self.STREAM_HEADERS)
+            self.response = session.transport.request(
+                retry_policy=self.retry_policy, stream=True, **kwargs
+            )
+            self.check_response(self.response)
+            parser = PageParser(self.response.iter_content(self.STREAM_CHUNK_SIZE))
+            yield from parser
+            self.page = parser.page
+        except Exception as e:
+            if parser is not None:
+                self.response.bytes_received = parser.bytes_received
+            self.on_error(event, e)
+            raise
+        finally:
+            if self.response is not None:
+                self.response.close()
+        self.response.bytes_received = parser.bytes_received
+        event.add_response(self.response)
+        session.hooks.dispatch(hooks.AFTER_RESPONSE, event)
@@ -1,5 +1,7 @@
 """The Status API mehtod."""
 
+from ..transport import RetryPolicy
+from ..wowcher_session import session
 from .api_method import BaseAPIMethod
 
 
@@ -27,6 +29,9 @@ class Status(BaseAPIMethod):
     uri = "/v1/orders/status"
     method = BaseAPIMethod.PUT
 
+    # Only retry responses that show the update was not applied.
+    retry_policy = RetryPolicy(retry_statuses=(429, 503), retry_connection_errors=False)
+
     RECIEVED_BY_MERCHANT = 0
     READY_FOR_DISPATCH = 1
     DISPATCHED = 2
@@ -43,3 +48,11 @@ class Status(BaseAPIMethod):
     def get_json(self, *, orders):
         """Return data to be passed to the request."""
         return {self.ORDERS: orders}
+
+    def update_cache(self, processed_response):
+        """Remove cached Orders pages for the deals of the updated orders."""
+        cache = session.response_cache
+        if cache is not None:
+            cache.invalidate_references(
+                order[self.REFERENCE] for order in self.json[self.ORDERS]
+            )
@@ -0,0 +1,173 @@
+"""
+The ResponseCache class.
+
+Holds the processed responses of API requests in memory so that identical requests made
+within a short time of each other are not sent again. Set a cache with
+:func:`pywowcher.wowcher_session.WowcherAPISession.set_response_cache` to enable it.
+"""
+
+import collections
+import threading
+import time
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "size", "maxsize"]
+)
+CacheInfo.__doc__ = """
+Statistics for a :class:`ResponseCache`.
+
+:ivar int hits: The number of requests answered from the cache.
+:ivar int misses: The number of requests that were not in the cache.
+:ivar int evictions: The number of entries removed to stay within maxsize.
+:ivar int size: The number of entries in the cache.
+:ivar int maxsize: The maximum number of entries in the cache.
+"""
+
+
+class ResponseCache:
+    """
+    A time limited, size bounded, least recently used cache of API responses.
+
+    Entries expire ttl seconds after they are added. When the cache holds maxsize
+    entries the least recently used entry is removed to make room for a new one.
+
+    Entries can be tagged with a deal ID and the Wowcher codes of the orders they
+    contain so that they can be invalidated when those orders are changed. Cached
+    responses are shared between callers and must not be modified.
+    """
+
+    DEFAULT_TTL = 60
+    DEFAULT_MAXSIZE = 256
+
+    def __init__(self, *, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAXSIZE):
+        """
+        Create an empty cache.
+
+        :param ttl float: The number of seconds for which an entry is valid.
+        :param maxsize int: The maximum number of entries to keep.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._deal_keys = collections.defaultdict(set)
+        self._reference_keys = collections.defaultdict(collections.OrderedDict)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "ResponseCache(ttl={}, maxsize={}, size={})".format(
+            self.ttl, self.maxsize, len(self)
+        )
+
+    def info(self):
+        """
+        Return statistics for the cache.
+
+        :rtype: :class:`CacheInfo`
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self.maxsize
+            )
+
+    def get(self, key):
+        """
+        Return (True, value) for a cached key, or (False, None) if it is not cached.
+
+        :param key: The cache key of the request.
+        :type key: hashable
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key, value, *, deal_id=None, references=()):
+        """
+        Add a value to the cache.
+
+        :param key: The cache key of the request.
+        :type key: hashable
+        :param value: The processed response to cache.
+        :param deal_id: The deal the response belongs to.
+        :param references: The Wowcher codes of the orders in the response.
+        :type references: iterable of str
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            references = tuple(references) if deal_id is not None else ()
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                value,
+                deal_id,
+                references,
+            )
+            if deal_id is not None:
+                self._deal_keys[deal_id].add(key)
+                for reference in references:
+                    self._reference_keys[reference][key] = deal_id
+
+    def _remove(self, key):
+        expires, value, deal_id, references = self._entries.pop(key)
+        if deal_id is not None:
+            keys = self._deal_keys[deal_id]
+            keys.discard(key)
+            if not keys:
+                del self._deal_keys[deal_id]
+        for reference in references:
+            keys = self._reference_keys[reference]
+            keys.pop(key, None)
+            if not keys:
+                del self._reference_keys[reference]
+
+    def invalidate_deal(self, deal_id):
+        """Remove every cached response for a deal."""
+        with self._lock:
+            for key in list(self._deal_keys.get(deal_id, ())):
+                self._remove(key)
+
+    def invalidate_references(self, references):
+        """
+        Remove every cached response for the deals of orders with the passed Wowcher codes.
+
+        :param references: The Wowcher codes of changed orders.
+        :type references: iterable of str
+        """
+        with self._lock:
+            # An order belongs to the deal of the entry it was most recently seen in.
+            deal_ids = {
+                next(reversed(self._reference_keys[reference].values()))
+                for reference in references
+                if reference in self._reference_keys
+            }
+            for deal_id in deal_ids:
+                for key in list(self._deal_keys.get(deal_id, ())):
+                    self._remove(key)
+
+    def clear(self):
+        """Remove every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._deal_keys.clear()
+            self._reference_keys.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
@@ -0,0 +1,178 @@
+"""
+The AdaptiveConcurrency class.
+
+Limits the number of API requests in flight at once, adjusting the limit to the load on
+the Wowcher servers. The limit is raised gradually while requests succeed at a steady
+latency and cut sharply when requests are rate limited, fail with a server error or take
+much longer than usual (additive increase, multiplicative decrease).
+"""
+
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrency:
+    """
+    An additive increase, multiplicative decrease limit on concurrent API requests.
+
+    A single instance can be shared between operations, and between calls, so that the
+    limit learned for the server is kept. Use :meth:`call` to make an API request within
+    the limit.
+
+    :ivar float limit: The current number of requests allowed in flight.
+    :ivar int in_flight: The number of requests currently in flight.
+    :ivar float baseline_latency: A moving average of request latency in seconds.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(
+        self,
+        *,
+        initial=2,
+        minimum=1,
+        maximum=16,
+        increase=1.0,
+        decrease=0.5,
+        latency_tolerance=2.0,
+        smoothing=0.1,
+        min_latency=0.05,
+        warmup=5,
+        clock=time.perf_counter
+    ):
+        """
+        Set the limits.
+
+        :param initial int: The number of concurrent requests to start with.
+        :param minimum int: The lowest the limit may fall.
+        :param maximum int: The highest the limit may rise.
+        :param increase float: The amount by which the limit rises after a full limit
+            of requests has succeeded.
+        :param decrease float: The factor by which the limit is multiplied when
+            requests are throttled or slow.
+        :param latency_tolerance float: A request is slow if its latency is more than
+            this multiple of :attr:`baseline_latency`.
+        :param smoothing float: The weight given to each new latency in
+            :attr:`baseline_latency`.
+        :param min_latency float: A request is never slow if its latency is at most
+            this many seconds, so that jitter in very fast requests, such as those
+            answered from a cache, does not reduce the limit.
+        :param warmup int: The number of requests to measure before any request can be
+            slow.
+        :param clock callable: The function returning the time in seconds used to
+            measure latency.
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Limits must satisfy 1 <= minimum <= initial <= maximum.")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.min_latency = min_latency
+        self.warmup = warmup
+        self.clock = clock
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.samples = 0
+        self.baseline_latency = None
+        self._last_decrease = clock()
+        self._condition = threading.Condition()
+
+    def __repr__(self):
+        return "AdaptiveConcurrency(limit={:.2f}, in_flight={})".format(
+            self.limit, self.in_flight
+        )
+
+    def acquire(self):
+        """
+        Wait until a request may be made and return its start time.
+
+        The returned value must be passed to :meth:`release` when the request is
+        complete.
+
+        :rtype: float
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self.clock()
+
+    def release(self, start, *, throttled=False):
+        """
+        Record the outcome of a request and free its place.
+
+        :param start float: The value returned by :meth:`acquire` for the request.
+        :param throttled bool: True if the server rejected or delayed the request
+            because it is overloaded.
+        """
+        latency = self.clock() - start
+        with self._condition:
+            self.in_flight -= 1
+            slow = self.is_slow(latency)
+            if throttled or slow:
+                self.decrease_limit(start)
+            else:
+                self.limit = min(self.limit + self.increase / self.limit, self.maximum)
+            self.samples += 1
+            if self.baseline_latency is None:
+                self.baseline_latency = latency
+            else:
+                self.baseline_latency += self.smoothing * (
+                    latency - self.baseline_latency
+                )
+            self._condition.notify_all()
+
+    def is_slow(self, latency):
+        """Return True if latency is much longer than usual."""
+        if self.baseline_latency is None or self.samples < self.warmup:
+            return False
+        return latency > max(
+            self.baseline_latency * self.latency_tolerance, self.min_latency
+        )
+
+    def decrease_limit(self, start):
+        """
+        Multiply the limit by :attr:`decrease`.
+
+        Requests that were already in flight when the limit was last decreased do not
+        decrease it again, so a burst of failures only cuts the limit once.
+        """
+        if start < self._last_decrease:
+            return
+        self.limit = max(self.limit * self.decrease, float(self.minimum))
+        self._last_decrease = self.clock()
+        logger.debug("Reduced concurrency limit to {:.2f}.".format(self.limit))
+
+    def call(self, api_method):
+        """
+        Call an API method within the limit and return the result.
+
+        The request is throttled if it was retried or failed with a status in
+        :attr:`THROTTLE_STATUSES`.
+
+        :param api_method: The API method to call.
+        :type api_method: :class:`pywowcher.api_methods.api_method.BaseAPIMethod`
+        """
+        start = self.acquire()
+        try:
+            result = api_method.call()
+        except Exception as e:
+            self.release(start, throttled=self.is_throttled_error(e))
+            raise
+        self.release(start, throttled=getattr(api_method.response, "retries", 0) > 0)
+        return result
+
+    def is_throttled_error(self, exception):
+        """Return True if exception shows that the server is overloaded."""
+        if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(exception, "response", None)
+        return response is not None and response.status_code in self.THROTTLE_STATUSES
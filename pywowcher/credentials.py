@@ -0,0 +1,181 @@
+"""
+Credential providers.
+
+A credential provider is a source of API credentials for
+:class:`pywowcher.wowcher_session.WowcherAPISession`. When the session is missing
+credentials it asks each of its providers in turn until all required credentials are
+set. Credentials that have already been set are never replaced.
+"""
+
+import logging
+import os
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+LIVE_KEY = "live_key"
+LIVE_SECRET_TOKEN = "live_secret_token"
+STAGING_KEY = "staging_key"
+STAGING_SECRET_TOKEN = "staging_secret_token"
+USE_STAGING = "use_staging"
+
+CREDENTIALS = (
+    LIVE_KEY,
+    LIVE_SECRET_TOKEN,
+    STAGING_KEY,
+    STAGING_SECRET_TOKEN,
+    USE_STAGING,
+)
+
+
+class CredentialProvider:
+    """Base class for credential providers."""
+
+    def get_credentials(self):
+        """
+        Return the credentials available from the provider.
+
+        :returns: A dict with keys from :attr:`CREDENTIALS`. Credentials the provider
+            does not have may be left out.
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+
+class StaticCredentialProvider(CredentialProvider):
+    """Provide credentials held in memory."""
+
+    def __init__(
+        self,
+        *,
+        live_key=None,
+        live_secret_token=None,
+        staging_key=None,
+        staging_secret_token=None,
+        use_staging=None
+    ):
+        """
+        Store the credentials.
+
+        :param live_key str: Your Wowcher API key for the live server.
+        :param live_secret_token str: Your Wowcher API token for the live server.
+        :param staging_key str: Your Wowcher API key for the staging server.
+        :param staging_secret_token str: Your Wowcher API token for the staging server.
+        :param use_staging bool: If True API requests will address the staging server.
+        """
+        self.credentials = {
+            LIVE_KEY: live_key,
+            LIVE_SECRET_TOKEN: live_secret_token,
+            STAGING_KEY: staging_key,
+            STAGING_SECRET_TOKEN: staging_secret_token,
+            USE_STAGING: use_staging,
+        }
+
+    def get_credentials(self):
+        """Return the stored credentials."""
+        return {
+            key: value for key, value in self.credentials.items() if value is not None
+        }
+
+
+class EnvironmentCredentialProvider(CredentialProvider):
+    """
+    Provide credentials from environment variables.
+
+    The variables used are `WOWCHER_LIVE_KEY`, `WOWCHER_LIVE_SECRET_TOKEN`,
+    `WOWCHER_STAGING_KEY`, `WOWCHER_STAGING_SECRET_TOKEN` and `WOWCHER_USE_STAGING`.
+    `WOWCHER_USE_STAGING` is True if it is set to "1", "true" or "yes".
+    """
+
+    VARIABLES = {
+        LIVE_KEY: "WOWCHER_LIVE_KEY",
+        LIVE_SECRET_TOKEN: "WOWCHER_LIVE_SECRET_TOKEN",
+        STAGING_KEY: "WOWCHER_STAGING_KEY",
+        STAGING_SECRET_TOKEN: "WOWCHER_STAGING_SECRET_TOKEN",
+        USE_STAGING: "WOWCHER_USE_STAGING",
+    }
+    TRUE_VALUES = ("1", "true", "yes")
+
+    def __init__(self, environ=None):
+        """
+        Set the environment from which to read credentials.
+
+        :param environ: A mapping of environment variables. If None :data:`os.environ`
+            will be used.
+        :type environ: dict or None
+        """
+        self.environ = os.environ if environ is None else environ
+
+    def get_credentials(self):
+        """Return the credentials set in the environment."""
+        credentials = {}
+        for key, variable in self.VARIABLES.items():
+            value = self.environ.get(variable)
+            if value is None:
+                continue
+            if key == USE_STAGING:
+                value = value.strip().lower() in self.TRUE_VALUES
+            credentials[key] = value
+        return credentials
+
+
+class FileCredentialProvider(CredentialProvider):
+    """
+    Provide credentials from a `wowcher_credentials.yaml` file.
+
+    If no path is given the file is searched for in the current working directory and
+    then in each of its ancestors.
+    """
+
+    FILENAME = "wowcher_credentials.yaml"
+
+    def __init__(self, path=None):
+        """
+        Set the credentials file.
+
+        :param path: The path of the credentials file, or None to search for it.
+        :type path: str or None
+        """
+        self.path = path
+
+    def find_credentials_file(self, directory=None):
+        """Return the path to the wowcher credentials file, or None if none exists."""
+        if directory is None:
+            directory = os.getcwd()
+        if os.path.exists(os.path.join(directory, self.FILENAME)):
+            return os.path.join(directory, self.FILENAME)
+        elif os.path.dirname(directory) == directory:
+            return None
+        else:
+            return self.find_credentials_file(directory=os.path.dirname(directory))
+
+    def get_credentials(self):
+        """
+        Return the credentials in the credentials file.
+
+        :raises FileNotFoundError: If the credentials file does not exist.
+        """
+        credentials_path = self.path or self.find_credentials_file()
+        if credentials_path is None or not os.path.exists(credentials_path):
+            logger.info("Wowcher credentials file not found.")
+            raise FileNotFoundError("{} was not found.".format(self.FILENAME))
+        logger.debug("Credentials file found at {}".format(credentials_path))
+        return self.load_credentials_file(credentials_path)
+
+    def load_credentials_file(self, credentials_path):
+        """Return the credentials in the file at credentials_path."""
+        logger.info("Loading API Credentials from {}".format(credentials_path))
+        with open(credentials_path, "r") as config_file:
+            config = yaml.load(config_file, Loader=yaml.FullLoader)
+        try:
+            return {
+                LIVE_KEY: config["live"]["key"],
+                LIVE_SECRET_TOKEN: config["live"]["secret_token"],
+                STAGING_KEY: config["staging"]["key"],
+                STAGING_SECRET_TOKEN: config["staging"]["secret_token"],
+                USE_STAGING: config["use_staging"],
+            }
+        except Exception as e:
+            logger.error("Could not load config from {}.".format(credentials_path))
+            raise e
@@ -0,0 +1,509 @@
+"""
+A local imitation of the Wowcher redemption API for testing and load testing.
+
+Serves paginated synthetic orders with every field of :class:`pywowcher.WowcherOrder`
+at `/v1/orders`, accepts status updates at `/v1/orders/status` and echoes requests to
+`/v1/echo`. Latency, rate limiting (429) responses, server errors and slowly sent bodies
+can be injected at random.
+
+Orders are generated from a pre-encoded template when a page is first requested, so
+deals of millions of orders can be served without holding them in memory. Recently
+requested pages are kept in a cache.
+
+Run a server with::
+
+    python -m pywowcher.fakeserver --port 8000 --orders 1000000 --latency 0.05
+
+and point pywowcher at it by setting :attr:`pywowcher.session.STAGING_DOMAIN` to
+``http://127.0.0.1:8000`` with `use_staging` set to True.
+"""
+
+import argparse
+import collections
+import datetime
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from pywowcher.operations.getorders import TIMESTAMP_FORMAT, WowcherOrder
+
+ORDERS_PATH = "/v1/orders"
+STATUS_PATH = "/v1/orders/status"
+ECHO_PATH = "/v1/echo"
+
+CONSTANT = "constant"
+UNIFORM = "uniform"
+EXPONENTIAL = "exponential"
+LOGNORMAL = "lognormal"
+LATENCY_DISTRIBUTIONS = (CONSTANT, UNIFORM, EXPONENTIAL, LOGNORMAL)
+
+_MARKER = re.compile(rb"@@(\w+)@@")
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length)
+
+    def respond(self, body, status=200, encoding=None):
+        fake = self.server.fake
+        fault = fake.choose_fault()
+        time.sleep(fake.get_latency())
+        headers = {"Content-Type": "application/json"}
+        if fault is not None:
+            status, body = fault
+            if status == 429:
+                headers["Retry-After"] = str(fake.retry_after)
+        elif encoding is not None:
+            headers["Content-Encoding"] = encoding
+        slow = fault is None and fake.random_chance(fake.slow_body_rate)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if slow:
+            self.write_slowly(body, fake.slow_body_delay)
+        else:
+            self.wfile.write(body)
+        fake.count_response(status)
+
+    def write_slowly(self, body, delay, chunks=10):
+        chunk_size = max(len(body) // chunks, 1)
+        for start in range(0, len(body), chunk_size):
+            self.wfile.write(body[start : start + chunk_size])
+            self.wfile.flush()
+            time.sleep(delay / chunks)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        body = self.read_body()
+        if url.path != ORDERS_PATH:
+            self.respond(b'{"message": "Not found"}', status=404)
+            return
+        query = urllib.parse.parse_qs(url.query)
+        data = urllib.parse.parse_qs(body.decode("utf-8"))
+        page = int(query.get("page", data.get("page", ["1"]))[0])
+        deal_id = data.get("deal_id", ["1"])[0]
+        fake = self.server.fake
+        per_page = fake.get_per_page(data.get("per_page", [None])[0])
+        compressed = fake.compress and "gzip" in self.headers.get("Accept-Encoding", "")
+        body = fake.get_page(deal_id, page, per_page=per_page, compressed=compressed)
+        self.respond(body, encoding="gzip" if compressed else None)
+
+    def do_PUT(self):
+        body = self.read_body()
+        if self.path != STATUS_PATH:
+            self.respond(b'{"message": "Not found"}', status=404)
+            return
+        try:
+            orders = json.loads(body.decode("utf-8"))["orders"]
+        except (ValueError, KeyError, TypeError):
+            self.respond(b'{"message": "Invalid status update"}', status=422)
+            return
+        self.server.fake.add_status_updates(orders)
+        self.respond(b'{"message": "Order status updated", "data": []}')
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.path != ECHO_PATH:
+            self.respond(b'{"message": "Not found"}', status=404)
+            return
+        text = body.decode("utf-8")
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            data = json.loads(text or "null")
+        else:
+            data = dict(urllib.parse.parse_qsl(text))
+        self.respond(
+            json.dumps({"message": "Echo Test Received", "data": data}).encode("utf-8")
+        )
+
+
+class OrderGenerator:
+    """Encode synthetic orders with every WowcherOrder field as JSON bytes."""
+
+    START_TIME = datetime.datetime(2018, 9, 5, 14, 20, 59)
+    SKU_COUNT = 50
+
+    def __init__(self, *, padding=0):
+        """
+        Create the order template.
+
+        :param padding int: Extra characters of text added to each order.
+        """
+        order = {field: None for field in WowcherOrder.fields}
+        order.update(
+            {
+                WowcherOrder.ORDER_ID: "@@id@@",
+                "business_id": "1",
+                "merchant_id": "1",
+                "deal_id": "@@deal_id@@",
+                "wowcher_code": "@@wowcher_code@@",
+                "brand": "wowcher",
+                "product_code": "@@product_code@@",
+                "product_name": "Product @@product_code@@",
+                "product_sku": "@@sku@@",
+                "product_despatch_method": "Courier",
+                "delivery_title": "Mx",
+                "delivery_first_name": "First",
+                "delivery_last_name": "Last @@id@@",
+                "delivery_line_1": "@@id@@ High Street",
+                "delivery_city": "London",
+                "delivery_postcode": "SW1A 1AA",
+                "delivery_country": "GB",
+                "delivery_telephone": "07000000000",
+                "delivery_email": "customer@@id@@@example.com",
+                "created_at": "@@created_at@@",
+                "updated_at": "@@created_at@@",
+                "integration_module": "api",
+                "notification_eligible": "1",
+                "delivery_type": "standard",
+                "currency": "GBP",
+                "price": "19.99",
+                "full_price": "39.99",
+                "merchant_warehouse_key": "WH1",
+                "custom_field": "x" * padding if padding else None,
+                WowcherOrder.ITEMS: [
+                    {"sku": "@@sku@@", "quantity": 1, "options": ["@@product_code@@"]}
+                ],
+            }
+        )
+        encoded = json.dumps(order).encode("utf-8")
+        self.parts = _MARKER.split(encoded)
+
+    def encode(self, deal_id, index):
+        """Return the JSON encoded order at index in a deal."""
+        created_at = self.START_TIME + datetime.timedelta(seconds=index)
+        deal_id = json.dumps(str(deal_id))[1:-1]
+        values = {
+            b"id": "{}{:09d}".format(deal_id, index).encode("utf-8"),
+            b"deal_id": deal_id.encode("utf-8"),
+            b"wowcher_code": "{}-{:09d}".format(deal_id, index).encode("utf-8"),
+            b"product_code": "P{}".format(index % self.SKU_COUNT).encode("ascii"),
+            b"sku": "SKU-{}".format(index % self.SKU_COUNT).encode("ascii"),
+            b"created_at": created_at.strftime(TIMESTAMP_FORMAT).encode("ascii"),
+        }
+        parts = list(self.parts)
+        for position in range(1, len(parts), 2):
+            parts[position] = values[parts[position]]
+        return b"".join(parts)
+
+
+class FakeWowcherServer:
+    """
+    Serve imitation Wowcher API responses from a background thread.
+
+    Use as a context manager or call :meth:`start` and :meth:`stop`. While it is
+    running :attr:`url` is the domain to which requests should be sent.
+
+    :ivar int status_updates: The number of order status updates received.
+    :ivar responses: The number of responses sent for each status code.
+    :type responses: :class:`collections.Counter`
+    """
+
+    COMPRESS_LEVEL = 6
+
+    def __init__(
+        self,
+        *,
+        host="127.0.0.1",
+        port=0,
+        orders=1000,
+        per_page=100,
+        max_per_page=1000,
+        padding=0,
+        latency=0.0,
+        latency_distribution=CONSTANT,
+        latency_spread=0.0,
+        throttle_rate=0.0,
+        retry_after=1,
+        error_rate=0.0,
+        error_statuses=(500, 502, 503, 504),
+        slow_body_rate=0.0,
+        slow_body_delay=1.0,
+        page_cache_size=256,
+        compress=False,
+        seed=None
+    ):
+        """
+        Set the responses to serve.
+
+        :param host str: The address on which to listen.
+        :param port int: The port on which to listen. If 0 a free port is chosen.
+        :param orders int: The number of orders in each deal.
+        :param per_page int: The number of orders on each page if the request does not
+            set `per_page`.
+        :param max_per_page int: The most orders that will be returned on a page,
+            whatever the request asks for.
+        :param padding int: Extra characters of text added to each order.
+        :param latency float: The mean delay in seconds before each response is sent.
+        :param latency_distribution str: How delays are distributed around latency.
+            One of `constant`, `uniform`, `exponential` or `lognormal`.
+        :param latency_spread float: For `uniform` the most by which a delay may differ
+            from latency in seconds, for `lognormal` the standard deviation of the
+            logarithm of the delay.
+        :param throttle_rate float: The proportion of requests answered with a 429
+            response.
+        :param retry_after int: The `Retry-After` header sent with 429 responses.
+        :param error_rate float: The proportion of requests answered with a server
+            error.
+        :param error_statuses tuple: The status codes of server errors.
+        :param slow_body_rate float: The proportion of responses sent slowly.
+        :param slow_body_delay float: The time in seconds taken to send a slow body.
+        :param page_cache_size int: The number of encoded pages to keep.
+        :param compress bool: If True pages of orders are gzip compressed for requests
+            that accept gzip.
+        :param seed: Seed for the random choice of faults and delays.
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                "latency_distribution must be one of {}.".format(
+                    ", ".join(LATENCY_DISTRIBUTIONS)
+                )
+            )
+        self.host = host
+        self.port = port
+        self.orders = orders
+        self.per_page = per_page
+        self.max_per_page = max_per_page
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_spread = latency_spread
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.slow_body_rate = slow_body_rate
+        self.slow_body_delay = slow_body_delay
+        self.page_cache_size = page_cache_size
+        self.compress = compress
+        self.generator = OrderGenerator(padding=padding)
+        self.random = random.Random(seed)
+        self.status_updates = 0
+        self.responses = collections.Counter()
+        self._pages = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        """Return the URL of the running server."""
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    @property
+    def last_page(self):
+        """Return the number of pages in each deal at the default page size."""
+        return self.get_last_page(self.per_page)
+
+    def get_last_page(self, per_page):
+        """Return the number of pages in each deal at a page size."""
+        return max((self.orders + per_page - 1) // per_page, 1)
+
+    def get_per_page(self, requested):
+        """Return the page size to use for a requested `per_page` value."""
+        try:
+            per_page = int(requested)
+        except (TypeError, ValueError):
+            return self.per_page
+        return max(min(per_page, self.max_per_page), 1)
+
+    def random_chance(self, rate):
+        """Return True with probability rate."""
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self.random.random() < rate
+
+    def get_latency(self):
+        """Return the delay in seconds before the next response."""
+        if self.latency <= 0:
+            return 0.0
+        if self.latency_distribution == CONSTANT:
+            return self.latency
+        with self._lock:
+            if self.latency_distribution == UNIFORM:
+                delay = self.random.uniform(
+                    self.latency - self.latency_spread,
+                    self.latency + self.latency_spread,
+                )
+            elif self.latency_distribution == EXPONENTIAL:
+                delay = self.random.expovariate(1 / self.latency)
+            else:
+                delay = (
+                    self.random.lognormvariate(0, self.latency_spread) * self.latency
+                )
+        return max(delay, 0.0)
+
+    def choose_fault(self):
+        """Return (status, body) for an injected fault, or None for no fault."""
+        if self.random_chance(self.throttle_rate):
+            return 429, b'{"message": "Too Many Requests"}'
+        if self.random_chance(self.error_rate):
+            with self._lock:
+                status = self.random.choice(self.error_statuses)
+            return status, b'{"message": "Server Error"}'
+        return None
+
+    def get_page(self, deal_id, page, *, per_page=None, compressed=False):
+        """Return the encoded Orders response for a page of a deal."""
+        per_page = per_page or self.per_page
+        key = (deal_id, page, per_page, compressed)
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+                return body
+        body = self.encode_page(deal_id, page, per_page=per_page)
+        if compressed:
+            body = gzip.compress(body, compresslevel=self.COMPRESS_LEVEL)
+        with self._lock:
+            self._pages[key] = body
+            while len(self._pages) > self.page_cache_size:
+                self._pages.popitem(last=False)
+        return body
+
+    def encode_page(self, deal_id, page, *, per_page=None):
+        """Return the encoded Orders response for a page of a deal."""
+        per_page = per_page or self.per_page
+        start = (page - 1) * per_page
+        end = min(start + per_page, self.orders)
+        orders = b",".join(
+            self.generator.encode(deal_id, index) for index in range(start, end)
+        )
+        header = json.dumps(
+            {
+                "total": self.orders,
+                "per_page": per_page,
+                "current_page": page,
+                "last_page": self.get_last_page(per_page),
+                "next_page_url": None,
+                "prev_page_url": None,
+                "from": start + 1,
+                "to": end,
+            }
+        ).encode("utf-8")
+        return (
+            b'{"message": "Orders retrieved", "data": '
+            + header[:-1]
+            + b', "data": ['
+            + orders
+            + b"]}}"
+        )
+
+    def add_status_updates(self, orders):
+        """Record received status updates."""
+        with self._lock:
+            self.status_updates += len(orders)
+
+    def count_response(self, status):
+        """Count a response sent with status."""
+        with self._lock:
+            self.responses[status] += 1
+
+    def start(self):
+        """Start serving in a background thread."""
+        self.server = _ThreadingHTTPServer((self.host, self.port), _Handler)
+        self.server.fake = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+        self.server = _ThreadingHTTPServer((self.host, self.port), _Handler)
+        self.server.fake = self
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+
+
+def main():
+    """Run a fake Wowcher server from the command line."""
+    parser = argparse.ArgumentParser(description="Run a fake Wowcher API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--max-per-page", type=int, default=1000)
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default=CONSTANT
+    )
+    parser.add_argument("--latency-spread", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-delay", type=float, default=1.0)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    server = FakeWowcherServer(
+        host=args.host,
+        port=args.port,
+        orders=args.orders,
+        per_page=args.per_page,
+        max_per_page=args.max_per_page,
+        padding=args.padding,
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_delay=args.slow_body_delay,
+        compress=args.compress,
+        seed=args.seed,
+    )
+    print(
+        "Serving {} orders per deal in {} pages at http://{}:{}".format(
+            args.orders, server.last_page, args.host, args.port
+        )
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
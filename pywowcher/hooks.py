@@ -0,0 +1,154 @@
+"""
+Request lifecycle hooks.
+
+Functions registered with :attr:`pywowcher.session.hooks` are called with a
+:class:`RequestEvent` before each API request is sent, after each response has been
+processed and when a request fails.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+BEFORE_REQUEST = "before_request"
+AFTER_RESPONSE = "after_response"
+ON_ERROR = "on_error"
+
+
+class RequestEvent:
+    """
+    Details of an API request passed to hook functions.
+
+    The same instance is passed to each hook for a request, with :attr:`event` set to
+    the event being dispatched. Times are in seconds and are None until the stage they
+    measure has completed.
+
+    :ivar str event: The event being dispatched.
+    :ivar api_method: The API method making the request.
+    :ivar str method: The HTTP method of the request.
+    :ivar url: The URL of the request. None if an error was raised before it was
+        known.
+    :ivar page: The page number requested, for paginated API methods.
+    :ivar status_code: The HTTP status code of the response.
+    :ivar bytes_received: The size of the response body.
+    :ivar connect_time: Time spent opening new connections. This is 0 when a pooled
+        connection was reused.
+    :ivar server_time: Time spent waiting for the server to respond after the request
+        was sent.
+    :ivar transfer_time: Time spent receiving the response body.
+    :ivar decode_time: Time spent decoding and processing the response.
+    :ivar exception: The exception raised, for :attr:`ON_ERROR` events.
+    :ivar retries: The number of times the request was retried.
+    """
+
+    def __init__(self, *, api_method, method, url, page=None):
+        """Set the request details."""
+        self.event = None
+        self.api_method = api_method
+        self.method = method
+        self.url = url
+        self.page = page
+        self.status_code = None
+        self.bytes_received = None
+        self.connect_time = None
+        self.server_time = None
+        self.transfer_time = None
+        self.decode_time = None
+        self.exception = None
+        self.retries = 0
+
+    def __repr__(self):
+        return "RequestEvent {} {} {}".format(self.event, self.method, self.url)
+
+    @property
+    def total_time(self):
+        """Return the sum of the measured times."""
+        times = (
+            self.connect_time,
+            self.server_time,
+            self.transfer_time,
+            self.decode_time,
+        )
+        return sum(time for time in times if time is not None)
+
+    def add_response(self, response):
+        """Record the status, size and timing of a response."""
+        if response is None:
+            return
+        self.status_code = response.status_code
+        self.bytes_received = getattr(response, "bytes_received", None)
+        if self.bytes_received is None:
+            self.bytes_received = len(response.content)
+        self.retries = getattr(response, "retries", 0)
+        timing = getattr(response, "timing", None)
+        if timing is not None:
+            self.connect_time = timing.connect
+            self.server_time = timing.server
+            self.transfer_time = timing.transfer
+
+
+class Hooks:
+    """A registry of functions to call for request lifecycle events."""
+
+    EVENTS = (BEFORE_REQUEST, AFTER_RESPONSE, ON_ERROR)
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._hooks = {event: () for event in self.EVENTS}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return any(self._hooks.values())
+
+    def register(self, event, hook):
+        """
+        Call hook with a :class:`RequestEvent` whenever event occurs.
+
+        :param event: One of :attr:`BEFORE_REQUEST`, :attr:`AFTER_RESPONSE` or
+            :attr:`ON_ERROR`.
+        :type event: str
+        :param hook: A function taking a single :class:`RequestEvent` argument.
+        :type hook: callable
+        """
+        self.check_event(event)
+        with self._lock:
+            self._hooks[event] = self._hooks[event] + (hook,)
+
+    def unregister(self, event, hook):
+        """Stop calling hook for event."""
+        self.check_event(event)
+        with self._lock:
+            hooks = list(self._hooks[event])
+            hooks.remove(hook)
+            self._hooks[event] = tuple(hooks)
+
+    def clear(self):
+        """Unregister all hooks."""
+        with self._lock:
+            self._hooks = {event: () for event in self.EVENTS}
+
+    def check_event(self, event):
+        """Raise ValueError if event is not a valid event name."""
+        if event not in self.EVENTS:
+            raise ValueError(
+                "Unknown event {!r}. Valid events are {}.".format(
+                    event, ", ".join(self.EVENTS)
+                )
+            )
+
+    def dispatch(self, event, request_event):
+        """
+        Call each hook registered for event with request_event.
+
+        Exceptions raised by hooks are logged and do not affect the request.
+        """
+        hooks = self._hooks[event]
+        if not hooks:
+            return
+        request_event.event = event
+        for hook in hooks:
+            try:
+                hook(request_event)
+            except Exception:
+                logger.exception("Error in {} hook {!r}.".format(event, hook))
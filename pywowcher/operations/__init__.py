@@ -5,5 +5,7 @@ These are the methods used to communicate with Wowcher.
 """
 
 from .echotest import echo_test  # NOQA
-from .getorders import get_orders  # NOQA
+from .getorders import get_orders, iter_orders  # NOQA
+from .exportorders import export_orders  # NOQA
 from .setorderstatus import set_order_status, make_order_status  # NOQA
+from .reconcilestatus import reconcile_order_status  # NOQA
@@ -0,0 +1,339 @@
+"""
+The export_orders method of pywowcher.
+
+Used to write every order for a Wowcher deal to a newline delimited JSON or CSV file.
+Each page is written as soon as it is received so that memory use does not grow with
+the size of the deal.
+"""
+
+import csv
+import gzip
+import json
+import os
+import stat
+import uuid
+
+from .getorders import IterOrders, WowcherItem, WowcherOrder
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+NESTED = "nested"
+ROWS = "rows"
+NONE = "none"
+
+
+class ExportOrders(IterOrders):
+    """Write the orders for a deal to a file page by page."""
+
+    FORMATS = (NDJSON, CSV)
+    ITEM_MODES = (NESTED, ROWS, NONE)
+    DEFAULT_ITEM_MODES = {NDJSON: NESTED, CSV: ROWS}
+    DEFAULT_FIELDS = (WowcherOrder.ORDER_ID,) + WowcherOrder.fields
+    ITEM_FIELDS = (WowcherItem.SKU, WowcherItem.QUANTITY, WowcherItem.OPTIONS)
+    ITEM_PREFIX = "item_"
+    GZIP_SUFFIX = ".gz"
+    COMPRESS_LEVEL = 6
+
+    def __init__(
+        self,
+        *,
+        deal_id,
+        path,
+        format=NDJSON,
+        items=None,
+        fields=None,
+        compress=None,
+        from_date=None,
+        start_date=None,
+        end_date=None,
+        max_workers=None,
+        concurrency=None,
+        use_cache=False
+    ):
+        """
+        Request every page of orders for a deal and write them to path.
+
+        The file is written to a temporary file in the same directory and moved to
+        path when every page has been written, so an incomplete export never replaces
+        an existing file.
+
+        :param deal_id: The ID of the Wowcher deal for which to export orders.
+        :type deal_id: str or int
+
+        :param path: The path of the file to write.
+        :type path: str
+
+        :param format: `ndjson` to write one JSON object per line or `csv`.
+        :type format: str
+
+        :param items: How order items are written. `nested` writes the items of each
+            order as a list (JSON encoded in CSV files), `rows` writes a row for each
+            item with the item's fields prefixed with `item_` and `none` omits items.
+            Defaults to `nested` for NDJSON and `rows` for CSV.
+        :type items: str or None
+
+        :param fields: The order fields to write. Defaults to the order ID and every
+            field of :class:`pywowcher.WowcherOrder`.
+        :type fields: iterable of str or None
+
+        :param compress: If True the file will be gzip compressed. If None the file
+            will be compressed if path ends with `.gz`.
+        :type compress: bool or None
+
+        :param from_date: When to retrieve orders from.
+        :type from_date: datetime.datetime
+
+        :param start_date: Filter orders using a start date.
+        :type start_date: datetime.datetime
+
+        :param end_date: Filter orders using a end date.
+        :type end_date: datetime.datetime
+
+        :param max_workers: The maximum number of pages to request at once. If None
+            pages will be requested one at a time.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of pages to request at
+            once.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param use_cache: If True pages will be read from and added to
+            :attr:`pywowcher.session.response_cache`.
+        :type use_cache: bool
+
+        :ivar int order_count: The number of orders written.
+        :ivar int row_count: The number of lines or CSV rows written, excluding the
+            CSV header.
+        """
+        if format not in self.FORMATS:
+            raise ValueError(
+                "format must be one of {}.".format(", ".join(self.FORMATS))
+            )
+        if items is None:
+            items = self.DEFAULT_ITEM_MODES[format]
+        if items not in self.ITEM_MODES:
+            raise ValueError(
+                "items must be one of {}.".format(", ".join(self.ITEM_MODES))
+            )
+        self.set_parameters(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            use_cache=use_cache,
+        )
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.path = path
+        self.format = format
+        self.items = items
+        self.fields = tuple(fields) if fields is not None else self.DEFAULT_FIELDS
+        if compress is None:
+            compress = path.endswith(self.GZIP_SUFFIX)
+        self.compress = compress
+        self.columns = self.get_columns()
+        self.order_count = 0
+        self.row_count = 0
+        self.export()
+
+    def get_columns(self):
+        """Return the names of the fields of each written record."""
+        if self.items == NESTED:
+            return self.fields + (WowcherOrder.ITEMS,)
+        if self.items == ROWS:
+            return self.fields + tuple(
+                self.ITEM_PREFIX + field for field in self.ITEM_FIELDS
+            )
+        return self.fields
+
+    def export(self):
+        """Write every page of orders to a temporary file and move it to path."""
+        temp_path = self.make_temp_file()
+        try:
+            with self.open_file(temp_path) as export_file:
+                self.write_orders(export_file)
+            if os.path.exists(self.path):
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.path).st_mode))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def make_temp_file(self):
+        """
+        Create an empty temporary file beside path and return its path.
+
+        Unlike :func:`tempfile.mkstemp`, which makes the file readable only by its
+        owner, the file is given the permissions that :func:`open` would give a new
+        file under the process umask.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+        while True:
+            temp_path = os.path.join(directory, "tmp{}.tmp".format(uuid.uuid4().hex))
+            try:
+                fd = os.open(temp_path, flags, 0o666)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return temp_path
+
+    def open_file(self, path):
+        """Return path opened for writing text, compressed if required."""
+        if self.compress:
+            return gzip.open(
+                path,
+                "wt",
+                compresslevel=self.COMPRESS_LEVEL,
+                encoding="utf-8",
+                newline="",
+            )
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def write_orders(self, export_file):
+        """Write each page of orders to export_file as it is received."""
+        if self.format == CSV:
+            writer = csv.writer(export_file)
+            writer.writerow(self.columns)
+        for response_data in self.request_pages():
+            orders = response_data[self.DATA][self.DATA]
+            records = [
+                record for order in orders for record in self.make_records(order)
+            ]
+            if self.format == CSV:
+                writer.writerows(self.make_csv_row(record) for record in records)
+            else:
+                export_file.write(
+                    "".join(
+                        json.dumps(record, separators=(",", ":")) + "\n"
+                        for record in records
+                    )
+                )
+            self.order_count += len(orders)
+            self.row_count += len(records)
+
+    def make_records(self, order_data):
+        """
+        Return the records to write for an order.
+
+        :param order_data: Order data as returned from an Orders API request for a
+            single order.
+        :type order_data: dict
+
+        :rtype: list of dict
+        """
+        record = {field: order_data.get(field) for field in self.fields}
+        if self.items == NONE:
+            return [record]
+        items = order_data.get(WowcherOrder.ITEMS) or []
+        if self.items == NESTED:
+            record[WowcherOrder.ITEMS] = items
+            return [record]
+        if not items:
+            items = [{}]
+        records = []
+        for item in items:
+            item_record = dict(record)
+            for field in self.ITEM_FIELDS:
+                item_record[self.ITEM_PREFIX + field] = item.get(field)
+            records.append(item_record)
+        return records
+
+    def make_csv_row(self, record):
+        """Return a record as a list of CSV values."""
+        row = []
+        for column in self.columns:
+            value = record[column]
+            if value is None:
+                value = ""
+            elif isinstance(value, (list, dict)):
+                value = json.dumps(value, separators=(",", ":"))
+            row.append(value)
+        return row
+
+
+def export_orders(
+    deal_id,
+    path,
+    *,
+    format=NDJSON,
+    items=None,
+    fields=None,
+    compress=None,
+    from_date=None,
+    start_date=None,
+    end_date=None,
+    max_workers=None,
+    concurrency=None,
+    use_cache=False
+):
+    """
+    Write the customer orders for a Wowcher deal to a file.
+
+    Each page is written as it is received, so memory use stays the same however many
+    orders the deal has. Orders are written in page order. The file at path is only
+    replaced once every page has been written.
+
+    :param deal_id: The ID of the Wowcher deal for which to export orders.
+    :type deal_id: int or str
+
+    :param path: The path of the file to write.
+    :type path: str
+
+    :param format: `ndjson` to write one JSON object per line or `csv`.
+    :type format: str
+
+    :param items: How order items are written. `nested` writes the items of each
+        order as a list (JSON encoded in CSV files), `rows` writes a line or row for
+        each item with the item's fields as `item_sku`, `item_quantity` and
+        `item_options`, repeating the order's fields, and `none` omits items. Defaults
+        to `nested` for NDJSON and `rows` for CSV.
+    :type items: str or None
+
+    :param fields: The order fields to write. Defaults to `id` and every field of
+        :class:`pywowcher.WowcherOrder`.
+    :type fields: iterable of str or None
+
+    :param compress: If True the file will be gzip compressed. If None the file will be
+        compressed if path ends with `.gz`.
+    :type compress: bool or None
+
+    :param from_date: When to retrieve orders from.
+    :type from_date:  :class:`datetime.datetime` or None
+
+    :param start_date: Filter orders using a start date.
+    :type start_date:  :class:`datetime.datetime` or None
+
+    :param end_date: Filter orders using a end date.
+    :type end_date:  :class:`datetime.datetime` or None
+
+    :param max_workers: The maximum number of pages to request concurrently. If None
+        pages will be requested one at a time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of pages to request at once.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param use_cache: If True pages will be read from and added to
+        :attr:`pywowcher.session.response_cache`.
+    :type use_cache: bool
+
+    :returns: The number of orders written.
+    :rtype: int
+    """
+    operation = ExportOrders(
+        deal_id=deal_id,
+        path=path,
+        format=format,
+        items=items,
+        fields=fields,
+        compress=compress,
+        from_date=from_date,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        concurrency=concurrency,
+        use_cache=use_cache,
+    )
+    return operation.order_count
@@ -5,9 +5,38 @@ Used to retrieve orders from Wowcher. It returns a list of orders encapsulated b
 WowcherOrder class.
 """
 
+import collections
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from pywowcher import api_methods
+from pywowcher.wowcher_session import session
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_timestamp(value):
+    """
+    Return a timestamp field of a Wowcher order as a UNIX timestamp.
+
+    Wowcher returns some timestamps as UNIX timestamps and some as date strings in the
+    form "2018-09-05 14:20:59", which are taken to be UTC.
+
+    :param value: The value of the timestamp field.
+    :type value: str or int or None
+
+    :rtype: int or None
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        date = datetime.datetime.strptime(value, TIMESTAMP_FORMAT)
+        return int(date.replace(tzinfo=datetime.timezone.utc).timestamp())
 
 
 class WowcherItem:
@@ -23,6 +52,8 @@ class WowcherItem:
     QUANTITY = "quantity"
     OPTIONS = "options"
 
+    __slots__ = ("sku", "quantity", "options")
+
     def __init__(self, item_data):
         """
         Set item attributes.
@@ -127,6 +158,24 @@ class WowcherOrder:
         "wowcher_code",
     )
 
+    TIMESTAMP_FIELDS = (
+        "created_at",
+        "despatched_at",
+        "despatched_at_sent",
+        "ready_for_despatch_at",
+        "ready_for_despatch_at_sent",
+        "received_at",
+        "received_at_sent",
+        "redeemed_at",
+        "sent_at",
+        "updated_at",
+    )
+
+    ORDER_ID = "id"
+    ITEMS = "items"
+
+    __slots__ = ("order_id", "items") + fields
+
     def __init__(self, order_data):
         """
         Set order attributes.
@@ -134,8 +183,8 @@ class WowcherOrder:
         :param order_data: Data for one order as returned from an Orders API request.
         :type order_data: dict
         """
-        self.order_id = order_data["id"]
-        self.items = [WowcherItem(item_data) for item_data in order_data["items"]]
+        self.order_id = order_data[self.ORDER_ID]
+        self.items = [WowcherItem(item_data) for item_data in order_data[self.ITEMS]]
         for field in self.fields:
             setattr(self, field, order_data[field])
 
@@ -143,14 +192,68 @@ class WowcherOrder:
         return "Wowcher Order {}".format(self.wowcher_code)
 
 
+class LazyWowcherOrder(WowcherOrder):
+    """
+    A :class:`pywowcher.WowcherOrder` that reads attributes when they are first used.
+
+    The order data is kept as returned from the Orders API request. Each attribute,
+    including :attr:`items`, is taken from it the first time it is accessed and then
+    stored on the instance, so orders of which only a few attributes are used are
+    cheaper to create.
+    """
+
+    __slots__ = ("_order_data",)
+
+    def __init__(self, order_data):
+        """
+        Store the order data.
+
+        :param order_data: Data for one order as returned from an Orders API request.
+        :type order_data: dict
+        """
+        self._order_data = order_data
+
+    def __getattr__(self, name):
+        if name == "_order_data":
+            raise AttributeError(name)
+        if name == "order_id":
+            value = self._order_data[self.ORDER_ID]
+        elif name == "items":
+            value = [
+                WowcherItem(item_data) for item_data in self._order_data[self.ITEMS]
+            ]
+        elif name in self.fields:
+            value = self._order_data[name]
+        else:
+            raise AttributeError(
+                "{!r} object has no attribute {!r}".format(type(self).__name__, name)
+            )
+        setattr(self, name, value)
+        return value
+
+
 class GetOrders:
     """Request all pages for an Orders API method call and collect the orders."""
 
     PER_PAGE = 100
+    PER_PAGE_KEY = "per_page"
     LAST_PAGE = "last_page"
     DATA = "data"
 
-    def __init__(self, *, deal_id, from_date=None, start_date=None, end_date=None):
+    def __init__(
+        self,
+        *,
+        deal_id,
+        from_date=None,
+        start_date=None,
+        end_date=None,
+        max_workers=None,
+        concurrency=None,
+        lazy=False,
+        use_cache=True,
+        stream=False,
+        per_page=None
+    ):
         """
         Request all pages for an Orders API method call and collect the orders.
 
@@ -166,11 +269,72 @@ class GetOrders:
         :param end_date: Filter orders using a end date.
         :type end_date: datetime.datetime
 
+        :param max_workers: The maximum number of pages to request at once. If None
+            pages will be requested one at a time.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of pages to request at
+            once. If max_workers is None its maximum is used as max_workers.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param lazy: If True orders will be returned as
+            :class:`pywowcher.operations.getorders.LazyWowcherOrder`.
+        :type lazy: bool
+
+        :param use_cache: If False pages will not be read from or added to
+            :attr:`pywowcher.session.response_cache`.
+        :type use_cache: bool
+
+        :param stream: If True each page will be parsed as it is received instead of
+            being decoded once complete. Pages are requested one at a time.
+        :type stream: bool
+
+        :param per_page: The number of orders to request in each page. If None the
+            session's :class:`pywowcher.pagesize.PageSizeTuner` chooses, if one is set,
+            otherwise :attr:`PER_PAGE` is used.
+        :type per_page: int or None
+
         :ivar orders: orders: A list containing the requested orders as
             :class:`pywowcher.WowcherOrder`.
         :type orders: list
 
         """
+        self.set_parameters(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            lazy=lazy,
+            use_cache=use_cache,
+            stream=stream,
+            per_page=per_page,
+        )
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.check_stream()
+        self.orders = []
+        if self.stream:
+            self.orders.extend(
+                self.process_order_data(order_data)
+                for order_data in self.iter_streamed_order_data()
+            )
+        else:
+            for response_data in self.request_pages():
+                self.add_orders(response_data)
+
+    def set_parameters(
+        self,
+        *,
+        deal_id,
+        from_date,
+        start_date,
+        end_date,
+        lazy=False,
+        use_cache=True,
+        stream=False,
+        per_page=None
+    ):
+        """Store the request parameters, replacing missing dates with defaults."""
         if from_date is None:
             from_date = datetime.datetime.now() - datetime.timedelta(days=1)
         if start_date is None:
@@ -181,16 +345,165 @@ class GetOrders:
         self.from_date = from_date
         self.start_date = start_date
         self.end_date = end_date
-        self.orders = []
-        self.first_request()
-        for page in range(2, self.page_count + 1):
-            self.add_orders(self.make_order_request(page))
+        self.order_class = LazyWowcherOrder if lazy else WowcherOrder
+        self.use_cache = use_cache
+        self.stream = stream
+        self.page_size_tuner = None
+        if per_page is None:
+            self.page_size_tuner = session.page_size_tuner
+            if self.page_size_tuner is None:
+                per_page = self.PER_PAGE
+            else:
+                per_page = self.page_size_tuner.per_page
+        self.per_page = per_page
+
+    def check_stream(self):
+        """Raise ValueError if streaming is combined with concurrent requests."""
+        if self.stream and (
+            (self.max_workers or 1) > 1 or self.concurrency is not None
+        ):
+            raise ValueError(
+                "Streamed pages are requested one at a time. max_workers and "
+                "concurrency cannot be used with stream."
+            )
+
+    def set_page_count(self, response_data):
+        """Store the number of pages from the response to the first Orders request."""
+        self.page_count = response_data[self.DATA][self.LAST_PAGE]
 
-    def first_request(self):
-        """Make an Orders request, store the page count and process the response data."""
+    def request_pages(self):
+        """
+        Yield the response data for every page of orders, in page order.
+
+        Pages are requested as they are needed, so only the page being processed and
+        any pages requested concurrently ahead of it are held in memory.
+        """
+        if self.page_size_tuner is not None and (self.get_max_workers() or 1) < 2:
+            yield from self.request_tuned_pages()
+            return
         response_data = self.make_order_request(1)
-        self.page_count = response_data[self.DATA][self.LAST_PAGE]
-        self.add_orders(response_data)
+        self.set_page_count(response_data)
+        yield response_data
+        yield from self.request_remaining_pages()
+
+    def request_tuned_pages(self):
+        """
+        Yield the response data for every page of orders, changing the page size.
+
+        Pages are requested one at a time. Before each request the page size chosen by
+        the page size tuner is used if the orders received so far fill a whole number
+        of pages of that size, so that no order is skipped or received twice. If the
+        server returns a page of a different size that does not start where the last
+        page ended it is discarded and requested again at an aligned size.
+        """
+        offset = 0
+        per_page = aligned_per_page = self.per_page
+        while True:
+            page = offset // per_page + 1
+            response_data = self.make_order_request(page, per_page=per_page)
+            data = response_data[self.DATA]
+            server_per_page = int(data.get(self.PER_PAGE_KEY) or per_page)
+            if server_per_page != per_page:
+                if (page - 1) * server_per_page != offset:
+                    per_page = self.realign_page_size(
+                        offset, per_page, aligned_per_page, server_per_page
+                    )
+                    continue
+                per_page = server_per_page
+            yield response_data
+            if page >= data[self.LAST_PAGE]:
+                return
+            offset = page * per_page
+            aligned_per_page = per_page
+            next_per_page = self.page_size_tuner.per_page
+            if offset % next_per_page == 0:
+                per_page = next_per_page
+
+    @staticmethod
+    def realign_page_size(offset, per_page, aligned_per_page, server_per_page):
+        """
+        Return a page size whose pages start at offset after the server used another.
+
+        :param offset int: The number of orders received so far.
+        :param per_page int: The page size requested.
+        :param aligned_per_page int: The last page size successfully used.
+        :param server_per_page int: The page size the server used instead of per_page.
+        """
+        if per_page != aligned_per_page:
+            return aligned_per_page
+        if offset % server_per_page == 0:
+            return server_per_page
+        raise ValueError(
+            "The server changed the page size from {} to {} after {} orders.".format(
+                per_page, server_per_page, offset
+            )
+        )
+
+    def request_remaining_pages(self):
+        """
+        Yield the response data for every page after the first, in page order.
+
+        If :attr:`max_workers` is greater than one the pages are requested concurrently
+        using a thread pool of that size. No more than :attr:`max_workers` pages are
+        requested ahead of the page being yielded.
+        """
+        pages = range(2, self.page_count + 1)
+        max_workers = self.get_max_workers()
+        if max_workers is None or max_workers < 2 or len(pages) < 2:
+            for page in pages:
+                yield self.make_order_request(page)
+            return
+        max_workers = min(max_workers, len(pages))
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for page in pages:
+                    if len(pending) == max_workers:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(self.make_order_request, page))
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_max_workers(self):
+        """Return the number of pages to request at once."""
+        if self.max_workers is None and self.concurrency is not None:
+            return self.concurrency.maximum
+        return self.max_workers
+
+    def iter_streamed_order_data(self):
+        """
+        Yield the data of every order, parsing each page as it is received.
+
+        The number of pages is read from the first page once all of its orders have
+        been yielded.
+
+        :rtype: iterator of dict
+        """
+        self.page_count = 1
+        page = 1
+        while page <= self.page_count:
+            method = self.make_orders_method(page)
+            yield from method.call_streaming()
+            if page == 1:
+                self.set_page_count(method.page)
+            page += 1
+
+    def iter_orders(self):
+        """
+        Yield each order as :class:`pywowcher.WowcherOrder`, page by page.
+
+        :rtype: iterator of :class:`pywowcher.WowcherOrder`
+        """
+        if self.stream:
+            for order_data in self.iter_streamed_order_data():
+                yield self.process_order_data(order_data)
+            return
+        for response_data in self.request_pages():
+            for order_data in response_data[self.DATA][self.DATA]:
+                yield self.process_order_data(order_data)
 
     def add_orders(self, response_data):
         """
@@ -213,28 +526,128 @@ class GetOrders:
 
         :rtype: :class:`pywowcher.WowcherOrder`
         """
-        return WowcherOrder(order_data)
+        return self.order_class(order_data)
 
-    def make_order_request(self, page):
+    def make_order_request(self, page, *, per_page=None):
         """
         Return the response to an Orders request for a page of orders.
 
         :pram page: Page number to request.
         :type page: int
 
+        :param per_page: The page size to request. If None :attr:`per_page` is used.
+        :type per_page: int or None
+
         :rtype: dict
         """
-        return api_methods.Orders(
+        method = self.make_orders_method(page, per_page=per_page)
+        if self.page_size_tuner is None:
+            return self.call_orders_method(method)
+        per_page = method.data["per_page"]
+        start = time.perf_counter()
+        try:
+            response_data = self.call_orders_method(method)
+        except Exception as e:
+            self.page_size_tuner.record_error(per_page, e)
+            raise
+        if method.response is not None:
+            data = response_data[self.DATA]
+            server_per_page = data.get(self.PER_PAGE_KEY)
+            self.page_size_tuner.record(
+                per_page,
+                seconds=time.perf_counter() - start,
+                orders=len(data[self.DATA]),
+                server_per_page=(
+                    None if server_per_page is None else int(server_per_page)
+                ),
+            )
+        return response_data
+
+    def call_orders_method(self, method):
+        """Call an Orders API method within the concurrency limit, if one is set."""
+        if self.concurrency is None:
+            return method.call()
+        return self.concurrency.call(method)
+
+    def make_orders_method(self, page, *, per_page=None):
+        """
+        Return an Orders API method for a page of orders.
+
+        :pram page: Page number to request.
+        :type page: int
+
+        :param per_page: The page size to request. If None :attr:`per_page` is used.
+        :type per_page: int or None
+
+        :rtype: :class:`pywowcher.api_methods.Orders`
+        """
+        method = api_methods.Orders(
             page=page,
-            per_page=self.PER_PAGE,
+            per_page=per_page or self.per_page,
             from_date=self.from_date,
             start_date=self.start_date,
             end_date=self.end_date,
             deal_id=self.deal_id,
-        ).call()
-
+        )
+        method.use_cache = self.use_cache
+        return method
+
+
+class IterOrders(GetOrders):
+    """Request the pages for an Orders API method call as the orders are iterated."""
+
+    def __init__(
+        self,
+        *,
+        deal_id,
+        from_date=None,
+        start_date=None,
+        end_date=None,
+        max_workers=None,
+        concurrency=None,
+        lazy=False,
+        use_cache=True,
+        stream=False,
+        per_page=None
+    ):
+        """
+        Set the request parameters. No request is made until the instance is iterated.
 
-def get_orders(*, deal_id, from_date=None, start_date=None, end_date=None):
+        Takes the same arguments as :class:`GetOrders`.
+        """
+        self.set_parameters(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            lazy=lazy,
+            use_cache=use_cache,
+            stream=stream,
+            per_page=per_page,
+        )
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.check_stream()
+
+    def __iter__(self):
+        return self.iter_orders()
+
+
+def get_orders(
+    *,
+    deal_id,
+    from_date=None,
+    start_date=None,
+    end_date=None,
+    max_workers=None,
+    concurrency=None,
+    lazy=False,
+    as_batch=False,
+    use_cache=True,
+    stream=False,
+    per_page=None,
+    coalesce=False
+):
     """
     Return a list of customer orders for a Wowcher deal.
 
@@ -250,9 +663,177 @@ def get_orders(*, deal_id, from_date=None, start_date=None, end_date=None):
     :param end_date: Filter orders using a end date.
     :type end_date:  :class:`datetime.datetime` or None
 
-    :rtype: :class:`pywowcher.WowcherOrder`
+    :param max_workers: The maximum number of pages to request concurrently. Orders
+        are returned in page order regardless. If None pages will be requested one at a
+        time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of pages to request at once,
+        which rises while the server responds quickly and falls when requests are
+        throttled. Share an instance between calls to keep the learned limit.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param lazy: If True orders will be returned as
+        :class:`pywowcher.operations.getorders.LazyWowcherOrder`, which read each
+        attribute from the response data only when it is first accessed.
+    :type lazy: bool
+
+    :param as_batch: If True the orders will be returned as a single columnar
+        :class:`pywowcher.operations.orderbatch.OrderBatch` instead of a list. Requires
+        `numpy`.
+    :type as_batch: bool
+
+    :param use_cache: If False pages will not be read from or added to
+        :attr:`pywowcher.session.response_cache`.
+    :type use_cache: bool
+
+    :param stream: If True each page will be requested gzip compressed and its orders
+        parsed one at a time as the body is received, instead of holding the whole
+        body and its decoded data in memory at once. Pages are requested one at a time
+        and are not cached. Cannot be used with max_workers, concurrency or as_batch.
+    :type stream: bool
+
+    :param per_page: The number of orders to request in each page. If None the page
+        size is chosen by :attr:`pywowcher.session.page_size_tuner` if one is set,
+        otherwise 100 orders are requested per page.
+    :type per_page: int or None
+
+    :param coalesce: If True and :attr:`pywowcher.session.single_flight` is set, a call
+        made while an identical call with coalesce=True is in progress in another
+        thread waits for that call instead of requesting the orders again. Each caller
+        receives its own shallow copy of the list, but the
+        :class:`pywowcher.WowcherOrder` objects, or the `OrderBatch`, are shared
+        between callers and must not be modified. `max_workers` and `concurrency` are
+        not part of what makes calls identical.
+    :type coalesce: bool
+
+    :rtype: list of :class:`pywowcher.WowcherOrder` or
+        :class:`pywowcher.operations.orderbatch.OrderBatch`
 
     """
-    return GetOrders(
-        deal_id=deal_id, from_date=from_date, start_date=start_date, end_date=end_date
-    ).orders
+    if as_batch and stream:
+        raise ValueError("as_batch cannot be used with stream.")
+
+    def request_orders():
+        if as_batch:
+            from .orderbatch import OrderBatch
+
+            pages = IterOrders(
+                deal_id=deal_id,
+                from_date=from_date,
+                start_date=start_date,
+                end_date=end_date,
+                max_workers=max_workers,
+                concurrency=concurrency,
+                use_cache=use_cache,
+                per_page=per_page,
+            ).request_pages()
+            return OrderBatch.from_pages(pages)
+        return GetOrders(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            concurrency=concurrency,
+            lazy=lazy,
+            use_cache=use_cache,
+            stream=stream,
+            per_page=per_page,
+        ).orders
+
+    if not coalesce or session.single_flight is None:
+        return request_orders()
+    key = (
+        "get_orders",
+        deal_id,
+        from_date,
+        start_date,
+        end_date,
+        lazy,
+        as_batch,
+        use_cache,
+        stream,
+        per_page,
+    )
+    orders, shared = session.single_flight.do(key, request_orders)
+    if shared and not as_batch:
+        return list(orders)
+    return orders
+
+
+def iter_orders(
+    *,
+    deal_id,
+    from_date=None,
+    start_date=None,
+    end_date=None,
+    max_workers=None,
+    concurrency=None,
+    lazy=False,
+    use_cache=True,
+    stream=False,
+    per_page=None
+):
+    """
+    Return an iterator of customer orders for a Wowcher deal.
+
+    Unlike :func:`pywowcher.get_orders` orders are yielded as each page is received so
+    that they can be processed before every page has been retrieved and without holding
+    every order in memory.
+
+    :param deal_id: The ID of the Wowcher deal for which to collect orders.
+    :type deal_id: int or str
+
+    :param from_date: When to retrieve orders from.
+    :type from_date:  :class:`datetime.datetime` or None
+
+    :param start_date: Filter orders using a start date.
+    :type start_date:  :class:`datetime.datetime` or None
+
+    :param end_date: Filter orders using a end date.
+    :type end_date:  :class:`datetime.datetime` or None
+
+    :param max_workers: The maximum number of pages to request concurrently ahead of
+        the orders being processed. If None pages will be requested one at a time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of pages to request at once.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param lazy: If True orders will be returned as
+        :class:`pywowcher.operations.getorders.LazyWowcherOrder`, which read each
+        attribute from the response data only when it is first accessed.
+    :type lazy: bool
+
+    :param use_cache: If False pages will not be read from or added to
+        :attr:`pywowcher.session.response_cache`.
+    :type use_cache: bool
+
+    :param stream: If True each page will be requested gzip compressed and each order
+        yielded as soon as it has been received, without waiting for the rest of the
+        page. Pages are requested one at a time and are not cached. Cannot be used with
+        max_workers or concurrency.
+    :type stream: bool
+
+    :param per_page: The number of orders to request in each page. If None the page
+        size is chosen by :attr:`pywowcher.session.page_size_tuner` if one is set,
+        otherwise 100 orders are requested per page.
+    :type per_page: int or None
+
+    :rtype: iterator of :class:`pywowcher.WowcherOrder`
+    """
+    return iter(
+        IterOrders(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            concurrency=concurrency,
+            lazy=lazy,
+            use_cache=use_cache,
+            stream=stream,
+            per_page=per_page,
+        )
+    )
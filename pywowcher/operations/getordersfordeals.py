@@ -0,0 +1,233 @@
+"""
+The get_orders_for_deals method of pywowcher.
+
+Used to retrieve the orders for several Wowcher deals at once. Pages for every deal are
+requested from a single thread pool, sharing one limit on concurrent requests and the
+session's connection pool, and are scheduled in turn so that a deal with many pages
+does not delay the others.
+"""
+
+import collections
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .getorders import IterOrders
+
+
+class GetOrdersForDeals:
+    """Request every page of orders for several deals under one concurrency limit."""
+
+    def __init__(
+        self,
+        *,
+        deal_ids,
+        from_date=None,
+        start_date=None,
+        end_date=None,
+        max_workers=None,
+        concurrency=None,
+        lazy=False,
+        use_cache=True
+    ):
+        """
+        Set the request parameters. No request is made until pages are iterated.
+
+        :param deal_ids: The IDs of the Wowcher deals for which to collect orders.
+        :type deal_ids: iterable of str or int
+
+        :param from_date: When to retrieve orders from.
+        :type from_date: datetime.datetime
+
+        :param start_date: Filter orders using a start date.
+        :type start_date: datetime.datetime
+
+        :param end_date: Filter orders using a end date.
+        :type end_date: datetime.datetime
+
+        :param max_workers: The maximum number of pages to request at once across all
+            deals. If None pages will be requested one at a time.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of pages to request at once
+            across all deals. If max_workers is None its maximum is used as
+            max_workers.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param lazy: If True orders will be returned as
+            :class:`pywowcher.operations.getorders.LazyWowcherOrder`.
+        :type lazy: bool
+
+        :param use_cache: If False pages will not be read from or added to
+            :attr:`pywowcher.session.response_cache`.
+        :type use_cache: bool
+        """
+        self.deals = collections.OrderedDict()
+        for deal_id in deal_ids:
+            self.deals[deal_id] = IterOrders(
+                deal_id=deal_id,
+                from_date=from_date,
+                start_date=start_date,
+                end_date=end_date,
+                concurrency=concurrency,
+                lazy=lazy,
+                use_cache=use_cache,
+            )
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+
+    def get_max_workers(self):
+        """Return the number of pages to request at once."""
+        if self.max_workers is None and self.concurrency is not None:
+            return self.concurrency.maximum
+        return self.max_workers or 1
+
+    def request_pages(self):
+        """
+        Yield (deal_id, page, response_data) for every page of every deal.
+
+        The first page of each deal is requested first. Once a deal's page count is
+        known its remaining pages join a rotation that requests one page from each deal
+        in turn. Pages are yielded as they are received, so pages of different deals,
+        and of the same deal, may be yielded out of order.
+        """
+        rotation = collections.deque((deal_id, 1, 1) for deal_id in self.deals)
+        pending = {}
+        max_workers = self.get_max_workers()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while rotation or pending:
+                    while rotation and len(pending) < max_workers:
+                        deal_id, page = self.next_page(rotation)
+                        future = executor.submit(
+                            self.deals[deal_id].make_order_request, page
+                        )
+                        pending[future] = (deal_id, page)
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        deal_id, page = pending.pop(future)
+                        response_data = future.result()
+                        if page == 1:
+                            getter = self.deals[deal_id]
+                            getter.set_page_count(response_data)
+                            if getter.page_count > 1:
+                                rotation.append((deal_id, 2, getter.page_count))
+                        yield deal_id, page, response_data
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def next_page(rotation):
+        """
+        Return the next (deal_id, page) to request and rotate the deals.
+
+        :param rotation: (deal_id, next_page, last_page) for each deal with pages still
+            to request.
+        :type rotation: :class:`collections.deque`
+        """
+        deal_id, page, last_page = rotation.popleft()
+        if page < last_page:
+            rotation.append((deal_id, page + 1, last_page))
+        return deal_id, page
+
+    def get_orders(self):
+        """
+        Return the orders for each deal in page order.
+
+        :rtype: :class:`collections.OrderedDict` of deal ID to list of
+            :class:`pywowcher.WowcherOrder`
+        """
+        pages = {deal_id: {} for deal_id in self.deals}
+        for deal_id, page, response_data in self.request_pages():
+            pages[deal_id][page] = self.process_page(deal_id, response_data)
+        orders = collections.OrderedDict()
+        for deal_id, deal_pages in pages.items():
+            orders[deal_id] = [
+                order for page in sorted(deal_pages) for order in deal_pages[page]
+            ]
+        return orders
+
+    def iter_orders(self):
+        """
+        Yield the orders for every deal as each page is received.
+
+        :rtype: iterator of :class:`pywowcher.WowcherOrder`
+        """
+        for deal_id, page, response_data in self.request_pages():
+            yield from self.process_page(deal_id, response_data)
+
+    def process_page(self, deal_id, response_data):
+        """Return the orders in a page of response data as WowcherOrder."""
+        getter = self.deals[deal_id]
+        return [
+            getter.process_order_data(order_data)
+            for order_data in response_data[getter.DATA][getter.DATA]
+        ]
+
+
+def get_orders_for_deals(
+    deal_ids,
+    *,
+    from_date=None,
+    start_date=None,
+    end_date=None,
+    max_workers=None,
+    concurrency=None,
+    lazy=False,
+    merge=False,
+    use_cache=True
+):
+    """
+    Return the customer orders for several Wowcher deals.
+
+    Pages for all deals are requested concurrently by up to max_workers threads,
+    taking one page from each deal in turn so that a deal with many pages does not hold
+    up the others.
+
+    :param deal_ids: The IDs of the Wowcher deals for which to collect orders.
+    :type deal_ids: iterable of int or str
+
+    :param from_date: When to retrieve orders from.
+    :type from_date:  :class:`datetime.datetime` or None
+
+    :param start_date: Filter orders using a start date.
+    :type start_date:  :class:`datetime.datetime` or None
+
+    :param end_date: Filter orders using a end date.
+    :type end_date:  :class:`datetime.datetime` or None
+
+    :param max_workers: The maximum number of pages to request at once across all
+        deals. If None pages will be requested one at a time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of pages to request at once
+        across all deals.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param lazy: If True orders will be returned as
+        :class:`pywowcher.operations.getorders.LazyWowcherOrder`.
+    :type lazy: bool
+
+    :param merge: If True return a single iterator that yields the orders of every
+        deal as each page is received, instead of a dict.
+    :type merge: bool
+
+    :param use_cache: If False pages will not be read from or added to
+        :attr:`pywowcher.session.response_cache`.
+    :type use_cache: bool
+
+    :rtype: :class:`collections.OrderedDict` of deal ID to list of
+        :class:`pywowcher.WowcherOrder`, or iterator of :class:`pywowcher.WowcherOrder`
+    """
+    operation = GetOrdersForDeals(
+        deal_ids=deal_ids,
+        from_date=from_date,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        concurrency=concurrency,
+        lazy=lazy,
+        use_cache=use_cache,
+    )
+    if merge:
+        return operation.iter_orders()
+    return operation.get_orders()
@@ -0,0 +1,284 @@
+"""
+The OrderBatch class.
+
+Holds Wowcher orders as columns of NumPy arrays rather than as a list of
+:class:`pywowcher.WowcherOrder` so that they can be filtered and aggregated without
+Python loops. Requires the `numpy` package.
+"""
+
+import collections
+
+from .getorders import WowcherItem, WowcherOrder, parse_timestamp
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+Categorical = collections.namedtuple("Categorical", ["codes", "categories"])
+Categorical.__doc__ = """
+A column of repeated strings stored as integer codes.
+
+:ivar codes: An int32 array of indexes into categories, or -1 for None.
+:ivar categories: An object array of the distinct values of the column.
+"""
+
+
+class OrderBatch:
+    """
+    A columnar batch of Wowcher orders.
+
+    Columns are accessed by field name, e.g. ``batch["price"]``. :attr:`float_fields`
+    and :attr:`integer_fields` are float64 and int64 arrays, timestamp fields are
+    datetime64[s] arrays with NaT for missing values, fields in
+    :attr:`categorical_fields` are :class:`Categorical` and all other fields are object
+    arrays.
+
+    :ivar columns: The order columns keyed by field name, including `order_id`.
+    :type columns: dict
+    :ivar items: The items of every order as a flattened table of arrays keyed by
+        `order_index`, `sku`, `quantity` and `options`. `order_index` is the position
+        of the item's order in the batch.
+    :type items: dict
+    """
+
+    ORDER_ID = "order_id"
+    ORDER_INDEX = "order_index"
+    ITEM_FIELDS = (WowcherItem.SKU, WowcherItem.QUANTITY, WowcherItem.OPTIONS)
+
+    float_fields = ("price", "full_price")
+    integer_fields = ("deal_id",)
+    timestamp_fields = WowcherOrder.TIMESTAMP_FIELDS
+    categorical_fields = (
+        "brand",
+        "currency",
+        "delivery_country",
+        "product_code",
+        "product_sku",
+        "shipping_method",
+        "shipping_vendor",
+    )
+
+    def __init__(self, columns, items):
+        """
+        Create a batch from existing columns.
+
+        Use :meth:`from_order_data`, :meth:`from_pages` or :meth:`from_orders` to
+        create a batch from Wowcher orders.
+
+        :param columns: The order columns keyed by field name.
+        :type columns: dict
+        :param items: The item columns keyed by field name.
+        :type items: dict
+        """
+        _require_numpy()
+        self.columns = columns
+        self.items = items
+
+    def __len__(self):
+        return len(self.columns[self.ORDER_ID])
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def __repr__(self):
+        return "OrderBatch of {} orders".format(len(self))
+
+    @classmethod
+    def from_order_data(cls, orders_data):
+        """
+        Return a batch containing orders as returned from Orders API requests.
+
+        :param orders_data: Data for each order as returned from an Orders API request.
+        :type orders_data: iterable of dict
+
+        :rtype: :class:`OrderBatch`
+        """
+        builder = _BatchBuilder(cls)
+        for order_data in orders_data:
+            builder.add(order_data.get, order_data[WowcherOrder.ITEMS])
+        return builder.build()
+
+    @classmethod
+    def from_pages(cls, pages):
+        """
+        Return a batch containing the orders from pages of Orders API responses.
+
+        :param pages: Response data from Orders API requests.
+        :type pages: iterable of dict
+
+        :rtype: :class:`OrderBatch`
+        """
+        return cls.from_order_data(
+            order_data
+            for response_data in pages
+            for order_data in response_data["data"]["data"]
+        )
+
+    @classmethod
+    def from_orders(cls, orders):
+        """
+        Return a batch containing orders.
+
+        :param orders: The orders to add to the batch.
+        :type orders: iterable of :class:`pywowcher.WowcherOrder`
+
+        :rtype: :class:`OrderBatch`
+        """
+        builder = _BatchBuilder(cls)
+        for order in orders:
+            items = [
+                {
+                    WowcherItem.SKU: item.sku,
+                    WowcherItem.QUANTITY: item.quantity,
+                    WowcherItem.OPTIONS: item.options,
+                }
+                for item in order.items
+            ]
+            builder.add(_OrderAttributes(order).get, items)
+        return builder.build()
+
+    def filter(self, mask):
+        """
+        Return a new batch containing the orders selected by mask.
+
+        :param mask: A boolean array with one value for each order in the batch, such as
+            ``batch["price"] > 1000``.
+        :type mask: :class:`numpy.ndarray`
+
+        :rtype: :class:`OrderBatch`
+        """
+        mask = numpy.asarray(mask, dtype=bool)
+        columns = {}
+        for field, column in self.columns.items():
+            if isinstance(column, Categorical):
+                columns[field] = Categorical(column.codes[mask], column.categories)
+            else:
+                columns[field] = column[mask]
+        order_indexes = self.items[self.ORDER_INDEX]
+        item_mask = mask[order_indexes]
+        new_indexes = numpy.cumsum(mask) - 1
+        items = {field: column[item_mask] for field, column in self.items.items()}
+        items[self.ORDER_INDEX] = new_indexes[order_indexes[item_mask]]
+        return type(self)(columns, items)
+
+    def decode(self, field):
+        """
+        Return the values of a column as an array.
+
+        :class:`Categorical` columns are returned as object arrays of their values.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        column = self.columns[field]
+        if not isinstance(column, Categorical):
+            return column
+        values = numpy.append(column.categories, numpy.array([None], dtype=object))
+        return values[column.codes]
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError(
+            "numpy is required for OrderBatch. "
+            "Install it with pip install pywowcher[numpy]."
+        )
+
+
+class _OrderAttributes:
+    """Look up the attributes of a WowcherOrder by Orders API order data key."""
+
+    def __init__(self, order):
+        self.order = order
+
+    def get(self, key):
+        if key == WowcherOrder.ORDER_ID:
+            return self.order.order_id
+        return getattr(self.order, key)
+
+
+class _BatchBuilder:
+    """Collect order values into lists and convert them to columns."""
+
+    def __init__(self, batch_class):
+        _require_numpy()
+        self.batch_class = batch_class
+        self.order_ids = []
+        self.values = {field: [] for field in WowcherOrder.fields}
+        self.items = {field: [] for field in batch_class.ITEM_FIELDS}
+        self.item_order_indexes = []
+
+    def add(self, get_value, items):
+        index = len(self.order_ids)
+        self.order_ids.append(get_value(WowcherOrder.ORDER_ID))
+        for field, values in self.values.items():
+            values.append(get_value(field))
+        for item in items:
+            self.item_order_indexes.append(index)
+            for field, values in self.items.items():
+                values.append(item[field])
+
+    def build(self):
+        cls = self.batch_class
+        columns = {cls.ORDER_ID: object_array(self.order_ids)}
+        for field, values in self.values.items():
+            if field in cls.float_fields:
+                columns[field] = float_array(values)
+            elif field in cls.integer_fields:
+                columns[field] = numpy.array(values, dtype=numpy.int64)
+            elif field in cls.timestamp_fields:
+                columns[field] = timestamp_array(values)
+            elif field in cls.categorical_fields:
+                columns[field] = categorical_array(values)
+            else:
+                columns[field] = object_array(values)
+        items = {
+            cls.ORDER_INDEX: numpy.array(self.item_order_indexes, dtype=numpy.int64),
+            WowcherItem.SKU: object_array(self.items[WowcherItem.SKU]),
+            WowcherItem.QUANTITY: numpy.array(
+                self.items[WowcherItem.QUANTITY], dtype=numpy.int64
+            ),
+            WowcherItem.OPTIONS: object_array(self.items[WowcherItem.OPTIONS]),
+        }
+        return cls(columns, items)
+
+
+def object_array(values):
+    """Return values as a one dimensional object array."""
+    array = numpy.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
+
+
+def float_array(values):
+    """Return values as a float64 array with NaN for missing values."""
+    return numpy.array(
+        [numpy.nan if value is None or value == "" else value for value in values],
+        dtype=numpy.float64,
+    )
+
+
+def timestamp_array(values):
+    """Return timestamp values as a datetime64[s] array with NaT for missing values."""
+    nat = numpy.iinfo(numpy.int64).min
+    timestamps = []
+    for value in values:
+        timestamp = parse_timestamp(value)
+        timestamps.append(nat if timestamp is None else timestamp)
+    return numpy.array(timestamps, dtype=numpy.int64).view("datetime64[s]")
+
+
+def categorical_array(values):
+    """Return values as a :class:`Categorical`."""
+    codes = {}
+    code_list = []
+    for value in values:
+        if value is None:
+            code_list.append(-1)
+        else:
+            code_list.append(codes.setdefault(value, len(codes)))
+    return Categorical(
+        numpy.array(code_list, dtype=numpy.int32), object_array(list(codes))
+    )
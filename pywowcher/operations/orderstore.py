@@ -0,0 +1,329 @@
+"""
+The OrderStore class.
+
+Keeps a local copy of Wowcher orders in an SQLite database so that they can be looked up
+without making API requests. Orders are stored in an `orders` table with a column for
+each field of :class:`pywowcher.WowcherOrder` and their items in an `items` table.
+Values that SQLite would not return unchanged, such as dicts, lists and numeric IDs in
+text columns, are encoded and the type of each is recorded so that orders are returned
+as they were stored.
+"""
+
+import json
+import sqlite3
+import threading
+
+from .getorders import WowcherItem, WowcherOrder, parse_timestamp
+from .syncorders import WatermarkStore, make_watermark
+
+
+class OrderStore(WatermarkStore):
+    """
+    A local SQLite store of Wowcher orders.
+
+    Orders are looked up by order ID, Wowcher code, deal ID, product SKU or update time
+    using indexed queries. The store also keeps watermarks so that it can be passed to
+    :func:`pywowcher.sync_orders`.
+
+    The store can be used as a context manager, in which case it is closed on exit.
+    """
+
+    ORDER_ID = "order_id"
+    UPDATED_TIMESTAMP = "updated_timestamp"
+    INDEXED_FIELDS = ("wowcher_code", "deal_id", "product_sku", UPDATED_TIMESTAMP)
+    TEXT_FIELDS = ("wowcher_code", "deal_id", "product_sku")
+    FIELD_TYPES = "field_types"
+
+    JSON = "json"
+    BOOL = "bool"
+    INT = "int"
+    FLOAT = "float"
+    DECODERS = {JSON: json.loads, BOOL: bool, INT: int, FLOAT: float}
+
+    def __init__(self, path=":memory:"):
+        """
+        Open the database, creating its tables if they do not exist.
+
+        :param path: The path of the database file. By default the database is kept in
+            memory.
+        :type path: str
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.create_tables()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def __contains__(self, order_id):
+        return self.get_order(order_id) is not None
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def create_tables(self):
+        """Create the tables and indexes used by the store if they do not exist."""
+        order_columns = ", ".join(
+            "{} TEXT".format(field) if field in self.TEXT_FIELDS else field
+            for field in WowcherOrder.fields
+        )
+        statements = [
+            "CREATE TABLE IF NOT EXISTS orders ("
+            "order_id TEXT PRIMARY KEY, {}, {} INTEGER)".format(
+                order_columns, self.UPDATED_TIMESTAMP
+            ),
+            "CREATE TABLE IF NOT EXISTS items ("
+            "order_id TEXT NOT NULL, position INTEGER NOT NULL, sku TEXT, quantity, "
+            "options, "
+            "PRIMARY KEY (order_id, position))",
+            "CREATE INDEX IF NOT EXISTS items_sku ON items (sku)",
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "deal_id TEXT PRIMARY KEY, updated_at INTEGER, order_id)",
+        ]
+        for field in self.INDEXED_FIELDS:
+            statements.append(
+                "CREATE INDEX IF NOT EXISTS orders_{0} ON orders ({0})".format(field)
+            )
+        with self._lock, self.connection:
+            for statement in statements:
+                self.connection.execute(statement)
+            columns = [
+                row[1] for row in self.connection.execute("PRAGMA table_info(orders)")
+            ]
+            if self.FIELD_TYPES not in columns:
+                self.connection.execute(
+                    "ALTER TABLE orders ADD COLUMN {} TEXT".format(self.FIELD_TYPES)
+                )
+
+    def add_orders(self, orders):
+        """
+        Insert orders into the store, replacing any stored orders with the same ID.
+
+        All orders are added in a single transaction, so either every order is stored
+        or, if an error occurs, none are.
+
+        :param orders: The orders to store.
+        :type orders: iterable of :class:`pywowcher.WowcherOrder`
+
+        :returns: The number of orders stored.
+        :rtype: int
+        """
+        columns = (
+            (self.ORDER_ID,)
+            + WowcherOrder.fields
+            + (self.UPDATED_TIMESTAMP, self.FIELD_TYPES)
+        )
+        insert_order = "INSERT OR REPLACE INTO orders ({}) VALUES ({})".format(
+            ", ".join(columns), ", ".join("?" * len(columns))
+        )
+        insert_item = (
+            "INSERT INTO items (order_id, position, sku, quantity, options) "
+            "VALUES (?, ?, ?, ?, ?)"
+        )
+        order_rows = []
+        item_rows = []
+        for order in orders:
+            order_rows.append(self.get_order_row(order))
+            for position, item in enumerate(order.items):
+                item_rows.append(
+                    (
+                        order.order_id,
+                        position,
+                        item.sku,
+                        item.quantity,
+                        json.dumps(item.options),
+                    )
+                )
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM items WHERE order_id = ?",
+                ((row[0],) for row in order_rows),
+            )
+            self.connection.executemany(insert_order, order_rows)
+            self.connection.executemany(insert_item, item_rows)
+        return len(order_rows)
+
+    def get_order_row(self, order):
+        """Return the values of the `orders` table row for order."""
+        field_types = {}
+        values = []
+        for field in (self.ORDER_ID,) + WowcherOrder.fields:
+            value = getattr(order, field)
+            field_type = self.get_field_type(field, value)
+            if field_type is not None:
+                field_types[field] = field_type
+            if field_type == self.JSON:
+                value = json.dumps(value)
+            values.append(value)
+        values.append(parse_timestamp(order.updated_at))
+        values.append(json.dumps(field_types, sort_keys=True) if field_types else None)
+        return tuple(values)
+
+    def get_field_type(self, field, value):
+        """
+        Return the type to record for a value that SQLite would not return unchanged.
+
+        Returns None for values that are returned as they were stored.
+        """
+        if isinstance(value, (dict, list)):
+            return self.JSON
+        if isinstance(value, bool):
+            return self.BOOL
+        if field == self.ORDER_ID or field in self.TEXT_FIELDS:
+            if isinstance(value, int):
+                return self.INT
+            if isinstance(value, float):
+                return self.FLOAT
+        return None
+
+    def get_order(self, order_id):
+        """
+        Return the stored order with order_id.
+
+        :rtype: :class:`pywowcher.WowcherOrder` or None
+        """
+        orders = self.query("orders.order_id = ?", (order_id,))
+        return orders[0] if orders else None
+
+    def get_order_by_wowcher_code(self, wowcher_code):
+        """
+        Return the stored order with a Wowcher code.
+
+        :rtype: :class:`pywowcher.WowcherOrder` or None
+        """
+        orders = self.find_orders(wowcher_code=wowcher_code)
+        return orders[0] if orders else None
+
+    def find_orders(
+        self,
+        *,
+        wowcher_code=None,
+        deal_id=None,
+        product_sku=None,
+        item_sku=None,
+        updated_since=None
+    ):
+        """
+        Return the stored orders matching every passed filter.
+
+        Orders are returned in order of their update time.
+
+        :param wowcher_code str: Return the order with this Wowcher code.
+        :param deal_id: Return orders for this deal.
+        :param product_sku str: Return orders for this product SKU.
+        :param item_sku str: Return orders containing an item with this SKU.
+        :param updated_since: Return orders updated at or after this UNIX timestamp.
+        :type updated_since: int or None
+
+        :rtype: list of :class:`pywowcher.WowcherOrder`
+        """
+        conditions = []
+        parameters = []
+        for field, value in (
+            ("wowcher_code", wowcher_code),
+            ("deal_id", deal_id),
+            ("product_sku", product_sku),
+        ):
+            if value is not None:
+                conditions.append("orders.{} = ?".format(field))
+                parameters.append(value)
+        if item_sku is not None:
+            conditions.append(
+                "orders.order_id IN (SELECT order_id FROM items WHERE sku = ?)"
+            )
+            parameters.append(item_sku)
+        if updated_since is not None:
+            conditions.append("orders.{} >= ?".format(self.UPDATED_TIMESTAMP))
+            parameters.append(updated_since)
+        return self.query(" AND ".join(conditions) or "1", parameters)
+
+    def query(self, where, parameters):
+        """Return the orders selected by an SQL where clause as WowcherOrder."""
+        columns = (self.ORDER_ID,) + WowcherOrder.fields + (self.FIELD_TYPES,)
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT {} FROM orders WHERE {} ORDER BY {}, order_id".format(
+                    ", ".join("orders.{}".format(column) for column in columns),
+                    where,
+                    self.UPDATED_TIMESTAMP,
+                ),
+                tuple(parameters),
+            ).fetchall()
+            items = {}
+            order_ids = [row[0] for row in rows]
+            for start in range(0, len(order_ids), 500):
+                chunk = order_ids[start : start + 500]
+                for order_id, sku, quantity, options in self.connection.execute(
+                    "SELECT order_id, sku, quantity, options FROM items "
+                    "WHERE order_id IN ({}) ORDER BY order_id, position".format(
+                        ", ".join("?" * len(chunk))
+                    ),
+                    chunk,
+                ):
+                    items.setdefault(order_id, []).append(
+                        {
+                            WowcherItem.SKU: sku,
+                            WowcherItem.QUANTITY: quantity,
+                            WowcherItem.OPTIONS: json.loads(options),
+                        }
+                    )
+        orders = []
+        for row in rows:
+            order_data = dict(zip(WowcherOrder.fields, row[1:-1]))
+            order_data[WowcherOrder.ORDER_ID] = row[0]
+            for field, field_type in json.loads(row[-1] or "{}").items():
+                key = WowcherOrder.ORDER_ID if field == self.ORDER_ID else field
+                if order_data[key] is not None:
+                    order_data[key] = self.DECODERS[field_type](order_data[key])
+            order_data[WowcherOrder.ITEMS] = items.get(row[0], [])
+            orders.append(WowcherOrder(order_data))
+        return orders
+
+    def delete_orders(self, order_ids):
+        """Remove the orders with the passed IDs and their items from the store."""
+        parameters = [(order_id,) for order_id in order_ids]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM items WHERE order_id = ?", parameters
+            )
+            self.connection.executemany(
+                "DELETE FROM orders WHERE order_id = ?", parameters
+            )
+
+    def get_watermark(self, deal_id):
+        """Return the saved sync watermark for a deal."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT updated_at, order_id FROM watermarks WHERE deal_id = ?",
+                (str(deal_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        updated_at, order_ids = row
+        if isinstance(order_ids, str) and order_ids.startswith("["):
+            order_ids = json.loads(order_ids)
+        return make_watermark(updated_at, order_ids)
+
+    def set_watermark(self, deal_id, watermark):
+        """Save the sync watermark for a deal."""
+        watermark = make_watermark(*watermark)
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO watermarks (deal_id, updated_at, order_id) "
+                "VALUES (?, ?, ?)",
+                (
+                    str(deal_id),
+                    watermark.updated_at,
+                    json.dumps(list(watermark.order_ids)),
+                ),
+            )
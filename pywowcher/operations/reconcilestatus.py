@@ -0,0 +1,235 @@
+"""
+The reconcile_order_status method of pywowcher.
+
+Used to send only the status updates that would change an order. Each update is compared
+with the order as last retrieved from Wowcher and updates that Wowcher already shows,
+or that would move an order back to an earlier status, are skipped.
+"""
+
+import collections
+import logging
+
+from pywowcher import api_methods
+
+from .getorders import parse_timestamp
+from .setorderstatus import SetOrderStatus
+
+logger = logging.getLogger(__name__)
+
+SkippedUpdate = collections.namedtuple("SkippedUpdate", ["update", "order", "reason"])
+SkippedUpdate.__doc__ = """
+A status update that was not sent by :func:`pywowcher.reconcile_order_status`.
+
+:ivar dict update: The status update.
+:ivar order: The order as retrieved from Wowcher.
+:vartype order: :class:`pywowcher.WowcherOrder`
+:ivar str reason: :attr:`ReconcileOrderStatus.ALREADY_SET` or
+    :attr:`ReconcileOrderStatus.SUPERSEDED`.
+"""
+
+
+class ReconcileReport:
+    """
+    A report of the results of a status reconciliation.
+
+    :ivar list sent: The status updates that were sent.
+    :ivar list skipped: A :class:`SkippedUpdate` for each update that was not sent.
+    :ivar status_report: The report of the updates that were sent, or None if every
+        update was skipped.
+    :vartype status_report: :class:`pywowcher.operations.setorderstatus.StatusReport`
+    """
+
+    def __init__(self, *, sent, skipped, status_report=None):
+        """Create the report."""
+        self.sent = sent
+        self.skipped = skipped
+        self.status_report = status_report
+
+    def __repr__(self):
+        return "Reconcile report: {} sent, {} skipped".format(
+            len(self.sent), len(self.skipped)
+        )
+
+    @property
+    def ok(self):
+        """Return True if every update that was sent succeeded."""
+        return self.status_report is None or self.status_report.ok
+
+    @property
+    def failed_orders(self):
+        """Return the updates in chunks that failed, so that they can be resent."""
+        if self.status_report is None:
+            return []
+        return self.status_report.failed_orders
+
+
+class ReconcileOrderStatus:
+    """Set the status of the orders whose status would change."""
+
+    REFERENCE = api_methods.Status.REFERENCE
+    STATUS = api_methods.Status.STATUS
+    TRACKING_NUMBER = api_methods.Status.TRACKING_NUMBER
+    SHIPPING_VENDOR = api_methods.Status.SHIPPING_VENDOR
+    SHIPPING_METHOD = api_methods.Status.SHIPPING_METHOD
+
+    ALREADY_SET = "already_set"
+    SUPERSEDED = "superseded"
+
+    # The time each status was set, in the order the statuses are reached.
+    STATUS_FIELDS = (
+        (api_methods.Status.RECIEVED_BY_MERCHANT, "received_at"),
+        (api_methods.Status.READY_FOR_DISPATCH, "ready_for_despatch_at"),
+        (api_methods.Status.DISPATCHED, "despatched_at"),
+    )
+    DETAIL_FIELDS = (TRACKING_NUMBER, SHIPPING_VENDOR, SHIPPING_METHOD)
+
+    def __init__(
+        self,
+        *,
+        orders,
+        current_orders,
+        chunk_size=None,
+        max_workers=None,
+        concurrency=None,
+        raise_errors=True
+    ):
+        """
+        Set the status of the orders whose status would change.
+
+        :param orders: list containing dicts of orders formatted for a status update.
+            These can be created with :func:`pywowcher.make_order_status`.
+
+        :param current_orders: The orders as retrieved from Wowcher. Updates for
+            orders that are not included are always sent.
+        :type current_orders: iterable of :class:`pywowcher.WowcherOrder`
+
+        :param chunk_size: The maximum number of orders to send in a single request. If
+            None all orders are sent in one request.
+        :type chunk_size: int or None
+
+        :param max_workers: The maximum number of chunks to send at once. If None
+            chunks are sent one at a time.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of chunks to send at once.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param raise_errors: If True an exception is raised after every chunk has been
+            sent if any chunk failed, as by :func:`pywowcher.set_order_status`.
+        :type raise_errors: bool
+
+        :ivar report: The :class:`ReconcileReport` for the update.
+        """
+        self.orders = SetOrderStatus.prepare_orders(orders)
+        self.current_orders = {order.wowcher_code: order for order in current_orders}
+        sent, skipped = self.reconcile()
+        status_report = None
+        if sent:
+            status_report = SetOrderStatus(
+                orders=sent,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                concurrency=concurrency,
+                raise_errors=False,
+            ).report
+        logger.debug(
+            "Sending {} status updates, skipped {}.".format(len(sent), len(skipped))
+        )
+        self.report = ReconcileReport(
+            sent=sent, skipped=skipped, status_report=status_report
+        )
+        if raise_errors and status_report is not None:
+            status_report.raise_for_errors()
+
+    def reconcile(self):
+        """Return the updates to send and a :class:`SkippedUpdate` for the rest."""
+        sent = []
+        skipped = []
+        for update in self.orders:
+            order = self.current_orders.get(update[self.REFERENCE])
+            reason = None if order is None else self.get_skip_reason(update, order)
+            if reason is None:
+                sent.append(update)
+            else:
+                skipped.append(SkippedUpdate(update, order, reason))
+        return sent, skipped
+
+    def get_current_status(self, order):
+        """Return the latest status set for order, or None if none has been set."""
+        current_status = None
+        for status, field in self.STATUS_FIELDS:
+            if parse_timestamp(getattr(order, field)) is not None:
+                current_status = status
+        return current_status
+
+    def get_skip_reason(self, update, order):
+        """
+        Return why update would not change order, or None if it should be sent.
+
+        An update is superseded if the order already has a later status. It is already
+        set if the order has the same status and every tracking and shipping detail in
+        the update matches the order.
+        """
+        current_status = self.get_current_status(order)
+        status = int(update[self.STATUS])
+        if current_status is None or status > current_status:
+            return None
+        if status < current_status:
+            return self.SUPERSEDED
+        for field in self.DETAIL_FIELDS:
+            if field in update and update[field] != getattr(order, field):
+                return None
+        return self.ALREADY_SET
+
+
+def reconcile_order_status(
+    orders,
+    current_orders,
+    *,
+    chunk_size=None,
+    max_workers=None,
+    concurrency=None,
+    raise_errors=True
+):
+    """
+    Set the status of the orders whose status would change.
+
+    Each update is compared with the order as retrieved from Wowcher, such as by
+    :func:`pywowcher.get_orders`. Updates to a status the order already has, with the
+    same tracking and shipping details, and updates to a status earlier than the
+    order's current status are skipped. The remaining updates are sent as by
+    :func:`pywowcher.set_order_status`. This makes it cheap to resend a whole batch of
+    updates after some of them failed.
+
+    :param orders: list containing dicts of orders formatted for a status update. These
+        can be created with :func:`pywowcher.make_order_status`.
+
+    :param current_orders: The orders as retrieved from Wowcher. Updates for orders
+        that are not included are always sent.
+    :type current_orders: iterable of :class:`pywowcher.WowcherOrder`
+
+    :param chunk_size: The maximum number of orders to send in a single request. If
+        None all orders are sent in one request.
+    :type chunk_size: int or None
+
+    :param max_workers: The maximum number of chunks to send at once. If None chunks
+        are sent one at a time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of chunks to send at once.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param raise_errors: If True an exception is raised once every chunk has been sent
+        if any chunk failed, as by :func:`pywowcher.set_order_status`.
+    :type raise_errors: bool
+
+    :rtype: :class:`pywowcher.operations.reconcilestatus.ReconcileReport`
+    """
+    return ReconcileOrderStatus(
+        orders=orders,
+        current_orders=current_orders,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        concurrency=concurrency,
+        raise_errors=raise_errors,
+    ).report
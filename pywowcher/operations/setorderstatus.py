@@ -4,9 +4,118 @@ The set_order_status method of pywocher.
 Used to update the status of on or more orders.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
 from pywowcher import api_methods
 
 
+class StatusUpdateError(requests.HTTPError):
+    """
+    Raised when one or more chunks of a status update split into several chunks fail.
+
+    The response of the first failed chunk, if it received one, is set as
+    :attr:`response`.
+
+    :ivar report: The :class:`StatusReport` for the update.
+    """
+
+    def __init__(self, report):
+        """Create the exception for report."""
+        self.report = report
+        super().__init__(
+            "{} of {} status update chunks failed.".format(
+                len(report.failed), len(report.chunks)
+            ),
+            response=getattr(report.failed[0].error, "response", None),
+        )
+
+
+class StatusChunkResult:
+    """
+    The result of sending one chunk of a status update.
+
+    :ivar int index: The position of the chunk in the update.
+    :ivar list orders: The orders sent in the chunk.
+    :ivar response: The response to the Status request, if it succeeded.
+    :ivar error: The exception raised by the Status request, if it failed.
+    """
+
+    def __init__(self, *, index, orders, response=None, error=None):
+        """Set the result."""
+        self.index = index
+        self.orders = orders
+        self.response = response
+        self.error = error
+
+    def __repr__(self):
+        return "Status chunk {} ({} orders): {}".format(
+            self.index, len(self.orders), "OK" if self.ok else repr(self.error)
+        )
+
+    @property
+    def ok(self):
+        """Return True if the chunk was updated successfully."""
+        return self.error is None
+
+    @property
+    def references(self):
+        """Return the Wowcher references of the orders in the chunk."""
+        return [order[SetOrderStatus.REFERENCE] for order in self.orders]
+
+
+class StatusReport:
+    """
+    A report of the results of a status update.
+
+    :ivar list chunks: A :class:`StatusChunkResult` for each chunk, in order.
+    """
+
+    def __init__(self, chunks):
+        """Create the report from chunk results."""
+        self.chunks = sorted(chunks, key=lambda chunk: chunk.index)
+
+    def __repr__(self):
+        return "Status report: {} of {} chunks succeeded".format(
+            len(self.succeeded), len(self.chunks)
+        )
+
+    @property
+    def ok(self):
+        """Return True if every chunk was updated successfully."""
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def succeeded(self):
+        """Return the chunks that were updated successfully."""
+        return [chunk for chunk in self.chunks if chunk.ok]
+
+    @property
+    def failed(self):
+        """Return the chunks that failed."""
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def failed_orders(self):
+        """Return the orders in chunks that failed, so that they can be resent."""
+        return [order for chunk in self.failed for order in chunk.orders]
+
+    def raise_for_errors(self):
+        """
+        Raise an exception if any chunk failed.
+
+        If the update was sent in a single chunk the exception raised by its request is
+        raised again. Otherwise :class:`StatusUpdateError` is raised, with the exception
+        raised by the first failed chunk set as the cause.
+        """
+        if self.ok:
+            return
+        if len(self.chunks) == 1:
+            raise self.chunks[0].error
+        raise StatusUpdateError(self) from self.failed[0].error
+
+
 class SetOrderStatus:
     """Set the status of one or more orders."""
 
@@ -17,37 +126,121 @@ class SetOrderStatus:
     SHIPPING_VENDOR = api_methods.Status.SHIPPING_VENDOR
     SHIPPING_METHOD = api_methods.Status.SHIPPING_METHOD
 
-    def __init__(self, *, orders):
+    def __init__(
+        self,
+        *,
+        orders,
+        chunk_size=None,
+        max_workers=None,
+        concurrency=None,
+        raise_errors=True
+    ):
         """
         Set the status of one or more orders.
 
         :param orders: list containing dicts of orders formatted for a status update.
             These can be created with :func:`pywowcher.make_order_status`.
+
+        :param chunk_size: The maximum number of orders to send in a single request. If
+            None all orders are sent in one request.
+        :type chunk_size: int or None
+
+        :param max_workers: The maximum number of chunks to send at once. If None
+            chunks are sent one at a time.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of chunks to send at once.
+            If max_workers is None its maximum is used as max_workers.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param raise_errors: If True an exception is raised after every chunk has been
+            sent if any chunk failed, as by :meth:`StatusReport.raise_for_errors`.
+        :type raise_errors: bool
+
+        :ivar report: The :class:`StatusReport` for the update.
+        """
+        self.orders = orders
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.orders_to_send = self.prepare_orders(orders)
+        self.report = StatusReport(self.send_chunks(self.make_chunks()))
+        if raise_errors:
+            self.report.raise_for_errors()
+
+    @classmethod
+    def prepare_orders(cls, orders):
+        """
+        Return a list of orders correctly formatted for the Status API method.
+
+        :raises ValueError: If any of the orders is invalid.
         """
-        self.orders_to_send = []
+        orders_to_send = []
         for order_number, order in enumerate(orders):
             try:
-                self.orders_to_send.append(self.prepare_order(order))
+                orders_to_send.append(cls.prepare_order(order))
             except Exception:
                 raise ValueError(
                     "Invalid order for status update at index {}".format(order_number)
                 )
-        api_methods.Status(orders=orders).call()
+        return orders_to_send
 
-    def prepare_order(self, order):
+    def make_chunks(self):
+        """Return :attr:`orders_to_send` split into lists of at most chunk_size."""
+        if not self.chunk_size or len(self.orders_to_send) <= self.chunk_size:
+            return [self.orders_to_send]
+        return [
+            self.orders_to_send[start : start + self.chunk_size]
+            for start in range(0, len(self.orders_to_send), self.chunk_size)
+        ]
+
+    def send_chunks(self, chunks):
+        """
+        Send each chunk and return a list of :class:`StatusChunkResult`.
+
+        If :attr:`max_workers` is greater than one chunks are sent concurrently using a
+        thread pool of that size.
+        """
+        max_workers = self.max_workers
+        if max_workers is None and self.concurrency is not None:
+            max_workers = self.concurrency.maximum
+        if max_workers is None or max_workers < 2 or len(chunks) < 2:
+            return [self.send_chunk(index, chunk) for index, chunk in enumerate(chunks)]
+        max_workers = min(max_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.send_chunk, range(len(chunks)), chunks))
+
+    def send_chunk(self, index, orders):
+        """Send a status update for orders and return a :class:`StatusChunkResult`."""
+        method = self.make_status_method(orders)
+        try:
+            if self.concurrency is None:
+                response = method.call()
+            else:
+                response = self.concurrency.call(method)
+        except Exception as e:
+            return StatusChunkResult(index=index, orders=orders, error=e)
+        return StatusChunkResult(index=index, orders=orders, response=response)
+
+    def make_status_method(self, orders):
+        """Return the Status API method used to update orders."""
+        return api_methods.Status(orders=orders)
+
+    @classmethod
+    def prepare_order(cls, order):
         """Return a dict correctly formatted for an order for the Status API method."""
         order_dict = {
-            self.REFERENCE: order[self.REFERENCE],
-            self.STATUS: order[self.STATUS],
+            cls.REFERENCE: order[cls.REFERENCE],
+            cls.STATUS: order[cls.STATUS],
         }
-        if self.TIMESTAMP in order:
-            order_dict[self.TIMESTAMP] = order[self.TIMESTAMP]
-        if self.TRACKING_NUMBER in order:
-            order_dict[self.TRACKING_NUMBER] = order[self.TRACKING_NUMBER]
-        if self.SHIPPING_VENDOR in order:
-            order_dict[self.SHIPPING_VENDOR] = order[self.SHIPPING_VENDOR]
-        if self.SHIPPING_METHOD in order:
-            order_dict[self.SHIPPING_METHOD] = order[self.SHIPPING_METHOD]
+        if cls.TIMESTAMP in order:
+            order_dict[cls.TIMESTAMP] = order[cls.TIMESTAMP]
+        if cls.TRACKING_NUMBER in order:
+            order_dict[cls.TRACKING_NUMBER] = order[cls.TRACKING_NUMBER]
+        if cls.SHIPPING_VENDOR in order:
+            order_dict[cls.SHIPPING_VENDOR] = order[cls.SHIPPING_VENDOR]
+        if cls.SHIPPING_METHOD in order:
+            order_dict[cls.SHIPPING_METHOD] = order[cls.SHIPPING_METHOD]
         return order_dict
 
 
@@ -103,11 +296,45 @@ def make_order_status(
     return status
 
 
-def set_order_status(orders):
+def set_order_status(
+    orders, *, chunk_size=None, max_workers=None, concurrency=None, raise_errors=True
+):
     """
     Set the status of one or more orders.
 
+    Large updates can be split into several requests with chunk_size, which can be sent
+    concurrently with max_workers. A failed chunk does not prevent the other chunks
+    being sent.
+
     :param orders: list containing dicts of orders formatted for a status update. These
         can be created with :func:`pywowcher.make_order_status`.
+
+    :param chunk_size: The maximum number of orders to send in a single request. If
+        None all orders are sent in one request.
+    :type chunk_size: int or None
+
+    :param max_workers: The maximum number of chunks to send at once. If None chunks
+        are sent one at a time.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of chunks to send at once,
+        which rises while the server responds quickly and falls when requests are
+        throttled.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param raise_errors: If True an exception is raised once every chunk has been sent
+        if any chunk failed. For a single chunk this is the exception raised by its
+        request, such as :class:`requests.HTTPError`, otherwise it is
+        :class:`pywowcher.operations.setorderstatus.StatusUpdateError`. If False
+        failures are only recorded in the returned report.
+    :type raise_errors: bool
+
+    :rtype: :class:`pywowcher.operations.setorderstatus.StatusReport`
     """
-    SetOrderStatus(orders=orders)
+    return SetOrderStatus(
+        orders=orders,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        concurrency=concurrency,
+        raise_errors=raise_errors,
+    ).report
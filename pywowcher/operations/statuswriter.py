@@ -0,0 +1,284 @@
+"""
+The StatusWriter class.
+
+Sends status updates made one order at a time in batches. Updates are added to a queue
+from any thread and a background thread sends them with a single Status request once
+enough have been queued, or once the oldest has waited long enough.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+from .setorderstatus import SetOrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+class _Flush:
+    """A request to send every queued update, set once they have been sent."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+# Writers that have not been closed, which are closed when the interpreter exits.
+_open_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_writers():
+    """Close every open writer, sending its queued updates."""
+    for writer in list(_open_writers):
+        try:
+            writer.close()
+        except Exception:
+            logger.exception("Failed to close {!r} at exit.".format(writer))
+
+
+def get_deadline(timeout):
+    """Return the time.monotonic() time at which timeout expires, or None."""
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def get_remaining(deadline):
+    """Return the seconds until deadline, or None for no deadline."""
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+
+def get_lock_timeout(deadline):
+    """Return the timeout to pass to :meth:`threading.Lock.acquire` for deadline."""
+    return -1 if deadline is None else get_remaining(deadline)
+
+
+class StatusWriter:
+    """
+    Send status updates from any thread in batches.
+
+    Each update passed to :meth:`submit` is queued and a
+    :class:`concurrent.futures.Future` is returned for it. A background thread sends
+    queued updates in a Status request once batch_size have been queued or interval
+    seconds after the first of a batch was queued, whichever is sooner. The future for
+    each update is resolved with the response to the request that sent it, or fails
+    with its exception. A failed request does not stop later batches being sent.
+
+    If max_queued updates are waiting :meth:`submit` blocks until there is room, so a
+    producer cannot get further ahead of the Wowcher API than that. Use the writer as a
+    context manager, or call :meth:`close`, to send every queued update. Writers that
+    are still open when the interpreter exits are closed by an :mod:`atexit` handler.
+
+    :ivar int submitted: The number of updates queued.
+    :ivar int sent: The number of updates sent successfully.
+    :ivar int failed: The number of updates in requests that failed.
+    :ivar int requests: The number of Status requests made.
+    """
+
+    def __init__(
+        self, *, batch_size=100, interval=1.0, max_queued=10000, concurrency=None
+    ):
+        """
+        Start the background thread.
+
+        :param batch_size int: The most updates to send in one request.
+        :param interval float: The most seconds an update waits before its batch is
+            sent.
+        :param max_queued int: The most updates that can wait to be sent before
+            :meth:`submit` blocks.
+        :param concurrency: If set, requests are made through this limit so that they
+            share it with other operations.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.batch_size = batch_size
+        self.interval = interval
+        self.concurrency = concurrency
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.requests = 0
+        self.closed = False
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self.run, name="pywowcher-status-writer", daemon=True
+        )
+        self._thread.start()
+        _open_writers.add(self)
+
+    def __repr__(self):
+        return "StatusWriter(queued={}, sent={}, failed={}, requests={})".format(
+            self._queue.qsize(), self.sent, self.failed, self.requests
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def submit(self, order, *, timeout=None):
+        """
+        Queue a status update to be sent.
+
+        :param order: The update, as created by :func:`pywowcher.make_order_status`.
+        :type order: dict
+        :param timeout: The most seconds to wait for room in the queue. If None wait
+            until there is room.
+        :type timeout: float or None
+
+        :raises ValueError: If order is not a valid status update.
+        :raises RuntimeError: If the writer has been closed.
+        :raises queue.Full: If there is no room in the queue within timeout.
+
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        try:
+            order = SetOrderStatus.prepare_order(order)
+        except Exception:
+            raise ValueError("Invalid order for status update.")
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Cannot submit to a closed StatusWriter.")
+            self._queue.put((order, future), timeout=timeout)
+            self.submitted += 1
+        return future
+
+    def flush(self, timeout=None):
+        """
+        Send every update queued so far and wait until they have been sent.
+
+        :param timeout: The most seconds to wait. If None wait until they are sent.
+        :type timeout: float or None
+
+        :returns: True if the updates were sent within timeout. False if they were not,
+            including when there was no room in the queue to request the flush.
+        :rtype: bool
+        """
+        deadline = get_deadline(timeout)
+        flush = _Flush()
+        if not self._lock.acquire(timeout=get_lock_timeout(deadline)):
+            return False
+        try:
+            if not self.closed:
+                try:
+                    self._queue.put(flush, timeout=get_remaining(deadline))
+                except queue.Full:
+                    return False
+        finally:
+            self._lock.release()
+        if self.closed and not flush.done.is_set():
+            self._thread.join(get_remaining(deadline))
+            return not self._thread.is_alive()
+        return flush.done.wait(get_remaining(deadline))
+
+    def close(self, timeout=None):
+        """
+        Send every queued update and stop the background thread.
+
+        :param timeout: The most seconds to wait. If None wait until every update is
+            sent.
+        :type timeout: float or None
+
+        :raises queue.Full: If there is no room in the queue within timeout. The writer
+            is left open and close can be called again.
+        """
+        deadline = get_deadline(timeout)
+        if not self._lock.acquire(timeout=get_lock_timeout(deadline)):
+            raise queue.Full
+        try:
+            if self.closed:
+                return
+            self._queue.put(_STOP, timeout=get_remaining(deadline))
+            self.closed = True
+        finally:
+            self._lock.release()
+        _open_writers.discard(self)
+        self._thread.join(get_remaining(deadline))
+
+    def run(self):
+        """Collect queued updates into batches and send them until closed."""
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                batch = self.send_batch(batch)
+                continue
+            if item is _STOP:
+                self.drain(batch)
+                return
+            if isinstance(item, _Flush):
+                batch = self.send_batch(batch)
+                item.done.set()
+                continue
+            if not batch:
+                deadline = time.monotonic() + self.interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                batch = self.send_batch(batch)
+
+    def drain(self, batch):
+        """Send batch and anything still queued, then release every waiting flush."""
+        flushes = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _Flush):
+                flushes.append(item)
+            elif item is not _STOP:
+                batch.append(item)
+        while batch:
+            self.send_batch(batch[: self.batch_size])
+            batch = batch[self.batch_size :]
+        for flush in flushes:
+            flush.done.set()
+
+    def send_batch(self, batch):
+        """
+        Send a batch of queued updates and resolve their futures.
+
+        Updates whose future has been cancelled are not sent. Returns a new, empty,
+        batch.
+        """
+        batch = [
+            (order, future)
+            for order, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return []
+        orders = [order for order, _ in batch]
+        try:
+            report = SetOrderStatus(
+                orders=orders, concurrency=self.concurrency, raise_errors=False
+            ).report
+            result = report.chunks[0]
+            response, error = result.response, result.error
+        except Exception as e:
+            response, error = None, e
+        self.requests += 1
+        if error is None:
+            self.sent += len(batch)
+        else:
+            self.failed += len(batch)
+            logger.warning(
+                "Status update for {} orders failed: {!r}".format(len(batch), error)
+            )
+        for _, future in batch:
+            if error is None:
+                future.set_result(response)
+            else:
+                future.set_exception(error)
+        return []
@@ -0,0 +1,293 @@
+"""
+The sync_orders method of pywowcher.
+
+Used to retrieve only the orders for a deal that are new or have changed since the last
+sync. The most recent `updated_at` time seen for each deal, and the IDs of the orders
+updated at that time, are saved as a watermark in a watermark store and later syncs
+request orders from that point.
+"""
+
+import collections
+import datetime
+import json
+import os
+import tempfile
+import threading
+
+from .getorders import IterOrders, WowcherOrder, parse_timestamp
+
+Watermark = collections.namedtuple("Watermark", ["updated_at", "order_ids"])
+Watermark.__doc__ = """
+The position up to which the orders of a deal have been synced.
+
+`updated_at` only has a resolution of one second, so the IDs of the orders seen at
+that time are kept. Orders updated in the same second that are not among them are
+synced by the next sync.
+
+:ivar int updated_at: The greatest `updated_at` UNIX timestamp seen.
+:ivar tuple order_ids: The IDs, as sorted str, of the orders seen with that
+    `updated_at` time.
+"""
+
+
+def make_watermark(updated_at, order_ids):
+    """
+    Return a :class:`Watermark` with its order IDs normalised to a sorted tuple of str.
+
+    A single order ID, as saved by earlier versions, is accepted in place of order_ids.
+
+    :rtype: :class:`Watermark`
+    """
+    if isinstance(order_ids, (str, int)):
+        order_ids = [order_ids]
+    return Watermark(int(updated_at), tuple(sorted({str(_) for _ in order_ids})))
+
+
+class WatermarkStore:
+    """Base class for watermark stores."""
+
+    def get_watermark(self, deal_id):
+        """
+        Return the saved watermark for a deal.
+
+        :rtype: :class:`Watermark` or None
+        """
+        raise NotImplementedError
+
+    def set_watermark(self, deal_id, watermark):
+        """Save the watermark for a deal."""
+        raise NotImplementedError
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Keep watermarks in memory for the life of the store."""
+
+    def __init__(self):
+        """Create an empty store."""
+        self.watermarks = {}
+
+    def get_watermark(self, deal_id):
+        """Return the saved watermark for a deal."""
+        return self.watermarks.get(str(deal_id))
+
+    def set_watermark(self, deal_id, watermark):
+        """Save the watermark for a deal."""
+        self.watermarks[str(deal_id)] = make_watermark(*watermark)
+
+
+class FileWatermarkStore(WatermarkStore):
+    """
+    Keep watermarks in a JSON file.
+
+    The file is created when the first watermark is saved and is replaced atomically
+    each time a watermark changes, so an interrupted sync never corrupts it.
+    """
+
+    def __init__(self, path):
+        """
+        Set the path of the watermark file.
+
+        :param path: The path of the watermark file.
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return all saved watermarks keyed by deal ID."""
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as watermark_file:
+            data = json.load(watermark_file)
+        return {deal_id: make_watermark(*value) for deal_id, value in data.items()}
+
+    def get_watermark(self, deal_id):
+        """Return the saved watermark for a deal."""
+        with self._lock:
+            return self.load().get(str(deal_id))
+
+    def set_watermark(self, deal_id, watermark):
+        """Save the watermark for a deal."""
+        with self._lock:
+            watermarks = self.load()
+            watermarks[str(deal_id)] = make_watermark(*watermark)
+            data = {key: list(value) for key, value in watermarks.items()}
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as watermark_file:
+                    json.dump(data, watermark_file, indent=4, sort_keys=True)
+                os.replace(temp_path, self.path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+
+
+class SyncOrders(IterOrders):
+    """Request the orders for a deal that have changed since the last sync."""
+
+    UPDATED_AT = "updated_at"
+    DEFAULT_HISTORY = datetime.timedelta(days=100)
+
+    def __init__(
+        self,
+        *,
+        deal_id,
+        store,
+        start_date=None,
+        end_date=None,
+        max_workers=None,
+        concurrency=None,
+        lazy=False
+    ):
+        """
+        Request the orders changed since the deal's watermark and save a new watermark.
+
+        :param deal_id: The ID of the Wowcher deal for which to collect orders.
+        :type deal_id: str or int
+
+        :param store: The store in which the deal's watermark is kept.
+        :type store: :class:`WatermarkStore`
+
+        :param start_date: The earliest creation date of orders to sync. If None orders
+            created in the last :attr:`DEFAULT_HISTORY` are synced.
+        :type start_date: datetime.datetime or None
+
+        :param end_date: Filter orders using a end date.
+        :type end_date: datetime.datetime or None
+
+        :param max_workers: The maximum number of pages to request at once.
+        :type max_workers: int or None
+
+        :param concurrency: An adaptive limit on the number of pages to request at once.
+        :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+        :param lazy: If True orders will be returned as
+            :class:`pywowcher.operations.getorders.LazyWowcherOrder`.
+        :type lazy: bool
+
+        :ivar orders: The new or changed orders as :class:`pywowcher.WowcherOrder`.
+        :type orders: list
+        :ivar watermark: The deal's watermark after the sync.
+        :type watermark: :class:`Watermark` or None
+        """
+        if start_date is None:
+            start_date = datetime.datetime.now() - self.DEFAULT_HISTORY
+        self.store = store
+        self.watermark = store.get_watermark(deal_id)
+        if self.watermark is None:
+            from_date = start_date
+        else:
+            from_date = datetime.datetime.fromtimestamp(self.watermark.updated_at)
+        super().__init__(
+            deal_id=deal_id,
+            from_date=from_date,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            concurrency=concurrency,
+            lazy=lazy,
+        )
+        self.orders = self.sync()
+
+    def sync(self):
+        """
+        Return the orders changed since the watermark and save the new watermark.
+
+        The watermark is only saved once every page has been received, so a failed
+        sync will be repeated in full the next time it is run.
+
+        :rtype: list of :class:`pywowcher.WowcherOrder`
+        """
+        changed = collections.OrderedDict()
+        updated_at, order_ids = None, set()
+        if self.watermark is not None:
+            updated_at, order_ids = self.watermark.updated_at, set(
+                self.watermark.order_ids
+            )
+        for response_data in self.request_pages():
+            for order_data in response_data[self.DATA][self.DATA]:
+                order_updated_at, order_id = self.get_order_update(order_data)
+                if self.is_synced(order_updated_at, order_id):
+                    continue
+                changed.pop(order_id, None)
+                changed[order_id] = order_data
+                if updated_at is None or order_updated_at > updated_at:
+                    updated_at, order_ids = order_updated_at, {order_id}
+                elif order_updated_at == updated_at:
+                    order_ids.add(order_id)
+        if updated_at is not None:
+            watermark = make_watermark(updated_at, order_ids)
+            if watermark != self.watermark:
+                self.store.set_watermark(self.deal_id, watermark)
+                self.watermark = watermark
+        return [self.process_order_data(order_data) for order_data in changed.values()]
+
+    def is_synced(self, updated_at, order_id):
+        """Return True if an order update was returned by an earlier sync."""
+        if self.watermark is None:
+            return False
+        if updated_at == self.watermark.updated_at:
+            return order_id in self.watermark.order_ids
+        return updated_at < self.watermark.updated_at
+
+    def get_order_update(self, order_data):
+        """Return the `updated_at` timestamp and str order ID of order data."""
+        return (
+            parse_timestamp(order_data[self.UPDATED_AT]) or 0,
+            str(order_data[WowcherOrder.ORDER_ID]),
+        )
+
+
+def sync_orders(
+    *,
+    deal_id,
+    store,
+    start_date=None,
+    end_date=None,
+    max_workers=None,
+    concurrency=None,
+    lazy=False
+):
+    """
+    Return the orders for a Wowcher deal that are new or changed since the last sync.
+
+    The first sync for a deal returns every order created since start_date. Later syncs
+    request only orders updated since the deal's saved watermark and return those that
+    are newer than it.
+
+    :param deal_id: The ID of the Wowcher deal for which to collect orders.
+    :type deal_id: int or str
+
+    :param store: The store in which the deal's watermark is kept, such as a
+        :class:`pywowcher.operations.syncorders.FileWatermarkStore`.
+    :type store: :class:`pywowcher.operations.syncorders.WatermarkStore`
+
+    :param start_date: The earliest creation date of orders to sync. If None orders
+        created in the last 100 days are synced.
+    :type start_date:  :class:`datetime.datetime` or None
+
+    :param end_date: Filter orders using a end date.
+    :type end_date:  :class:`datetime.datetime` or None
+
+    :param max_workers: The maximum number of pages to request concurrently.
+    :type max_workers: int or None
+
+    :param concurrency: An adaptive limit on the number of pages to request at once.
+    :type concurrency: :class:`pywowcher.concurrency.AdaptiveConcurrency` or None
+
+    :param lazy: If True orders will be returned as
+        :class:`pywowcher.operations.getorders.LazyWowcherOrder`.
+    :type lazy: bool
+
+    :rtype: list of :class:`pywowcher.WowcherOrder`
+    """
+    return SyncOrders(
+        deal_id=deal_id,
+        store=store,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        concurrency=concurrency,
+        lazy=lazy,
+    ).orders
@@ -0,0 +1,222 @@
+"""
+The PageSizeTuner class.
+
+Chooses the number of orders to request in each page of an Orders request. Larger pages
+need fewer round trips but take longer for the server to produce, so the best size
+depends on the network and the load on the Wowcher servers. The tuner tries
+progressively larger sizes, measuring the time taken per order and the rate of failed
+requests at each, and settles on the fastest size that does not fail.
+"""
+
+import collections
+import logging
+import threading
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+PageStats = collections.namedtuple(
+    "PageStats", ["pages", "orders", "seconds", "errors"]
+)
+PageStats.__doc__ = """
+Measurements for one page size of a :class:`PageSizeTuner`.
+
+:ivar int pages: The number of full pages received.
+:ivar int orders: The number of orders in those pages.
+:ivar float seconds: The total time taken to receive those pages.
+:ivar int errors: The number of failed requests.
+"""
+
+
+class PageSizeTuner:
+    """
+    Find the page size for Orders requests that retrieves orders fastest.
+
+    Sizes are tried in turn from initial, multiplying by factor each time up to
+    maximum. Each size is measured over samples full pages. While a size retrieves
+    orders at least min_improvement faster per order than the best size so far the
+    next size is tried, otherwise the tuner returns to the best size and settles. A
+    size whose error rate exceeds max_error_rate, or which the server refuses, is
+    abandoned and no larger size is tried. If the server returns fewer orders per page
+    than requested the sizes are capped at the number it returned.
+
+    Set a tuner with
+    :func:`pywowcher.wowcher_session.WowcherAPISession.set_page_size_tuner` to use it
+    for every Orders request that does not set `per_page`. An instance is thread safe
+    and keeps what it has learned between calls.
+
+    :ivar list sizes: The page sizes that may be used.
+    :ivar int per_page: The page size to use for the next request.
+    :ivar bool settled: True once the best page size has been found.
+    """
+
+    REJECTED_STATUSES = (400, 413, 422)
+
+    def __init__(
+        self,
+        *,
+        initial=100,
+        maximum=1000,
+        factor=2,
+        samples=3,
+        min_improvement=0.1,
+        max_error_rate=0.2
+    ):
+        """
+        Set the page sizes to try.
+
+        :param initial int: The page size to start with.
+        :param maximum int: The largest page size to try.
+        :param factor int: The multiple of the current size to try next.
+        :param samples int: The number of full pages to measure for each size.
+        :param min_improvement float: The fraction by which the time per order must
+            fall for a larger size to be kept.
+        :param max_error_rate float: The largest fraction of failed requests allowed
+            for a size to be used.
+        """
+        if not 1 <= initial <= maximum:
+            raise ValueError("Sizes must satisfy 1 <= initial <= maximum.")
+        if factor < 2:
+            raise ValueError("factor must be at least 2.")
+        self.samples = samples
+        self.min_improvement = min_improvement
+        self.max_error_rate = max_error_rate
+        self.sizes = [initial]
+        while self.sizes[-1] * factor <= maximum:
+            self.sizes.append(self.sizes[-1] * factor)
+        self.index = 0
+        self.best_index = 0
+        self.settled = len(self.sizes) == 1
+        self._stats = {size: PageStats(0, 0, 0.0, 0) for size in self.sizes}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "PageSizeTuner(per_page={}, settled={})".format(
+            self.per_page, self.settled
+        )
+
+    @property
+    def per_page(self):
+        """Return the page size to use for the next request."""
+        return self.sizes[self.index]
+
+    def get_stats(self, per_page):
+        """
+        Return the measurements for a page size.
+
+        :rtype: :class:`PageStats`
+        """
+        with self._lock:
+            return self._stats.get(per_page, PageStats(0, 0, 0.0, 0))
+
+    def get_latency(self, per_page):
+        """Return the average time taken per order at a page size, or None."""
+        stats = self._stats[per_page]
+        if not stats.orders:
+            return None
+        return stats.seconds / stats.orders
+
+    def record(self, per_page, *, seconds, orders, server_per_page=None):
+        """
+        Record a successfully received page.
+
+        Only full pages are measured, as the time taken for the last, partly empty,
+        page of a deal is not representative.
+
+        :param per_page int: The page size requested.
+        :param seconds float: The time taken to receive the page.
+        :param orders int: The number of orders in the page.
+        :param server_per_page int: The page size reported by the server.
+        """
+        with self._lock:
+            if server_per_page is not None and server_per_page < per_page:
+                self.limit_sizes(server_per_page)
+                return
+            if per_page not in self._stats or orders < per_page:
+                return
+            stats = self._stats[per_page]
+            self._stats[per_page] = stats._replace(
+                pages=stats.pages + 1,
+                orders=stats.orders + orders,
+                seconds=stats.seconds + seconds,
+            )
+            self.update()
+
+    def record_error(self, per_page, exception):
+        """
+        Record a failed request.
+
+        If the server refused the request with a status in :attr:`REJECTED_STATUSES`
+        the size, and every larger size, will not be used again.
+
+        :param per_page int: The page size requested.
+        :param exception Exception: The exception raised by the request.
+        """
+        response = getattr(exception, "response", None)
+        with self._lock:
+            if per_page not in self._stats:
+                return
+            if (
+                isinstance(exception, requests.HTTPError)
+                and response is not None
+                and response.status_code in self.REJECTED_STATUSES
+                and self.sizes.index(per_page) > 0
+            ):
+                self.limit_sizes(self.sizes[self.sizes.index(per_page) - 1])
+                return
+            stats = self._stats[per_page]
+            self._stats[per_page] = stats._replace(errors=stats.errors + 1)
+            self.update()
+
+    def update(self):
+        """Move to the next page size to try, or settle, once a size is measured."""
+        if self.settled:
+            return
+        stats = self._stats[self.per_page]
+        attempts = stats.pages + stats.errors
+        if attempts >= self.samples and stats.errors > self.max_error_rate * attempts:
+            self.sizes = self.sizes[: max(self.index, 1)]
+            self.settle(min(self.best_index, len(self.sizes) - 1))
+            return
+        if stats.pages < self.samples:
+            return
+        if self.index != self.best_index:
+            best_latency = self.get_latency(self.sizes[self.best_index])
+            if self.get_latency(self.per_page) > best_latency * (
+                1 - self.min_improvement
+            ):
+                self.settle(self.best_index)
+                return
+            self.best_index = self.index
+        if self.index + 1 < len(self.sizes):
+            self.index += 1
+            logger.debug("Trying a page size of {}.".format(self.per_page))
+        else:
+            self.settle(self.index)
+
+    def settle(self, index):
+        """Use the page size at index from now on."""
+        self.index = self.best_index = index
+        self.settled = True
+        logger.debug("Settled on a page size of {}.".format(self.per_page))
+
+    def limit_sizes(self, maximum):
+        """Stop using page sizes larger than maximum."""
+        sizes = [size for size in self.sizes if size <= maximum] or [maximum]
+        if sizes[-1] != maximum and maximum not in self.sizes:
+            sizes.append(maximum)
+            self._stats.setdefault(maximum, PageStats(0, 0, 0.0, 0))
+        self.sizes = sizes
+        if self.index >= len(sizes):
+            self.index = len(sizes) - 1
+            self.settled = True
+        self.best_index = min(self.best_index, self.index)
+        logger.debug("Limited page sizes to {}.".format(maximum))
+
+    def reset(self):
+        """Forget all measurements and start tuning again from the smallest size."""
+        with self._lock:
+            self._stats = {size: PageStats(0, 0, 0.0, 0) for size in self.sizes}
+            self.index = self.best_index = 0
+            self.settled = len(self.sizes) == 1
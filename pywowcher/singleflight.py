@@ -0,0 +1,87 @@
+"""
+The SingleFlight class.
+
+Shares the work of identical calls that are in progress at the same time. When a call
+is made with the same key as one that is still running the second caller waits for the
+first to finish and receives its result, or its exception, instead of repeating the
+work. Once a call finishes its result is not kept, so later calls always do the work
+again.
+"""
+
+import threading
+
+
+class _Call:
+    """A call in progress and its outcome."""
+
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one.
+
+    :ivar int calls: The number of calls that did the work.
+    :ivar int coalesced: The number of calls that waited for another call's result.
+    """
+
+    def __init__(self):
+        """Create a group with no calls in progress."""
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __repr__(self):
+        return "SingleFlight(in_flight={}, calls={}, coalesced={})".format(
+            len(self), self.calls, self.coalesced
+        )
+
+    def do(self, key, function):
+        """
+        Call function, unless a call with the same key is in progress.
+
+        If a call with key is already running wait for it to finish and return its
+        result, or raise its exception.
+
+        :param key: Identifies calls that would return the same result.
+        :type key: hashable
+        :param function: The function to call, taking no arguments.
+        :type function: callable
+
+        :returns: (result, shared), where shared is True if the result came from a
+            call made by another caller.
+        :rtype: tuple
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,171 @@
+"""
+Incremental parsing of JSON API responses.
+
+:class:`PageParser` reads a response body as it is received and yields the items of one
+array within it, such as the orders of an Orders page, as soon as each is complete.
+Only the item being parsed and the unparsed remainder of the last chunk received are
+held in memory, instead of the whole body, its decoded text and the decoded data at
+once.
+"""
+
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARACTERS = "-+.0123456789eE"
+
+
+class PageParser:
+    """
+    Yield the items of an array within a JSON object from chunks of bytes.
+
+    Iterate over the parser to receive the items of the array at path. Every other value
+    in the objects on the path is kept in :attr:`page`, which is complete once
+    iteration has finished. The array at path is replaced by an empty list in
+    :attr:`page`.
+
+    :ivar dict page: The decoded response without the items of the array at path.
+    :ivar int bytes_received: The number of bytes of the body parsed so far.
+    """
+
+    DEFAULT_PATH = ("data", "data")
+
+    def __init__(self, chunks, *, path=DEFAULT_PATH):
+        """
+        Set the body to parse.
+
+        :param chunks: The response body in chunks, as returned by
+            :meth:`requests.Response.iter_content`.
+        :type chunks: iterable of bytes
+
+        :param path: The keys of the nested objects leading to the array to stream.
+        :type path: tuple of str
+        """
+        self.chunks = iter(chunks)
+        self.path = tuple(path)
+        self.page = {}
+        self.bytes_received = 0
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._finished = False
+
+    def __iter__(self):
+        self.skip_whitespace()
+        self.expect("{")
+        yield from self.parse_object(self.path, self.page)
+
+    def read_more(self):
+        """Add the next chunk to the buffer. Return False if the body is complete."""
+        if self._finished:
+            return False
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            self.bytes_received += len(chunk)
+            text = self._text_decoder.decode(chunk)
+            self._buffer = self._buffer[self._position :] + text
+            self._position = 0
+            return True
+        self._buffer = self._buffer[self._position :] + self._text_decoder.decode(
+            b"", final=True
+        )
+        self._position = 0
+        self._finished = True
+        return False
+
+    def skip_whitespace(self):
+        """Advance past whitespace, reading more of the body as needed."""
+        while True:
+            buffer = self._buffer
+            position = self._position
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            self._position = position
+            if position < len(buffer) or not self.read_more():
+                return
+
+    def peek(self):
+        """Return the next character without consuming it."""
+        self.skip_whitespace()
+        if self._position >= len(self._buffer):
+            raise ValueError("Unexpected end of JSON response.")
+        return self._buffer[self._position]
+
+    def expect(self, character):
+        """Consume the next character, raising ValueError if it is not character."""
+        if self.peek() != character:
+            raise ValueError(
+                "Expected {!r} at {!r} in JSON response.".format(
+                    character, self._buffer[self._position : self._position + 20]
+                )
+            )
+        self._position += 1
+
+    def decode_value(self):
+        """Return the next complete JSON value, reading more of the body as needed."""
+        if self.peek() in NUMBER_CHARACTERS:
+            self.read_number()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if self.read_more():
+                    continue
+                raise
+            self._position = end
+            return value
+
+    def read_number(self):
+        """Read more of the body until the number at the current position is complete."""
+        while True:
+            buffer = self._buffer
+            position = self._position
+            while position < len(buffer) and buffer[position] in NUMBER_CHARACTERS:
+                position += 1
+            if position < len(buffer) or not self.read_more():
+                return
+
+    def parse_object(self, path, container):
+        """
+        Yield the items of the array at path within the object being parsed.
+
+        The opening brace must already have been consumed. Other values are added to
+        container.
+        """
+        if self.peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = self.decode_value()
+            self.expect(":")
+            opening = "[" if len(path) == 1 else "{"
+            if path and key == path[0] and self.peek() == opening:
+                self._position += 1
+                if len(path) == 1:
+                    container[key] = []
+                    yield from self.parse_array()
+                else:
+                    container[key] = {}
+                    yield from self.parse_object(path[1:], container[key])
+            else:
+                container[key] = self.decode_value()
+            if self.peek() == ",":
+                self._position += 1
+                continue
+            self.expect("}")
+            return
+
+    def parse_array(self):
+        """Yield each item of the array being parsed."""
+        if self.peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self.peek() == ",":
+                self._position += 1
+                continue
+            self.expect("]")
+            return
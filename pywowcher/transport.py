@@ -0,0 +1,611 @@
+"""The WowcherTransport and AsyncWowcherTransport classes."""
+
+import asyncio
+import datetime
+import email.utils
+import json
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+_connect_timer = threading.local()
+
+
+class RequestTiming:
+    """
+    The time taken by each stage of an HTTP request, in seconds.
+
+    :ivar float connect: Time spent opening new connections.
+    :ivar float server: Time from sending the request until the response headers were
+        received, excluding connect.
+    :ivar float transfer: Time spent receiving the response body.
+    """
+
+    def __init__(self, *, connect, server, transfer):
+        """Set the times."""
+        self.connect = connect
+        self.server = server
+        self.transfer = transfer
+
+    def __repr__(self):
+        return "RequestTiming(connect={:.4f}, server={:.4f}, transfer={:.4f})".format(
+            self.connect, self.server, self.transfer
+        )
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Retries wait for an exponentially increasing delay of
+    ``backoff_factor * 2 ** retry`` seconds, capped at max_backoff. With jitter the delay
+    is chosen at random between zero and this value so that concurrent requests do not
+    retry in step. If a response has a `Retry-After` header its delay is used instead.
+
+    :ivar int max_retries: The maximum number of times to retry a request.
+    :ivar float backoff_factor: The delay before the first retry, in seconds.
+    :ivar float max_backoff: The maximum delay between retries, in seconds.
+    :ivar bool jitter: If True delays are randomised.
+    :ivar tuple retry_statuses: HTTP status codes for which requests are retried.
+    :ivar bool retry_connection_errors: If True requests are retried after connection
+        errors and timeouts.
+    :ivar float max_retry_after: The longest `Retry-After` delay to wait for. If the
+        server asks for a longer delay the request is not retried.
+    """
+
+    DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        *,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        retry_statuses=DEFAULT_RETRY_STATUSES,
+        retry_connection_errors=True,
+        max_retry_after=120.0
+    ):
+        """Set the retry settings."""
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.max_retry_after = max_retry_after
+
+    def __repr__(self):
+        return "RetryPolicy(max_retries={}, retry_statuses={})".format(
+            self.max_retries, self.retry_statuses
+        )
+
+    def get_backoff(self, retry):
+        """Return the delay in seconds before retry number retry, counting from 0."""
+        backoff = min(self.backoff_factor * 2**retry, self.max_backoff)
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def get_retry_after(response):
+        """
+        Return the delay in seconds requested by a response's `Retry-After` header.
+
+        Returns None if the response has no valid `Retry-After` header.
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((retry_at - now).total_seconds(), 0.0)
+
+    def get_response_delay(self, retry, response):
+        """
+        Return the delay before retrying after response, or None not to retry.
+
+        :param retry: The number of retries already made.
+        :type retry: int
+        :param response: The response to the failed request.
+        """
+        if retry >= self.max_retries or response.status_code not in self.retry_statuses:
+            return None
+        retry_after = self.get_retry_after(response)
+        if retry_after is None:
+            return self.get_backoff(retry)
+        if retry_after > self.max_retry_after:
+            logger.warning(
+                "Not retrying, Retry-After of {}s is too long.".format(retry_after)
+            )
+            return None
+        return retry_after
+
+    def get_error_delay(self, retry):
+        """Return the delay before retrying after a connection error, or None."""
+        if retry >= self.max_retries or not self.retry_connection_errors:
+            return None
+        return self.get_backoff(retry)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+class _TimedConnectionMixin:
+    """Add the time taken to connect to the current thread's connect timer."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = (
+                getattr(_connect_timer, "elapsed", 0.0) + time.perf_counter() - start
+            )
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter that records the time spent opening new connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager using timed connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class WowcherTransport:
+    """
+    A pooled, keep-alive HTTP transport for API requests.
+
+    All API methods send their requests through a single :class:`requests.Session` so
+    that TCP connections to the Wowcher servers are reused between requests rather than
+    opened for every page of orders.
+
+    The transport can be used as a context manager, in which case it is closed on exit.
+    A closed transport will open a new connection pool if it is used again.
+    """
+
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+
+    def __init__(
+        self,
+        *,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        pool_block=False,
+        keep_alive=True,
+        timeout=None
+    ):
+        """
+        Set the connection pool settings.
+
+        :param pool_connections int: The number of per-host connection pools to keep.
+        :param pool_maxsize int: The maximum number of connections to keep open to a
+            single host.
+        :param pool_block bool: If True no more than pool_maxsize connections will be
+            made to a single host at once, requests will wait for a free connection
+            instead. If False extra connections will be made but not kept.
+        :param keep_alive bool: If False connections will be closed after each request.
+        :param timeout: Timeout in seconds passed to every request. May be a
+            (connect, read) tuple. If None requests will not time out.
+        :type timeout: float or tuple or None
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._http_session = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def http_session(self):
+        """Return the :class:`requests.Session` used to make requests."""
+        if self._http_session is None:
+            with self._lock:
+                if self._http_session is None:
+                    self._http_session = self.create_http_session()
+        return self._http_session
+
+    def create_http_session(self):
+        """Return a new :class:`requests.Session` using the pool settings."""
+        logger.debug(
+            "Opening connection pool (pool_connections={}, pool_maxsize={}).".format(
+                self.pool_connections, self.pool_maxsize
+            )
+        )
+        http_session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        http_session.mount("http://", adapter)
+        http_session.mount("https://", adapter)
+        if not self.keep_alive:
+            http_session.headers["Connection"] = "close"
+        return http_session
+
+    def request(self, method, url, *, retry_policy=None, **kwargs):
+        """
+        Send an HTTP request using the connection pool.
+
+        Takes the same arguments as :func:`requests.request`. The returned response has
+        a `timing` attribute containing a :class:`RequestTiming` for the final attempt
+        and a `retries` attribute containing the number of retries made.
+
+        :param retry_policy: When to retry failed requests. If None the request will
+            not be retried.
+        :type retry_policy: :class:`RetryPolicy` or None
+
+        :rtype: :class:`requests.Response`
+        """
+        if retry_policy is None:
+            retry_policy = NO_RETRY
+        retry = 0
+        while True:
+            try:
+                response = self.send(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = retry_policy.get_error_delay(retry)
+                if delay is None:
+                    raise
+                log_retry(method, url, e, delay)
+            else:
+                delay = retry_policy.get_response_delay(retry, response)
+                if delay is None:
+                    response.retries = retry
+                    return response
+                log_retry(method, url, response.status_code, delay)
+                response.close()
+            time.sleep(delay)
+            retry += 1
+
+    def send(self, method, url, **kwargs):
+        """Send a single HTTP request and return the response with its timing."""
+        kwargs.setdefault("timeout", self.timeout)
+        _connect_timer.elapsed = 0.0
+        start = time.perf_counter()
+        response = self.http_session.request(method=method, url=url, **kwargs)
+        total = time.perf_counter() - start
+        connect = _connect_timer.elapsed
+        elapsed = response.elapsed.total_seconds()
+        response.timing = RequestTiming(
+            connect=connect,
+            server=max(elapsed - connect, 0.0),
+            transfer=max(total - elapsed, 0.0),
+        )
+        return response
+
+    @property
+    def closed(self):
+        """Return True if the transport has no open connection pool."""
+        return self._http_session is None
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            if self._http_session is not None:
+                logger.debug("Closing connection pool.")
+                self._http_session.close()
+                self._http_session = None
+
+
+def log_retry(method, url, reason, delay):
+    """Log that a request will be retried."""
+    logger.warning(
+        "{} request to {} failed ({}), retrying in {:.2f}s.".format(
+            method.upper(), url, reason, delay
+        )
+    )
+
+
+class AsyncResponse:
+    """
+    A fully read response to a request made by :class:`AsyncWowcherTransport`.
+
+    Provides the parts of the :class:`requests.Response` interface used by API methods
+    so that their `process_response` methods work for both transports.
+    """
+
+    def __init__(
+        self,
+        *,
+        method,
+        url,
+        status_code,
+        reason,
+        headers,
+        content,
+        timing=None,
+        retries=0
+    ):
+        """
+        Store the response.
+
+        :param method str: The HTTP method of the request.
+        :param url str: The URL of the request.
+        :param status_code int: The HTTP status code of the response.
+        :param reason str: The HTTP reason phrase of the response.
+        :param headers: The response headers.
+        :param content bytes: The body of the response.
+        :param timing: The time taken by each stage of the request.
+        :type timing: :class:`RequestTiming`
+        :param retries int: The number of times the request was retried.
+        """
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.timing = timing
+        self.retries = retries
+
+    @property
+    def text(self):
+        """Return the response body as a string."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        """Return the response body decoded from JSON."""
+        return json.loads(self.content.decode("utf-8"))
+
+    def raise_for_status(self):
+        """Raise :class:`requests.HTTPError` if the response has an error status."""
+        if 400 <= self.status_code < 600:
+            raise requests.HTTPError(
+                "{} Error: {} for url: {}".format(
+                    self.status_code, self.reason, self.url
+                ),
+                response=self,
+            )
+
+
+class AsyncWowcherTransport:
+    """
+    A pooled, keep-alive HTTP transport for API requests made with :mod:`asyncio`.
+
+    Requires the `aiohttp` package. The underlying :class:`aiohttp.ClientSession` is
+    created on first use in the running event loop. If the transport is later used from
+    a different event loop the session is closed and replaced.
+    """
+
+    DEFAULT_LIMIT = 100
+    DEFAULT_LIMIT_PER_HOST = 10
+
+    def __init__(
+        self,
+        *,
+        limit=DEFAULT_LIMIT,
+        limit_per_host=DEFAULT_LIMIT_PER_HOST,
+        keep_alive=True,
+        timeout=None
+    ):
+        """
+        Set the connection pool settings.
+
+        :param limit int: The maximum number of open connections.
+        :param limit_per_host int: The maximum number of open connections to a single
+            host.
+        :param keep_alive bool: If False connections will be closed after each request.
+        :param timeout: Total timeout in seconds for each request. If None requests will
+            not time out.
+        :type timeout: float or None
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for asynchronous requests. "
+                "Install it with pip install pywowcher[async]."
+            )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._client_session = None
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def create_client_session(self):
+        """Return a new :class:`aiohttp.ClientSession` using the pool settings."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            force_close=not self.keep_alive,
+        )
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[trace_config],
+        )
+
+    @staticmethod
+    async def _on_connect_start(client_session, context, params):
+        context.connect_start = time.perf_counter()
+
+    @staticmethod
+    async def _on_connect_end(client_session, context, params):
+        timer = context.trace_request_ctx
+        if timer is not None:
+            timer["connect"] += time.perf_counter() - context.connect_start
+
+    async def get_client_session(self):
+        """Return the :class:`aiohttp.ClientSession` for the running event loop."""
+        loop = asyncio.get_event_loop()
+        if self._client_session is not None and self._loop is not loop:
+            await self.close_previous_client_session()
+        if self._client_session is None or self._client_session.closed:
+            logger.debug("Opening asynchronous connection pool.")
+            self._client_session = self.create_client_session()
+            self._loop = loop
+        return self._client_session
+
+    async def close_previous_client_session(self):
+        """
+        Close the session created in the event loop the transport was last used from.
+
+        A session can only be closed in its own event loop. If that loop has been closed
+        its connections have been abandoned and the session is closed from the running
+        loop, otherwise closing it is scheduled in its loop.
+        """
+        client_session, loop = self._client_session, self._loop
+        self._client_session = None
+        self._loop = None
+        if client_session.closed:
+            return
+        logger.debug("Closing asynchronous connection pool of previous event loop.")
+        if loop.is_closed():
+            await client_session.close()
+        else:
+            asyncio.run_coroutine_threadsafe(client_session.close(), loop)
+
+    async def request(
+        self,
+        method,
+        url,
+        *,
+        data=None,
+        json=None,
+        params=None,
+        headers=None,
+        retry_policy=None
+    ):
+        """
+        Send an HTTP request using the connection pool.
+
+        :param retry_policy: When to retry failed requests. If None the request will
+            not be retried.
+        :type retry_policy: :class:`RetryPolicy` or None
+
+        :rtype: :class:`pywowcher.transport.AsyncResponse`
+        """
+        if retry_policy is None:
+            retry_policy = NO_RETRY
+        retry = 0
+        while True:
+            try:
+                response = await self.send(
+                    method, url, data=data, json=json, params=params, headers=headers
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = retry_policy.get_error_delay(retry)
+                if delay is None:
+                    raise
+                log_retry(method, url, repr(e), delay)
+            else:
+                delay = retry_policy.get_response_delay(retry, response)
+                if delay is None:
+                    response.retries = retry
+                    return response
+                log_retry(method, url, response.status_code, delay)
+            await asyncio.sleep(delay)
+            retry += 1
+
+    async def send(
+        self, method, url, *, data=None, json=None, params=None, headers=None
+    ):
+        """Send a single HTTP request and return the fully read response."""
+        timer = {"connect": 0.0}
+        if headers is not None:
+            headers = {
+                key: value.decode("utf-8") if isinstance(value, bytes) else value
+                for key, value in headers.items()
+            }
+        client_session = await self.get_client_session()
+        start = time.perf_counter()
+        async with client_session.request(
+            method,
+            url,
+            data=data,
+            json=json,
+            params=params,
+            headers=headers,
+            trace_request_ctx=timer,
+        ) as response:
+            headers_received = time.perf_counter()
+            content = await response.read()
+            connect = timer["connect"]
+            timing = RequestTiming(
+                connect=connect,
+                server=max(headers_received - start - connect, 0.0),
+                transfer=time.perf_counter() - headers_received,
+            )
+            return AsyncResponse(
+                method=method,
+                url=str(response.url),
+                status_code=response.status,
+                reason=response.reason,
+                headers=response.headers,
+                content=content,
+                timing=timing,
+            )
+
+    @property
+    def closed(self):
+        """Return True if the transport has no open connection pool."""
+        return self._client_session is None or self._client_session.closed
+
+    async def close(self):
+        """Close all pooled connections."""
+        if self._client_session is not None and not self._client_session.closed:
+            logger.debug("Closing asynchronous connection pool.")
+            await self._client_session.close()
+        self._client_session = None
+        self._loop = None
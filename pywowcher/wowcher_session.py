@@ -1,18 +1,50 @@
 """WowcherAPISession class."""
 
 import base64
+import json
 import logging
 import os
 
 import yaml
 
+from .credentials import EnvironmentCredentialProvider, FileCredentialProvider
+from .hooks import Hooks
+from .singleflight import SingleFlight
+from .transport import AsyncWowcherTransport, WowcherTransport
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def loads_utf8(content):
+    """
+    Return JSON data decoded from UTF-8 encoded bytes.
+
+    :func:`json.loads` only accepts bytes from Python 3.6.
+    """
+    return json.loads(content.decode("utf-8"))
+
+
+def get_default_json_decoder():
+    """
+    Return the fastest available function for decoding JSON from bytes.
+
+    :func:`orjson.loads` is used if `orjson` is installed, otherwise
+    :func:`loads_utf8`.
+    """
+    if orjson is not None:
+        return orjson.loads
+    return loads_utf8
+
+
 class WowcherAPISession:
     """Holds the API credentials and settings."""
 
-    WOWCHER_CREDENTIALS_FILENAME = "wowcher_credentials.yaml"
+    WOWCHER_CREDENTIALS_FILENAME = FileCredentialProvider.FILENAME
     LIVE_DOMAIN = "http://api.redemption.wowcher.co.uk"
     STAGING_DOMAIN = "http://api.staging.redemption.wowcher.co.uk"
 
@@ -24,6 +56,9 @@ class WowcherAPISession:
 
     use_staging = None
 
+    transport_class = WowcherTransport
+    async_transport_class = AsyncWowcherTransport
+
     def __init__(self, load_credentials=True):
         """
         Set the API credentials and settings.
@@ -32,17 +67,154 @@ class WowcherAPISession:
             and settings from `wowcher_credentials.yaml`, if False no attempt will be
             made.
         """
+        self._transport = None
+        self._async_transport = None
+        self._auth_headers = {}
+        self.credential_providers = self.get_default_credential_providers()
+        self.json_decoder = get_default_json_decoder()
+        self.hooks = Hooks()
+        self.response_cache = None
+        self.page_size_tuner = None
+        self.single_flight = SingleFlight()
         if load_credentials is True:
             try:
                 self.get_credentials()
             except Exception:
                 pass
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def transport(self):
+        """Return the :class:`pywowcher.transport.WowcherTransport` for API requests."""
+        if self._transport is None:
+            self._transport = self.transport_class()
+        return self._transport
+
+    def configure_transport(self, **kwargs):
+        """
+        Replace the session's transport with one using the passed settings.
+
+        Any open connections held by the existing transport will be closed. Accepts the
+        keyword arguments of :class:`pywowcher.transport.WowcherTransport`.
+
+        :param pool_connections int: The number of per-host connection pools to keep.
+        :param pool_maxsize int: The maximum number of connections to keep open to a
+            single host.
+        :param pool_block bool: If True no more than pool_maxsize connections will be
+            made to a single host at once.
+        :param keep_alive bool: If False connections will be closed after each request.
+        :param timeout: Timeout in seconds for each request.
+        """
+        self.close()
+        self._transport = self.transport_class(**kwargs)
+
+    def close(self):
+        """Close any open connections held by the session's transport."""
+        if self._transport is not None:
+            self._transport.close()
+
+    @property
+    def async_transport(self):
+        """
+        Return the :class:`pywowcher.transport.AsyncWowcherTransport` for API requests.
+
+        Requires the `aiohttp` package.
+        """
+        if self._async_transport is None:
+            self._async_transport = self.async_transport_class()
+        return self._async_transport
+
+    async def configure_async_transport(self, **kwargs):
+        """
+        Replace the session's asynchronous transport with one using the passed settings.
+
+        Any open connections held by the existing transport will be closed. Accepts the
+        keyword arguments of :class:`pywowcher.transport.AsyncWowcherTransport`.
+        """
+        await self.close_async()
+        self._async_transport = self.async_transport_class(**kwargs)
+
+    async def close_async(self):
+        """Close any open connections held by the session's asynchronous transport."""
+        if self._async_transport is not None:
+            await self._async_transport.close()
+
+    def set_json_decoder(self, decoder=None):
+        """
+        Set the function used to decode JSON API responses.
+
+        :param decoder: A function taking the body of a response as :class:`bytes` and
+            returning the decoded data, such as :func:`json.loads`. If None the fastest
+            available decoder will be used.
+        :type decoder: callable or None
+        """
+        if decoder is None:
+            decoder = get_default_json_decoder()
+        self.json_decoder = decoder
+
+    def set_response_cache(self, cache=None):
+        """
+        Set the cache used for the responses of cacheable API methods.
+
+        :param cache: The cache to use, or None to disable caching.
+        :type cache: :class:`pywowcher.cache.ResponseCache` or None
+        """
+        self.response_cache = cache
+
+    def set_page_size_tuner(self, tuner=None):
+        """
+        Set the tuner used to choose the page size of Orders requests.
+
+        The tuner is used when `per_page` is not passed to an operation.
+
+        :param tuner: The tuner to use, or None to use
+            :attr:`pywowcher.operations.getorders.GetOrders.PER_PAGE`.
+        :type tuner: :class:`pywowcher.pagesize.PageSizeTuner` or None
+        """
+        self.page_size_tuner = tuner
+
+    def set_single_flight(self, single_flight=None):
+        """
+        Set the group used to coalesce identical concurrent calls to get_orders.
+
+        :param single_flight: The group to use, or None to make every call request its
+            own orders.
+        :type single_flight: :class:`pywowcher.singleflight.SingleFlight` or None
+        """
+        self.single_flight = single_flight
+
+    def decode_json(self, content):
+        """
+        Return JSON data decoded using the session's JSON decoder.
+
+        :param content: The body of a response.
+        :type content: bytes
+        """
+        return self.json_decoder(content)
+
     def get_auth_headers(self):
-        """Return authorisation headers."""
-        auth_string = self.get_auth_string()
-        encoded_auth_string = base64.b64encode(auth_string.encode("utf-8"))
-        return {"Authorization": encoded_auth_string}
+        """
+        Return authorisation headers.
+
+        The encoded headers are cached separately for the live and staging servers and
+        are only recreated when the credentials change.
+        """
+        if self.use_staging is True:
+            server, key, token = "staging", self.staging_key, self.staging_secret_token
+        else:
+            server, key, token = "live", self.live_key, self.live_secret_token
+        cached = self._auth_headers.get(server)
+        if cached is None or cached[0] != (key, token):
+            auth_string = self.get_auth_string()
+            encoded_auth_string = base64.b64encode(auth_string.encode("utf-8"))
+            cached = ((key, token), {"Authorization": encoded_auth_string})
+            self._auth_headers[server] = cached
+        return dict(cached[1])
 
     def get_auth_string(self):
         """Return the authorisation string for HTTP request headers."""
@@ -63,21 +235,34 @@ class WowcherAPISession:
                 "Domain not set. Please set pywowcher.session.staging to True or False"
             )
 
+    def get_default_credential_providers(self):
+        """
+        Return the credential providers used when none have been set.
+
+        Credentials are taken from environment variables and then from a
+        `wowcher_credentials.yaml` file.
+        """
+        return [EnvironmentCredentialProvider(), FileCredentialProvider()]
+
+    def set_credential_providers(self, providers=None):
+        """
+        Set the sources from which missing credentials are loaded.
+
+        :param providers: Instances of
+            :class:`pywowcher.credentials.CredentialProvider`, which will be asked for
+            credentials in order. If None the default providers will be used.
+        :type providers: list or None
+        """
+        if providers is None:
+            providers = self.get_default_credential_providers()
+        self.credential_providers = list(providers)
+
     def get_wowcher_credentials_file(self, directory=None):
         """Return the path to the wowcher credentials file."""
-        if directory is None:
-            directory = os.getcwd()
-        if os.path.exists(os.path.join(directory, self.WOWCHER_CREDENTIALS_FILENAME)):
-            return os.path.join(directory, self.WOWCHER_CREDENTIALS_FILENAME)
-        elif os.path.dirname(directory) == directory:
-            return None
-        else:
-            return self.get_wowcher_credentials_file(
-                directory=os.path.dirname(directory)
-            )
+        return FileCredentialProvider().find_credentials_file(directory=directory)
 
     def missing_credentials(self):
-        """Return True if all required credentials are set, otherwise return False."""
+        """Return True if any required credentials are not set, otherwise return False."""
         if self.use_staging:
             keys = (self.staging_key, self.staging_secret_token)
         else:
@@ -88,38 +273,30 @@ class WowcherAPISession:
             return False
 
     def get_credentials(self):
-        """Find API credentials file and load credentials from it."""
+        """
+        Load any missing credentials from the session's credential providers.
+
+        Providers are asked in order until no credentials are missing. Credentials that
+        are already set are not changed, so once all credentials are set this returns
+        without consulting any provider.
+        """
         if not self.missing_credentials():
             return
-        credentials_path = self.get_wowcher_credentials_file()
-        if credentials_path is None:
-            logging.info("Wowcher credentials file not found.")
-            raise FileNotFoundError(
-                "{} was not found.".format(self.WOWCHER_CREDENTIALS_FILENAME)
-            )
-        else:
-            logger.debug("Credentials file found at {}".format(credentials_path))
-            self.load_credentials_from_file(credentials_path)
+        for provider in self.credential_providers:
+            self.add_credentials(provider.get_credentials())
+            if not self.missing_credentials():
+                return
+
+    def add_credentials(self, credentials):
+        """Set any of the passed credentials that are not already set."""
+        for key, value in credentials.items():
+            if value is not None and getattr(self, key) is None:
+                setattr(self, key, value)
+        self._auth_headers = {}
 
     def load_credentials_from_file(self, credentials_path):
         """Add API credentials from file."""
-        logger.info("Loading API Credentials from {}".format(credentials_path))
-        with open(credentials_path, "r") as config_file:
-            config = yaml.load(config_file, Loader=yaml.FullLoader)
-        try:
-            if self.live_key is None:
-                self.live_key = config["live"]["key"]
-            if self.live_secret_token is None:
-                self.live_secret_token = config["live"]["secret_token"]
-            if self.staging_key is None:
-                self.staging_key = config["staging"]["key"]
-            if self.staging_secret_token is None:
-                self.staging_secret_token = config["staging"]["secret_token"]
-            if self.use_staging is None:
-                self.use_staging = config["use_staging"]
-        except Exception as e:
-            logger.error("Could not load config from {}.".format(credentials_path))
-            raise e
+        self.add_credentials(FileCredentialProvider(credentials_path).get_credentials())
 
     def set_credentials(
         self,
@@ -144,6 +321,7 @@ class WowcherAPISession:
         for key, value in locals().items():
             if value is not None:
                 setattr(self, key, value)
+        self._auth_headers = {}
 
     def create_credentials_file(
         self,
@@ -185,6 +363,7 @@ class WowcherAPISession:
         self.staging_key = None
         self.staging_secret_token = None
         self.use_staging = None
+        self._auth_headers = {}
 
 
 session = WowcherAPISession()
@@ -24,6 +24,7 @@ setuptools.setup(
     author_email=about["__author_email__"],
     keywords=["Wowcher", "api", "shopping"],
     install_requires=["requests", "pyaml"],
+    extras_require={"async": ["aiohttp"], "numpy": ["numpy"], "orjson": ["orjson"]},
     packages=setuptools.find_packages(),
     include_package_data=True,
     python_requires=">=3.5.0",
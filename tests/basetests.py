@@ -30,6 +30,13 @@ class BasePywowcherTest:
         """Reset the working directory."""
         os.chdir(cls.original_working_dir)
 
+    @pytest.fixture(autouse=True)
+    def no_retry_backoff(self, monkeypatch):
+        """Retry failed requests without waiting."""
+        monkeypatch.setattr(
+            pywowcher.transport.RetryPolicy, "get_backoff", lambda self, retry: 0.0
+        )
+
     def setup_method(self):
         """Add a config file to the working directory."""
         pywowcher.session.clear()
@@ -0,0 +1,149 @@
+"""Tests for the asynchronous pywowcher operations."""
+
+import asyncio
+import datetime
+
+import pytest
+import requests
+
+import pywowcher
+
+from .basetests import BasePywowcherTest
+
+aiohttp_web = pytest.importorskip("aiohttp.web")
+aiohttp_test_utils = pytest.importorskip("aiohttp.test_utils")
+
+
+class TestAsyncOperations(BasePywowcherTest):
+    """Tests for the pywowcher.aio operations against a local server."""
+
+    PAGES = 4
+
+    @pytest.fixture
+    def run_with_server(self, orders_method_response):
+        """Run a coroutine function while a local stand-in Wowcher server is running."""
+        requests_made = []
+
+        async def orders(request):
+            page = int(request.query["page"])
+            requests_made.append(("orders", page))
+            data = dict(orders_method_response["data"])
+            data["last_page"] = self.PAGES
+            data["current_page"] = page
+            order_data = orders_method_response["data"]["data"][0]
+            data["data"] = [
+                dict(order_data, wowcher_code="{}-{}".format(page, i)) for i in range(3)
+            ]
+            await asyncio.sleep(0.01 * (self.PAGES - page))
+            return aiohttp_web.json_response(
+                {"message": "Orders retrieved", "data": data}
+            )
+
+        async def status(request):
+            requests_made.append(("status", await request.json()))
+            return aiohttp_web.json_response({"message": "Order status updated"})
+
+        async def echo(request):
+            return aiohttp_web.json_response(
+                {"message": "Echo Test Received", "data": dict(await request.post())}
+            )
+
+        async def error(request):
+            return aiohttp_web.Response(status=500)
+
+        def func(coroutine_function, fail=False):
+            async def run():
+                app = aiohttp_web.Application()
+                app.router.add_get("/v1/orders", error if fail else orders)
+                app.router.add_put("/v1/orders/status", status)
+                app.router.add_post("/v1/echo", echo)
+                server = aiohttp_test_utils.TestServer(app)
+                await server.start_server()
+                pywowcher.session.STAGING_DOMAIN = str(server.make_url("")).rstrip("/")
+                try:
+                    return await coroutine_function()
+                finally:
+                    await pywowcher.session.close_async()
+                    await server.close()
+                    del pywowcher.session.STAGING_DOMAIN
+
+            return asyncio.run(run()), requests_made
+
+        return func
+
+    def test_async_echo_test(self, run_with_server):
+        """Test the asynchronous echo_test operation."""
+        message = {"one": "1", "two": "2"}
+        response, _ = run_with_server(lambda: pywowcher.aio.echo_test(message))
+        assert response == message
+
+    def test_async_get_orders(self, run_with_server):
+        """Test the asynchronous get_orders returns all pages in page order."""
+        orders, requests_made = run_with_server(
+            lambda: pywowcher.aio.get_orders(deal_id=1, max_concurrency=2)
+        )
+        assert sorted(requests_made) == [
+            ("orders", i) for i in range(1, self.PAGES + 1)
+        ]
+        assert all(isinstance(order, pywowcher.WowcherOrder) for order in orders)
+        assert [order.wowcher_code for order in orders] == [
+            "{}-{}".format(page, i)
+            for page in range(1, self.PAGES + 1)
+            for i in range(3)
+        ]
+
+    def test_async_get_orders_raises_for_error_status(self, run_with_server):
+        """Test the asynchronous get_orders raises HTTPError for an error response."""
+        with pytest.raises(requests.HTTPError):
+            run_with_server(lambda: pywowcher.aio.get_orders(deal_id=1), fail=True)
+
+    def test_async_set_order_status(self, run_with_server):
+        """Test the asynchronous set_order_status operation."""
+        order = pywowcher.make_order_status(
+            reference="8UPGT3-KKQRNC",
+            timestamp=datetime.datetime.now(),
+            status=pywowcher.DISPATCHED,
+        )
+        response, requests_made = run_with_server(
+            lambda: pywowcher.aio.set_order_status([order])
+        )
+        assert response.ok
+        assert requests_made == [("status", {"orders": [order]})]
+
+    def test_async_set_order_status_sends_chunks(self, run_with_server):
+        """Test the asynchronous set_order_status splits updates into chunks."""
+        orders = [
+            pywowcher.make_order_status(
+                reference="8UPGT3-{}".format(i), status=pywowcher.DISPATCHED
+            )
+            for i in range(5)
+        ]
+        report, requests_made = run_with_server(
+            lambda: pywowcher.aio.set_order_status(
+                orders, chunk_size=2, max_concurrency=2
+            )
+        )
+        assert report.ok
+        assert [chunk.orders for chunk in report.chunks] == [
+            orders[:2],
+            orders[2:4],
+            orders[4:],
+        ]
+        assert sorted(
+            request["orders"][0]["reference"] for _, request in requests_made
+        ) == ["8UPGT3-0", "8UPGT3-2", "8UPGT3-4"]
+
+    def test_async_set_order_status_raises_for_malformed_order(self):
+        """Test the asynchronous set_order_status raises for an invalid order."""
+        with pytest.raises(ValueError):
+            asyncio.run(pywowcher.aio.set_order_status([{"reference": "8UPGT3"}]))
+
+    def test_async_transport_closes_session_of_previous_loop(self):
+        """Test the session of a previous event loop is closed when it is replaced."""
+        transport = pywowcher.transport.AsyncWowcherTransport()
+        first = asyncio.run(transport.get_client_session())
+        second = asyncio.run(transport.get_client_session())
+        assert first.closed
+        assert second is not first
+        asyncio.run(transport.close())
+        assert second.closed
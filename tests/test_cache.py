@@ -0,0 +1,128 @@
+"""Tests for the response cache."""
+
+import datetime
+import time
+
+import pytest
+
+import pywowcher
+from pywowcher.cache import ResponseCache
+
+from .basetests import BasePywowcherTest
+
+
+class TestResponseCache(BasePywowcherTest):
+    """Tests for the ResponseCache class."""
+
+    window = {
+        "from_date": datetime.datetime(2018, 9, 1),
+        "start_date": datetime.datetime(2018, 9, 1),
+        "end_date": datetime.datetime(2018, 9, 6),
+    }
+
+    @pytest.fixture
+    def cache(self):
+        """Enable a response cache for the session."""
+        cache = ResponseCache(ttl=60, maxsize=10)
+        pywowcher.session.set_response_cache(cache)
+        yield cache
+        pywowcher.session.set_response_cache(None)
+
+    def test_repeated_get_orders_uses_cache(self, cache, mock_orders):
+        """Test an identical Orders request is answered from the cache."""
+        mocker = mock_orders()
+        first = pywowcher.get_orders(deal_id=1, **self.window)
+        second = pywowcher.get_orders(deal_id=1, **self.window)
+        assert mocker.call_count == 1
+        assert [o.order_id for o in first] == [o.order_id for o in second]
+        info = cache.info()
+        assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+    def test_cache_is_keyed_on_request_data(self, cache, mock_orders):
+        """Test requests for a different deal or window are not served from the cache."""
+        mocker = mock_orders()
+        pywowcher.get_orders(deal_id=1, **self.window)
+        pywowcher.get_orders(deal_id=2, **self.window)
+        window = dict(self.window, end_date=datetime.datetime(2018, 9, 7))
+        pywowcher.get_orders(deal_id=1, **window)
+        assert mocker.call_count == 3
+
+    def test_use_cache_false(self, cache, mock_orders):
+        """Test caching can be switched off for a single call."""
+        mocker = mock_orders()
+        pywowcher.get_orders(deal_id=1, **self.window)
+        pywowcher.get_orders(deal_id=1, use_cache=False, **self.window)
+        assert mocker.call_count == 2
+        assert cache.info().hits == 0
+
+    def test_cache_disabled_by_default(self, mock_orders):
+        """Test nothing is cached unless a cache is set."""
+        mocker = mock_orders()
+        pywowcher.get_orders(deal_id=1, **self.window)
+        pywowcher.get_orders(deal_id=1, **self.window)
+        assert mocker.call_count == 2
+
+    def test_status_invalidates_updated_deals(
+        self, cache, mock_orders, mock_status, orders_method_response
+    ):
+        """Test a status update removes cached pages for the updated order's deal."""
+        mocker = mock_orders()
+        mock_status()
+        pywowcher.get_orders(deal_id=2, **self.window)
+        orders = pywowcher.get_orders(deal_id=1, **self.window)
+        pywowcher.set_order_status(
+            [
+                pywowcher.make_order_status(
+                    reference=orders[0].wowcher_code, status=pywowcher.DISPATCHED
+                )
+            ]
+        )
+        pywowcher.get_orders(deal_id=1, **self.window)
+        pywowcher.get_orders(deal_id=2, **self.window)
+        assert mocker.call_count == 3
+        assert "deal_id=1" in mocker.last_request.text.split("&")
+
+    def test_entries_expire(self):
+        """Test entries are not returned after ttl seconds."""
+        cache = ResponseCache(ttl=0.01)
+        cache.set("key", "value")
+        assert cache.get("key") == (True, "value")
+        time.sleep(0.02)
+        assert cache.get("key") == (False, None)
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the least recently used entry is removed when the cache is full."""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+        assert cache.info().evictions == 1
+
+    def test_invalidate_deal(self):
+        """Test every entry for a deal can be removed."""
+        cache = ResponseCache()
+        cache.set("a", 1, deal_id=1)
+        cache.set("b", 2, deal_id=1)
+        cache.set("c", 3, deal_id=2)
+        cache.invalidate_deal(1)
+        assert len(cache) == 1
+        assert cache.get("c") == (True, 3)
+
+    def test_evicted_entries_release_their_references(self):
+        """Test the reference index only holds references of cached entries."""
+        cache = ResponseCache(maxsize=2)
+        for index in range(100):
+            references = ["REF-{}-{}".format(index, i) for i in range(10)]
+            cache.set(index, index, deal_id=index, references=references)
+        assert len(cache) == 2
+        assert len(cache._reference_keys) == 20
+        assert len(cache._deal_keys) == 2
+        cache.invalidate_references(["REF-99-0"])
+        assert cache.get(98) == (True, 98)
+        assert cache.get(99) == (False, None)
+        assert len(cache._reference_keys) == 10
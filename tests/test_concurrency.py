@@ -0,0 +1,170 @@
+"""Tests for the adaptive concurrency limit."""
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher.concurrency import AdaptiveConcurrency
+
+from .basetests import BasePywowcherTest
+
+
+class FakeMethod:
+    """An API method stand in that returns or raises a preset result."""
+
+    def __init__(self, *, result=None, exception=None, retries=0):
+        self.result = result
+        self.exception = exception
+        self.response = requests.Response()
+        self.response.retries = retries
+
+    def call(self):
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+
+class FakeClock:
+    """A clock that advances by step each time it is read."""
+
+    def __init__(self, step=0.001):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def make_concurrency(**kwargs):
+    return AdaptiveConcurrency(clock=FakeClock(), **kwargs)
+
+
+class TestAdaptiveConcurrency(BasePywowcherTest):
+    """Tests for the AdaptiveConcurrency class."""
+
+    def test_limit_increases_after_successful_requests(self):
+        """Test the limit rises by about one for each limit of successful requests."""
+        concurrency = make_concurrency(initial=2, maximum=8)
+        for _ in range(4):
+            concurrency.call(FakeMethod())
+        assert 2.9 < concurrency.limit < 4
+        assert concurrency.in_flight == 0
+
+    def test_limit_does_not_exceed_maximum(self):
+        """Test the limit stops rising at maximum."""
+        concurrency = make_concurrency(initial=2, maximum=3)
+        for _ in range(50):
+            concurrency.call(FakeMethod())
+        assert concurrency.limit == 3
+
+    def test_limit_decreases_when_retried(self):
+        """Test a request that had to be retried halves the limit."""
+        concurrency = make_concurrency(initial=8, maximum=8)
+        concurrency.call(FakeMethod(retries=1))
+        assert concurrency.limit == 4
+
+    def test_limit_decreases_for_too_many_requests(self):
+        """Test a 429 error halves the limit and is re-raised."""
+        concurrency = make_concurrency(initial=8, maximum=8)
+        response = requests.Response()
+        response.status_code = 429
+        error = requests.HTTPError(response=response)
+        with pytest.raises(requests.HTTPError):
+            concurrency.call(FakeMethod(exception=error))
+        assert concurrency.limit == 4
+
+    def test_limit_does_not_decrease_for_client_errors(self):
+        """Test errors that are not caused by load do not reduce the limit."""
+        concurrency = make_concurrency(initial=4, maximum=4)
+        response = requests.Response()
+        response.status_code = 404
+        with pytest.raises(requests.HTTPError):
+            concurrency.call(
+                FakeMethod(exception=requests.HTTPError(response=response))
+            )
+        assert concurrency.limit == 4
+
+    def test_limit_decreases_once_for_concurrent_failures(self):
+        """Test requests already in flight at a decrease do not decrease again."""
+        concurrency = make_concurrency(initial=8, maximum=8)
+        first = concurrency.acquire()
+        second = concurrency.acquire()
+        concurrency.release(first, throttled=True)
+        concurrency.release(second, throttled=True)
+        assert concurrency.limit == 4
+
+    def test_limit_decreases_for_latency_spike(self):
+        """Test a request much slower than the baseline latency reduces the limit."""
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(
+            initial=8, maximum=8, min_latency=0.005, warmup=3, clock=clock
+        )
+        for _ in range(3):
+            concurrency.call(FakeMethod())
+        assert concurrency.limit == 8
+        start = concurrency.acquire()
+        clock.now += 0.1
+        concurrency.release(start)
+        assert concurrency.limit == 4
+
+    def test_jitter_in_fast_requests_is_not_slow(self):
+        """Test latencies below min_latency never reduce the limit."""
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(
+            initial=4, maximum=4, min_latency=0.05, warmup=1, clock=clock
+        )
+        concurrency.call(FakeMethod())
+        start = concurrency.acquire()
+        clock.now += 0.01
+        concurrency.release(start)
+        assert concurrency.limit == 4
+
+    def test_no_request_is_slow_during_warmup(self):
+        """Test requests before warmup samples have been measured are never slow."""
+        clock = FakeClock()
+        concurrency = AdaptiveConcurrency(
+            initial=4, maximum=4, min_latency=0, warmup=5, clock=clock
+        )
+        concurrency.call(FakeMethod())
+        start = concurrency.acquire()
+        clock.now += 1
+        concurrency.release(start)
+        assert concurrency.limit == 4
+
+    def test_limit_does_not_fall_below_minimum(self):
+        """Test the limit stops falling at minimum."""
+        concurrency = make_concurrency(initial=2, minimum=2)
+        concurrency.call(FakeMethod(retries=1))
+        assert concurrency.limit == 2
+
+    def test_invalid_limits(self):
+        """Test ValueError is raised for inconsistent limits."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrency(initial=10, maximum=5)
+
+    def test_get_orders_with_concurrency(self, requests_mock, orders_method_response):
+        """Test get_orders requests every page within the adaptive limit."""
+        response_data = orders_method_response
+        response_data["data"]["last_page"] = 5
+        requests_mock.get(pywowcher.api_methods.Orders.get_URL(), json=response_data)
+        concurrency = make_concurrency(initial=1, maximum=4)
+        orders = pywowcher.get_orders(deal_id=1, concurrency=concurrency)
+        assert requests_mock.call_count == 5
+        assert len(orders) == 5 * len(response_data["data"]["data"])
+        assert concurrency.in_flight == 0
+
+    def test_set_order_status_with_concurrency(self, requests_mock, mock_status):
+        """Test set_order_status sends every chunk within the adaptive limit."""
+        mock_status()
+        orders = [
+            pywowcher.make_order_status(reference=str(i), status=pywowcher.DISPATCHED)
+            for i in range(6)
+        ]
+        concurrency = make_concurrency(initial=1, maximum=3)
+        report = pywowcher.set_order_status(
+            orders, chunk_size=2, concurrency=concurrency
+        )
+        assert report.ok is True
+        assert requests_mock.call_count == 3
+        assert concurrency.in_flight == 0
@@ -0,0 +1,108 @@
+"""Tests for the export_orders operation."""
+
+import copy
+import csv
+import gzip
+import json
+import os
+import stat
+
+import pytest
+
+import pywowcher
+
+from .basetests import BasePywowcherTest
+
+
+class TestExportOrders(BasePywowcherTest):
+    """Tests for the export_orders operation."""
+
+    @pytest.fixture
+    def mock_pages(self, mock_orders, orders_method_response):
+        """Mock three pages of orders with distinct order IDs."""
+        pages = []
+        for page in range(1, 4):
+            response_data = copy.deepcopy(orders_method_response)
+            response_data["data"]["last_page"] = 3
+            for index, order in enumerate(response_data["data"]["data"]):
+                order["id"] = "{}-{}".format(page, index)
+            pages.append({"json": response_data})
+        mock_orders(response=pages)
+        return [order for page in pages for order in page["json"]["data"]["data"]]
+
+    def read_lines(self, path, opener=open):
+        with opener(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_export_ndjson(self, mock_pages, tmp_path):
+        """Test every order is written as a line of JSON in page order."""
+        path = str(tmp_path / "orders.ndjson")
+        count = pywowcher.export_orders(1, path)
+        assert count == len(mock_pages)
+        records = self.read_lines(path)
+        assert [record["id"] for record in records] == [
+            order["id"] for order in mock_pages
+        ]
+        assert records[0]["items"] == mock_pages[0]["items"]
+        assert set(pywowcher.WowcherOrder.fields) <= set(records[0])
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+    def test_export_file_permissions(self, mock_pages, tmp_path):
+        """Test new files follow the umask and existing files keep their permissions."""
+        path = str(tmp_path / "orders.ndjson")
+        umask = os.umask(0o022)
+        try:
+            pywowcher.export_orders(1, path)
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        os.chmod(path, 0o640)
+        pywowcher.export_orders(1, path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+    def test_export_gzip(self, mock_pages, tmp_path):
+        """Test paths ending .gz are compressed."""
+        path = str(tmp_path / "orders.ndjson.gz")
+        pywowcher.export_orders(1, path, max_workers=2)
+        assert len(self.read_lines(path, opener=gzip.open)) == len(mock_pages)
+
+    def test_export_csv_with_item_rows(self, mock_pages, tmp_path):
+        """Test CSV exports have a row for each item."""
+        path = str(tmp_path / "orders.csv")
+        pywowcher.export_orders(1, path, format="csv")
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        item_count = sum(len(order["items"]) for order in mock_pages)
+        assert len(rows) == item_count
+        assert rows[0]["id"] == mock_pages[0]["id"]
+        assert rows[0]["item_sku"] == mock_pages[0]["items"][0]["sku"]
+        assert "items" not in rows[0]
+
+    def test_export_selected_fields_without_items(self, mock_pages, tmp_path):
+        """Test only the selected fields are written when items are omitted."""
+        path = str(tmp_path / "orders.ndjson")
+        pywowcher.export_orders(1, path, fields=["id", "wowcher_code"], items="none")
+        records = self.read_lines(path)
+        assert records[0] == {
+            "id": mock_pages[0]["id"],
+            "wowcher_code": mock_pages[0]["wowcher_code"],
+        }
+
+    def test_failed_export_keeps_existing_file(
+        self, mock_orders, orders_method_response, tmp_path
+    ):
+        """Test a failed export does not replace or leave behind a partial file."""
+        path = tmp_path / "orders.ndjson"
+        path.write_text("previous\n")
+        response_data = copy.deepcopy(orders_method_response)
+        response_data["data"]["last_page"] = 2
+        mock_orders(response=[{"json": response_data}, {"status_code": 404}])
+        with pytest.raises(Exception):
+            pywowcher.export_orders(1, str(path))
+        assert path.read_text() == "previous\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["orders.ndjson"]
+
+    def test_invalid_format(self, tmp_path):
+        """Test an unknown format raises ValueError."""
+        with pytest.raises(ValueError):
+            pywowcher.export_orders(1, str(tmp_path / "orders.xml"), format="xml")
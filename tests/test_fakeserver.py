@@ -0,0 +1,113 @@
+"""Tests for the fake Wowcher server."""
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher.fakeserver import FakeWowcherServer
+
+from .basetests import BasePywowcherTest
+
+
+class TestFakeWowcherServer(BasePywowcherTest):
+    """Tests for the fake Wowcher server."""
+
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        """Start a fake server and send pywowcher requests to it."""
+        servers = []
+
+        def func(**kwargs):
+            server = FakeWowcherServer(**kwargs)
+            server.start()
+            servers.append(server)
+            monkeypatch.setattr(pywowcher.session, "STAGING_DOMAIN", server.url)
+            return server
+
+        yield func
+        pywowcher.session.close()
+        for server in servers:
+            server.stop()
+
+    def test_orders_are_paginated(self, serve):
+        """Test every order is returned across pages."""
+        serve(orders=250, per_page=100)
+        orders = pywowcher.get_orders(deal_id=7, max_workers=2)
+        assert len(orders) == 250
+        assert len({order.order_id for order in orders}) == 250
+        assert all(order.deal_id == "7" for order in orders)
+
+    def test_orders_have_every_field(self, serve):
+        """Test synthetic orders include every WowcherOrder field."""
+        server = serve(orders=3, per_page=3)
+        response = requests.get(
+            server.url + "/v1/orders", params={"page": 1}, data={"deal_id": 1}
+        )
+        order_data = response.json()["data"]["data"][0]
+        assert set(pywowcher.WowcherOrder.fields) <= set(order_data)
+        order = pywowcher.WowcherOrder(order_data)
+        assert order.items[0].sku == order.product_sku
+        assert pywowcher.operations.getorders.parse_timestamp(order.created_at)
+
+    def test_large_deals_are_generated_on_demand(self, serve):
+        """Test pages of very large deals can be requested without generating all."""
+        server = serve(orders=5000000, per_page=100, page_cache_size=2)
+        response = requests.get(
+            server.url + "/v1/orders", params={"page": 50000}, data={"deal_id": 1}
+        )
+        data = response.json()["data"]
+        assert data["last_page"] == 50000
+        assert len(data["data"]) == 100
+        assert len(server._pages) == 1
+
+    def test_status_updates_are_counted(self, serve):
+        """Test status updates are received."""
+        server = serve()
+        orders = [
+            pywowcher.make_order_status(reference=str(i), status=pywowcher.DISPATCHED)
+            for i in range(5)
+        ]
+        pywowcher.set_order_status(orders)
+        assert server.status_updates == 5
+
+    def test_echo(self, serve):
+        """Test echo requests are answered."""
+        serve()
+        assert pywowcher.echo_test({"message": "Hello"}) == {"message": "Hello"}
+
+    def test_throttled_responses(self, serve):
+        """Test 429 responses are sent with a Retry-After header."""
+        server = serve(throttle_rate=1, retry_after=3)
+        response = requests.get(server.url + "/v1/orders", data={"deal_id": 1})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+
+    def test_server_errors_are_retried(self, serve):
+        """Test injected server errors are retried by the client."""
+        server = serve(orders=100, per_page=10, error_rate=0.3, seed=1)
+        orders = pywowcher.get_orders(deal_id=1)
+        assert len(orders) == 100
+        assert sum(count for status, count in server.responses.items() if status >= 500)
+
+    def test_slow_bodies(self, serve):
+        """Test slowly sent bodies are received complete."""
+        serve(orders=20, per_page=10, slow_body_rate=1, slow_body_delay=0.05)
+        assert len(pywowcher.get_orders(deal_id=1)) == 20
+
+    def test_latency_distributions(self):
+        """Test delays for each latency distribution."""
+        for distribution in ("constant", "uniform", "exponential", "lognormal"):
+            server = FakeWowcherServer(
+                latency=0.1,
+                latency_distribution=distribution,
+                latency_spread=0.05,
+                seed=1,
+            )
+            delays = [server.get_latency() for _ in range(200)]
+            assert all(delay >= 0 for delay in delays)
+            assert 0.05 < sum(delays) / len(delays) < 0.2
+
+    def test_invalid_latency_distribution(self):
+        """Test an unknown latency distribution raises ValueError."""
+        with pytest.raises(ValueError):
+            FakeWowcherServer(latency_distribution="normal")
@@ -0,0 +1,86 @@
+"""Tests for the get_orders_for_deals operation."""
+
+import copy
+import urllib.parse
+
+import pywowcher
+
+from .basetests import BasePywowcherTest
+
+
+class TestGetOrdersForDeals(BasePywowcherTest):
+    """Tests for the get_orders_for_deals operation."""
+
+    page_counts = {"1": 6, "2": 2, "3": 2}
+
+    def mock_deals(self, requests_mock, orders_method_response):
+        """Mock Orders responses with a different number of pages for each deal."""
+        requested = []
+
+        def callback(request, context):
+            data = urllib.parse.parse_qs(request.text)
+            deal_id, page = data["deal_id"][0], int(data["page"][0])
+            requested.append((deal_id, page))
+            response_data = copy.deepcopy(orders_method_response)
+            response_data["data"]["last_page"] = self.page_counts[deal_id]
+            orders = response_data["data"]["data"][:2]
+            for index, order in enumerate(orders):
+                order["id"] = "{}-{}-{}".format(deal_id, page, index)
+                order["deal_id"] = deal_id
+            response_data["data"]["data"] = orders
+            return response_data
+
+        requests_mock.get(pywowcher.api_methods.Orders.get_URL(), json=callback)
+        return requested
+
+    def test_orders_are_returned_by_deal(self, requests_mock, orders_method_response):
+        """Test orders for each deal are returned in page order keyed by deal ID."""
+        self.mock_deals(requests_mock, orders_method_response)
+        orders = pywowcher.get_orders_for_deals(["1", "2", "3"], max_workers=4)
+        assert list(orders) == ["1", "2", "3"]
+        for deal_id, page_count in self.page_counts.items():
+            assert [order.order_id for order in orders[deal_id]] == [
+                "{}-{}-{}".format(deal_id, page, index)
+                for page in range(1, page_count + 1)
+                for index in range(2)
+            ]
+
+    def test_pages_are_interleaved_between_deals(
+        self, requests_mock, orders_method_response
+    ):
+        """Test pages are requested from each deal in turn."""
+        requested = self.mock_deals(requests_mock, orders_method_response)
+        pywowcher.get_orders_for_deals(["1", "2", "3"])
+        assert requested == [
+            ("1", 1),
+            ("2", 1),
+            ("3", 1),
+            ("1", 2),
+            ("2", 2),
+            ("3", 2),
+            ("1", 3),
+            ("1", 4),
+            ("1", 5),
+            ("1", 6),
+        ]
+
+    def test_merged_stream(self, requests_mock, orders_method_response):
+        """Test merge=True returns an iterator of the orders for every deal."""
+        self.mock_deals(requests_mock, orders_method_response)
+        orders = pywowcher.get_orders_for_deals(
+            ["1", "2", "3"], merge=True, max_workers=3
+        )
+        assert not isinstance(orders, (list, dict))
+        order_ids = [order.order_id for order in orders]
+        assert len(order_ids) == 2 * sum(self.page_counts.values())
+        assert len(set(order_ids)) == len(order_ids)
+
+    def test_shared_concurrency(self, requests_mock, orders_method_response):
+        """Test every deal shares the adaptive concurrency limit."""
+        self.mock_deals(requests_mock, orders_method_response)
+        concurrency = pywowcher.AdaptiveConcurrency(maximum=3)
+        orders = pywowcher.get_orders_for_deals(
+            ["1", "2", "3"], concurrency=concurrency
+        )
+        assert sum(len(deal_orders) for deal_orders in orders.values()) == 20
+        assert concurrency.in_flight == 0
@@ -0,0 +1,85 @@
+"""Tests for request lifecycle hooks."""
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher import hooks
+
+from .basetests import BasePywowcherTest
+
+
+class TestHooks(BasePywowcherTest):
+    """Tests for request lifecycle hooks."""
+
+    @pytest.fixture
+    def events(self):
+        """Register hooks recording events for the duration of a test."""
+        events = []
+
+        def hook(event):
+            events.append((event.event, event))
+
+        for event in hooks.Hooks.EVENTS:
+            pywowcher.session.hooks.register(event, hook)
+        yield events
+        pywowcher.session.hooks.clear()
+
+    def test_hooks_are_called_for_successful_request(self, mock_orders, events):
+        """Test that before_request and after_response hooks receive request details."""
+        mock_orders()
+        pywowcher.get_orders(deal_id=1)
+        assert [name for name, _ in events] == [
+            hooks.BEFORE_REQUEST,
+            hooks.AFTER_RESPONSE,
+        ]
+        assert events[0][1] is events[1][1]
+        event = events[-1][1]
+        assert event.method == pywowcher.api_methods.Orders.GET
+        assert event.url == pywowcher.api_methods.Orders.get_URL()
+        assert event.page == 1
+        assert event.status_code == 200
+        assert event.bytes_received > 0
+        assert event.connect_time is not None
+        assert event.server_time is not None
+        assert event.decode_time is not None
+        assert event.exception is None
+
+    def test_on_error_hook_is_called_for_error_response(self, mock_orders, events):
+        """Test that the on_error hook receives the failed response."""
+        mock_orders(response={"status_code": 500})
+        with pytest.raises(requests.HTTPError):
+            pywowcher.get_orders(deal_id=1)
+        assert [name for name, _ in events] == [hooks.BEFORE_REQUEST, hooks.ON_ERROR]
+        assert events[-1][1].status_code == 500
+        assert isinstance(events[-1][1].exception, requests.HTTPError)
+
+    def test_on_error_hook_is_called_for_error_preparing_request(
+        self, monkeypatch, events
+    ):
+        """Test that the on_error hook is called if the URL cannot be prepared."""
+        monkeypatch.setattr(pywowcher.session, "use_staging", None)
+        with pytest.raises(ValueError):
+            pywowcher.echo_test({"one": "1"})
+        assert [name for name, _ in events] == [hooks.ON_ERROR]
+        assert events[0][1].url is None
+        assert isinstance(events[0][1].exception, ValueError)
+
+    def test_exception_in_hook_does_not_stop_request(self, mock_echo_test):
+        """Test that an exception raised by a hook is not propagated."""
+
+        def hook(event):
+            raise Exception("Hook failed")
+
+        pywowcher.session.hooks.register(hooks.AFTER_RESPONSE, hook)
+        mock_echo_test({"one": "1"})
+        try:
+            assert pywowcher.echo_test({"one": "1"}) == {"one": "1"}
+        finally:
+            pywowcher.session.hooks.unregister(hooks.AFTER_RESPONSE, hook)
+        assert not pywowcher.session.hooks
+
+    def test_register_invalid_event(self):
+        """Test that registering a hook for an unknown event raises ValueError."""
+        with pytest.raises(ValueError):
+            pywowcher.session.hooks.register("not_an_event", print)
@@ -3,6 +3,7 @@
 import datetime
 
 import pytest
+import requests
 
 import pywowcher
 
@@ -60,6 +61,65 @@ class TestGetOrdersOperation(BasePywowcherTest):
                 page_number
             )
 
+    def test_get_orders_fetches_pages_concurrently(
+        self, mock_orders, orders_method_response
+    ):
+        """Test get_orders with max_workers returns orders in page order."""
+        pages = 5
+        orders_method_response["data"]["last_page"] = pages
+        order_data = orders_method_response["data"]["data"][0]
+
+        def page_response(request, context):
+            page = int(request.qs["page"][0])
+            data = dict(orders_method_response["data"])
+            data["current_page"] = page
+            data["data"] = [
+                dict(order_data, wowcher_code="{}-{}".format(page, i)) for i in range(2)
+            ]
+            return {"message": "Orders retrieved", "data": data}
+
+        mocker = mock_orders(response={"json": page_response})
+        returned_value = pywowcher.get_orders(deal_id=1, max_workers=3)
+        assert mocker.call_count == pages
+        assert [order.wowcher_code for order in returned_value] == [
+            "{}-{}".format(page, i) for page in range(1, pages + 1) for i in range(2)
+        ]
+
+    def test_iter_orders_requests_pages_as_orders_are_consumed(
+        self, mock_orders, orders_method_response
+    ):
+        """Test iter_orders only requests a page when its orders are needed."""
+        pages = 3
+        orders_method_response["data"]["last_page"] = pages
+        mocker = mock_orders(response_data=orders_method_response)
+        orders = pywowcher.iter_orders(deal_id=1)
+        assert mocker.call_count == 0
+        first_order = next(orders)
+        assert isinstance(first_order, pywowcher.WowcherOrder)
+        assert mocker.call_count == 1
+        assert len(list(orders)) == pages * 100 - 1
+        assert mocker.call_count == pages
+
+    def test_iter_orders_with_max_workers_yields_in_page_order(
+        self, mock_orders, orders_method_response
+    ):
+        """Test iter_orders with max_workers yields orders in page order."""
+        pages = 6
+        orders_method_response["data"]["last_page"] = pages
+        order_data = orders_method_response["data"]["data"][0]
+
+        def page_response(request, context):
+            page = int(request.qs["page"][0])
+            data = dict(orders_method_response["data"])
+            data["data"] = [dict(order_data, wowcher_code=str(page))]
+            return {"message": "Orders retrieved", "data": data}
+
+        mock_orders(response={"json": page_response})
+        orders = pywowcher.iter_orders(deal_id=1, max_workers=2)
+        assert [order.wowcher_code for order in orders] == [
+            str(page) for page in range(1, pages + 1)
+        ]
+
     def test_wowcher_order_repr(self, orders_method_response):
         """Test the wowcher order __repr__ method."""
         order_data = orders_method_response["data"]["data"][0]
@@ -67,6 +127,42 @@ class TestGetOrdersOperation(BasePywowcherTest):
         wowcher_code = order_data["wowcher_code"]
         assert order.__repr__() == "Wowcher Order {}".format(wowcher_code)
 
+    def test_wowcher_order_uses_slots(self, orders_method_response):
+        """Test WowcherOrder and WowcherItem do not have an instance __dict__."""
+        order_data = orders_method_response["data"]["data"][0]
+        order = pywowcher.WowcherOrder(order_data)
+        assert not hasattr(order, "__dict__")
+        assert not hasattr(order.items[0], "__dict__")
+        assert order.order_id == order_data["id"]
+        for field in pywowcher.WowcherOrder.fields:
+            assert getattr(order, field) == order_data[field]
+        assert order.items[0].sku == order_data["items"][0]["sku"]
+
+    def test_lazy_wowcher_order_reads_attributes_when_accessed(
+        self, orders_method_response
+    ):
+        """Test LazyWowcherOrder reads and stores attributes on first access."""
+        order_data = orders_method_response["data"]["data"][0]
+        order = pywowcher.operations.getorders.LazyWowcherOrder(order_data)
+        items_slot = pywowcher.WowcherOrder.__dict__["items"]
+        with pytest.raises(AttributeError):
+            items_slot.__get__(order)
+        assert order.items[0].sku == order_data["items"][0]["sku"]
+        assert items_slot.__get__(order) is order.items
+        assert order.order_id == order_data["id"]
+        for field in pywowcher.WowcherOrder.fields:
+            assert getattr(order, field) == order_data[field]
+        assert repr(order) == "Wowcher Order {}".format(order_data["wowcher_code"])
+        with pytest.raises(AttributeError):
+            order.not_a_field
+
+    def test_get_orders_returns_lazy_orders(self, mock_orders):
+        """Test get_orders returns LazyWowcherOrder instances when lazy is True."""
+        mock_orders()
+        orders = pywowcher.get_orders(deal_id=1, lazy=True)
+        assert isinstance(orders[0], pywowcher.operations.getorders.LazyWowcherOrder)
+        assert isinstance(orders[0], pywowcher.WowcherOrder)
+
 
 class TestSetOrderStatusOperation(BasePywowcherTest):
     """Tests for the set_order_status operation."""
@@ -83,7 +179,9 @@ class TestSetOrderStatusOperation(BasePywowcherTest):
             shipping_method="NEXT_DAY",
         )
         orders = [order]
-        assert pywowcher.set_order_status(orders) is None
+        report = pywowcher.set_order_status(orders)
+        assert report.ok is True
+        assert len(report.chunks) == 1
 
     def test_set_order_status_raises_for_malformed_order(self, mock_status):
         """Test the set_order_status operation raises an exception for an invalid order."""
@@ -93,3 +191,66 @@ class TestSetOrderStatusOperation(BasePywowcherTest):
         ]  # Order data missing the status entry.
         with pytest.raises(ValueError):
             pywowcher.set_order_status(orders)
+
+    def make_status_updates(self, count):
+        return [
+            pywowcher.make_order_status(
+                reference="REF-{}".format(i), status=pywowcher.DISPATCHED
+            )
+            for i in range(count)
+        ]
+
+    def test_set_order_status_sends_chunks(self, requests_mock, mock_status):
+        """Test set_order_status splits orders into chunks of chunk_size."""
+        mock_status()
+        orders = self.make_status_updates(5)
+        report = pywowcher.set_order_status(orders, chunk_size=2, max_workers=2)
+        assert requests_mock.call_count == 3
+        sent = sorted(
+            order["reference"]
+            for request in requests_mock.request_history
+            for order in request.json()["orders"]
+        )
+        assert sent == sorted(order["reference"] for order in orders)
+        assert [len(chunk.orders) for chunk in report.chunks] == [2, 2, 1]
+        assert report.ok is True
+
+    def test_set_order_status_reports_failed_chunks(self, requests_mock):
+        """Test a failed chunk is reported without stopping the other chunks."""
+
+        def callback(request, context):
+            if request.json()["orders"][0]["reference"] == "REF-2":
+                context.status_code = 500
+            return {"message": "Order status updated", "data": []}
+
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), json=callback)
+        orders = self.make_status_updates(4)
+        with pytest.raises(
+            pywowcher.operations.setorderstatus.StatusUpdateError
+        ) as excinfo:
+            pywowcher.set_order_status(orders, chunk_size=2, max_workers=2)
+        assert isinstance(excinfo.value, requests.HTTPError)
+        assert excinfo.value.response.status_code == 500
+        report = excinfo.value.report
+        assert requests_mock.call_count == 2
+        assert [chunk.ok for chunk in report.chunks] == [True, False]
+        assert report.failed[0].references == ["REF-2", "REF-3"]
+        assert report.failed_orders == orders[2:]
+
+    def test_set_order_status_raises_http_error_for_single_chunk(self, requests_mock):
+        """Test a failed update sent in one request raises the request's HTTPError."""
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), status_code=400)
+        with pytest.raises(requests.HTTPError) as excinfo:
+            pywowcher.set_order_status(self.make_status_updates(2))
+        assert not isinstance(
+            excinfo.value, pywowcher.operations.setorderstatus.StatusUpdateError
+        )
+        assert excinfo.value.response.status_code == 400
+
+    def test_set_order_status_does_not_raise_errors(self, requests_mock):
+        """Test set_order_status returns a failed report when raise_errors is False."""
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), status_code=500)
+        orders = self.make_status_updates(3)
+        report = pywowcher.set_order_status(orders, chunk_size=1, raise_errors=False)
+        assert report.ok is False
+        assert len(report.failed) == 3
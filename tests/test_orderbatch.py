@@ -0,0 +1,78 @@
+"""Tests for the OrderBatch class."""
+
+import pytest
+
+import pywowcher
+
+from .basetests import BasePywowcherTest
+
+numpy = pytest.importorskip("numpy")
+
+from pywowcher.operations.orderbatch import Categorical, OrderBatch  # NOQA
+
+
+class TestOrderBatch(BasePywowcherTest):
+    """Tests for the OrderBatch class."""
+
+    @pytest.fixture
+    def orders_data(self, orders_method_response):
+        """Return order data with varying prices, timestamps and items."""
+        orders_data = orders_method_response["data"]["data"][:4]
+        for index, order_data in enumerate(orders_data):
+            order_data["price"] = "{}.00".format(1000 * (index + 1))
+            order_data["currency"] = "GBP" if index % 2 else "EUR"
+            order_data["despatched_at"] = "1536157259" if index == 0 else None
+            order_data["items"] = [
+                {"sku": "SKU-{}-{}".format(index, i), "quantity": i + 1, "options": []}
+                for i in range(index)
+            ]
+        return orders_data
+
+    def test_batch_column_types(self, orders_data):
+        """Test that OrderBatch columns have the expected types."""
+        batch = OrderBatch.from_order_data(orders_data)
+        assert len(batch) == 4
+        assert batch["price"].dtype == numpy.float64
+        assert list(batch["price"]) == [1000.0, 2000.0, 3000.0, 4000.0]
+        assert batch["deal_id"].dtype == numpy.int64
+        assert batch["created_at"].dtype == numpy.dtype("datetime64[s]")
+        assert batch["created_at"][0] == numpy.datetime64("2018-09-05T14:20:59")
+        assert batch["despatched_at"][0] == numpy.datetime64(1536157259, "s")
+        assert numpy.isnat(batch["despatched_at"][1:]).all()
+        assert isinstance(batch["currency"], Categorical)
+        assert list(batch.decode("currency")) == ["EUR", "GBP", "EUR", "GBP"]
+        assert batch["wowcher_code"].dtype == object
+        assert list(batch.items["order_index"]) == [1, 2, 2, 3, 3, 3]
+        assert list(batch.items["quantity"]) == [1, 1, 2, 1, 2, 3]
+
+    def test_batch_filter(self, orders_data):
+        """Test that OrderBatch.filter selects orders and their items."""
+        batch = OrderBatch.from_order_data(orders_data)
+        filtered = batch.filter(batch["price"] > 2500)
+        assert len(filtered) == 2
+        assert list(filtered["price"]) == [3000.0, 4000.0]
+        assert list(filtered.decode("currency")) == ["EUR", "GBP"]
+        assert list(filtered.items["order_index"]) == [0, 0, 1, 1, 1]
+        assert list(filtered.items["sku"]) == [
+            "SKU-2-0",
+            "SKU-2-1",
+            "SKU-3-0",
+            "SKU-3-1",
+            "SKU-3-2",
+        ]
+
+    def test_batch_from_orders_matches_batch_from_order_data(self, orders_data):
+        """Test that batches created from orders and from order data are the same."""
+        orders = [pywowcher.WowcherOrder(order_data) for order_data in orders_data]
+        from_orders = OrderBatch.from_orders(orders)
+        from_data = OrderBatch.from_order_data(orders_data)
+        assert list(from_orders["order_id"]) == list(from_data["order_id"])
+        assert (from_orders["price"] == from_data["price"]).all()
+        assert list(from_orders.items["sku"]) == list(from_data.items["sku"])
+
+    def test_get_orders_as_batch(self, mock_orders):
+        """Test that get_orders returns an OrderBatch when as_batch is True."""
+        mock_orders()
+        batch = pywowcher.get_orders(deal_id=1, as_batch=True)
+        assert isinstance(batch, OrderBatch)
+        assert len(batch) == 100
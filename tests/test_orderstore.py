@@ -0,0 +1,126 @@
+"""Tests for the local SQLite order store."""
+
+import os
+import tempfile
+
+import pytest
+
+import pywowcher
+from pywowcher.operations.getorders import WowcherOrder
+from pywowcher.operations.orderstore import OrderStore
+
+from .basetests import BasePywowcherTest
+
+
+class TestOrderStore(BasePywowcherTest):
+    """Tests for the OrderStore class."""
+
+    @pytest.fixture
+    def orders(self, orders_method_response):
+        """Return the orders from the example Orders response."""
+        return [WowcherOrder(data) for data in orders_method_response["data"]["data"]]
+
+    @pytest.fixture
+    def store(self, orders):
+        """Return an in memory store containing the example orders."""
+        with OrderStore() as store:
+            store.add_orders(orders)
+            yield store
+
+    def assert_orders_equal(self, stored, original):
+        assert stored.order_id == original.order_id
+        for field in WowcherOrder.fields:
+            assert getattr(stored, field) == getattr(original, field)
+        assert [(i.sku, i.quantity, i.options) for i in stored.items] == [
+            (i.sku, i.quantity, i.options) for i in original.items
+        ]
+
+    def test_get_order(self, store, orders):
+        """Test a stored order is returned with all its fields and items."""
+        self.assert_orders_equal(store.get_order(orders[5].order_id), orders[5])
+        assert store.get_order("missing") is None
+        assert orders[0].order_id in store
+        assert len(store) == len(orders)
+
+    def test_get_order_by_wowcher_code(self, store, orders):
+        """Test an order can be found by its Wowcher code."""
+        order = store.get_order_by_wowcher_code(orders[3].wowcher_code)
+        self.assert_orders_equal(order, orders[3])
+
+    def test_find_orders(self, store, orders):
+        """Test orders can be filtered by deal, SKU and update time."""
+        deal_id = orders[0].deal_id
+        expected = {order.order_id for order in orders if order.deal_id == deal_id}
+        found = store.find_orders(deal_id=int(deal_id))
+        assert {order.order_id for order in found} == expected
+        sku = orders[0].product_sku
+        found = store.find_orders(product_sku=sku)
+        assert all(order.product_sku == sku for order in found)
+        item_sku = orders[0].items[0].sku
+        found = store.find_orders(item_sku=item_sku)
+        assert orders[0].order_id in {order.order_id for order in found}
+        found = store.find_orders(updated_since=1536157259)
+        assert len(found) == sum(o.updated_at == "2018-09-05 14:20:59" for o in orders)
+
+    def test_add_orders_replaces_existing_orders(self, store, orders_method_response):
+        """Test adding an order with a stored ID replaces it and its items."""
+        order_data = dict(orders_method_response["data"]["data"][0])
+        order_data["tracking_number"] = "TRACK1"
+        order_data["items"] = [{"sku": "NEW", "quantity": 2, "options": []}]
+        assert store.add_orders([WowcherOrder(order_data)]) == 1
+        order = store.get_order(order_data["id"])
+        assert order.tracking_number == "TRACK1"
+        assert [item.sku for item in order.items] == ["NEW"]
+        assert len(store) == len(orders_method_response["data"]["data"])
+
+    def test_get_order_returns_stored_types(self, orders_method_response):
+        """Test structured fields and numeric IDs are returned as they were stored."""
+        order_data = dict(orders_method_response["data"]["data"][0])
+        order_data["id"] = 123456
+        order_data["deal_id"] = 9876
+        order_data["wowcher_code"] = 1.5
+        order_data["custom_field"] = {"gift_message": "Hello", "lines": [1, 2]}
+        order_data["delivery_line_2"] = ["Flat 1", "The Street"]
+        order_data["tracking_number"] = True
+        original = WowcherOrder(order_data)
+        with OrderStore() as store:
+            store.add_orders([original])
+            stored = store.get_order(123456)
+        self.assert_orders_equal(stored, original)
+        for field in ("order_id",) + WowcherOrder.fields:
+            stored_value = getattr(stored, field)
+            assert type(stored_value) is type(getattr(original, field)), field
+
+    def test_failed_add_orders_is_rolled_back(self, store, orders):
+        """Test no orders are stored if adding any of them fails."""
+
+        class BrokenOrder:
+            order_id = "broken"
+            items = []
+
+        new_order = WowcherOrder.__new__(WowcherOrder)
+        for field in WowcherOrder.fields:
+            setattr(new_order, field, getattr(orders[0], field))
+        new_order.order_id = "new"
+        new_order.items = []
+        with pytest.raises(AttributeError):
+            store.add_orders([new_order, BrokenOrder()])
+        assert "new" not in store
+
+    def test_store_is_persisted(self, orders):
+        """Test orders and watermarks are kept in the database file."""
+        path = os.path.join(tempfile.mkdtemp(), "orders.sqlite")
+        with OrderStore(path) as store:
+            store.add_orders(orders)
+            store.set_watermark(1, pywowcher.operations.syncorders.Watermark(10, (20,)))
+        with OrderStore(path) as store:
+            assert len(store) == len(orders)
+            assert store.get_watermark(1) == (10, ("20",))
+
+    def test_sync_orders_into_store(self, mock_orders):
+        """Test the store can be used as the watermark store for sync_orders."""
+        mock_orders()
+        with OrderStore() as store:
+            store.add_orders(pywowcher.sync_orders(deal_id=1, store=store))
+            assert store.get_watermark(1) is not None
+            assert pywowcher.sync_orders(deal_id=1, store=store) == []
@@ -0,0 +1,133 @@
+"""Tests for page size tuning."""
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher import hooks
+from pywowcher.fakeserver import FakeWowcherServer
+from pywowcher.pagesize import PageSizeTuner
+
+from .basetests import BasePywowcherTest
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+class TestPageSizeTuner:
+    """Tests for the PageSizeTuner class."""
+
+    def record_pages(self, tuner, per_page, seconds_per_order, pages=3):
+        for _ in range(pages):
+            tuner.record(
+                per_page, seconds=seconds_per_order * per_page, orders=per_page
+            )
+
+    def test_sizes(self):
+        """Test sizes are multiplied by factor up to maximum."""
+        assert PageSizeTuner(initial=100, maximum=1000).sizes == [100, 200, 400, 800]
+        with pytest.raises(ValueError):
+            PageSizeTuner(initial=200, maximum=100)
+
+    def test_larger_sizes_are_kept_while_faster(self):
+        """Test the tuner moves to larger sizes while they are faster per order."""
+        tuner = PageSizeTuner(initial=100, maximum=400)
+        self.record_pages(tuner, 100, 0.01)
+        assert tuner.per_page == 200
+        self.record_pages(tuner, 200, 0.005)
+        assert tuner.per_page == 400
+        self.record_pages(tuner, 400, 0.004)
+        assert tuner.settled
+        assert tuner.per_page == 400
+
+    def test_slower_size_is_abandoned(self):
+        """Test the tuner returns to the best size if a larger one is not faster."""
+        tuner = PageSizeTuner(initial=100, maximum=800)
+        self.record_pages(tuner, 100, 0.01)
+        self.record_pages(tuner, 200, 0.0095)
+        assert tuner.settled
+        assert tuner.per_page == 100
+
+    def test_partial_pages_are_not_measured(self):
+        """Test pages with fewer orders than requested are ignored."""
+        tuner = PageSizeTuner()
+        for _ in range(5):
+            tuner.record(100, seconds=1.0, orders=10)
+        assert tuner.get_stats(100).pages == 0
+        assert tuner.per_page == 100
+
+    def test_server_limit(self):
+        """Test sizes are capped when the server returns smaller pages."""
+        tuner = PageSizeTuner(initial=100, maximum=800)
+        self.record_pages(tuner, 100, 0.01)
+        self.record_pages(tuner, 200, 0.005)
+        tuner.record(400, seconds=1, orders=300, server_per_page=300)
+        assert tuner.sizes == [100, 200, 300]
+        assert tuner.per_page == 300
+
+    def test_rejected_size(self):
+        """Test a size the server refuses is not used again."""
+        tuner = PageSizeTuner(initial=100, maximum=800)
+        self.record_pages(tuner, 100, 0.01)
+        tuner.record_error(200, http_error(422))
+        assert tuner.sizes == [100]
+        assert tuner.settled
+        assert tuner.per_page == 100
+
+    def test_failing_size(self):
+        """Test a size with a high error rate is abandoned."""
+        tuner = PageSizeTuner(initial=100, maximum=800)
+        self.record_pages(tuner, 100, 0.01)
+        for _ in range(3):
+            tuner.record_error(200, requests.Timeout())
+        assert tuner.sizes == [100]
+        assert tuner.per_page == 100
+
+
+class TestTunedGetOrders(BasePywowcherTest):
+    """Tests for get_orders with page size tuning."""
+
+    def teardown_method(self):
+        """Remove the page size tuner."""
+        super().teardown_method()
+        pywowcher.session.set_page_size_tuner(None)
+        pywowcher.session.close()
+
+    @pytest.fixture
+    def requested_sizes(self):
+        """Record the page size of each Orders request."""
+        sizes = []
+
+        def record(event):
+            sizes.append(event.api_method.data["per_page"])
+
+        pywowcher.session.hooks.register(hooks.AFTER_RESPONSE, record)
+        yield sizes
+        pywowcher.session.hooks.clear()
+
+    @pytest.mark.parametrize("max_per_page", [150, 400, 1000])
+    def test_page_size_changes_during_a_request(
+        self, monkeypatch, requested_sizes, max_per_page
+    ):
+        """Test every order is received once while the page size changes."""
+        pywowcher.session.set_page_size_tuner(
+            PageSizeTuner(samples=1, min_improvement=-1)
+        )
+        with FakeWowcherServer(orders=5017, max_per_page=max_per_page) as server:
+            monkeypatch.setattr(pywowcher.session, "STAGING_DOMAIN", server.url)
+            orders = pywowcher.get_orders(deal_id=1)
+        order_ids = [order.order_id for order in orders]
+        assert len(order_ids) == 5017
+        assert order_ids == sorted(set(order_ids))
+        assert len(set(requested_sizes)) > 1
+        assert max(requested_sizes[-3:]) <= max_per_page
+
+    def test_explicit_per_page(self, mock_orders, requested_sizes):
+        """Test per_page overrides the tuner."""
+        pywowcher.session.set_page_size_tuner(PageSizeTuner(initial=200))
+        mock_orders()
+        pywowcher.get_orders(deal_id=1, per_page=50)
+        assert requested_sizes == [50]
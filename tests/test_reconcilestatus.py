@@ -0,0 +1,109 @@
+"""Tests for status reconciliation."""
+
+import copy
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher.operations.getorders import WowcherOrder
+from pywowcher.operations.reconcilestatus import ReconcileOrderStatus
+
+from .basetests import BasePywowcherTest
+
+
+class TestReconcileOrderStatus(BasePywowcherTest):
+    """Tests for the reconcile_order_status operation."""
+
+    @pytest.fixture
+    def make_order(self, orders_method_response):
+        """Return a function creating an order with the given state."""
+
+        def func(reference, **fields):
+            order_data = copy.deepcopy(orders_method_response["data"]["data"][0])
+            order_data["wowcher_code"] = reference
+            order_data.update(fields)
+            return WowcherOrder(order_data)
+
+        return func
+
+    def sent_references(self, requests_mock):
+        return [
+            order["reference"]
+            for request in requests_mock.request_history
+            for order in request.json()["orders"]
+        ]
+
+    def test_unchanged_orders_are_skipped(self, requests_mock, mock_status, make_order):
+        """Test only updates that change an order are sent."""
+        mock_status()
+        orders = [
+            make_order("NEW"),
+            make_order("RECEIVED", received_at="1536157259"),
+            make_order("READY", received_at="1536157259", ready_for_despatch_at=1),
+            make_order("DISPATCHED", despatched_at=1, tracking_number="GB1"),
+            make_order("TRACKED", despatched_at=1, tracking_number="GB1"),
+        ]
+        updates = [
+            pywowcher.make_order_status(reference="NEW", status=pywowcher.DISPATCHED),
+            pywowcher.make_order_status(
+                reference="RECEIVED", status=pywowcher.RECIEVED_BY_MERCHANT
+            ),
+            pywowcher.make_order_status(
+                reference="READY", status=pywowcher.RECIEVED_BY_MERCHANT
+            ),
+            pywowcher.make_order_status(
+                reference="DISPATCHED",
+                status=pywowcher.DISPATCHED,
+                tracking_number="GB1",
+            ),
+            pywowcher.make_order_status(
+                reference="TRACKED", status=pywowcher.DISPATCHED, tracking_number="GB2"
+            ),
+            pywowcher.make_order_status(
+                reference="UNKNOWN", status=pywowcher.DISPATCHED
+            ),
+        ]
+        report = pywowcher.reconcile_order_status(updates, orders)
+        assert self.sent_references(requests_mock) == ["NEW", "TRACKED", "UNKNOWN"]
+        assert [order["reference"] for order in report.sent] == [
+            "NEW",
+            "TRACKED",
+            "UNKNOWN",
+        ]
+        assert [
+            (skipped.update["reference"], skipped.reason) for skipped in report.skipped
+        ] == [
+            ("RECEIVED", ReconcileOrderStatus.ALREADY_SET),
+            ("READY", ReconcileOrderStatus.SUPERSEDED),
+            ("DISPATCHED", ReconcileOrderStatus.ALREADY_SET),
+        ]
+        assert report.ok is True
+
+    def test_nothing_to_send(self, requests_mock, make_order):
+        """Test no request is made when every update is skipped."""
+        orders = [make_order("READY", ready_for_despatch_at="2018-09-05 14:20:59")]
+        updates = [
+            pywowcher.make_order_status(
+                reference="READY", status=pywowcher.READY_FOR_DISPATCH
+            )
+        ]
+        report = pywowcher.reconcile_order_status(updates, orders)
+        assert requests_mock.call_count == 0
+        assert report.status_report is None
+        assert len(report.skipped) == 1
+        assert report.ok is True
+
+    def test_failed_updates(self, requests_mock, make_order):
+        """Test failed updates are reported and raised."""
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), status_code=400)
+        updates = [
+            pywowcher.make_order_status(reference="NEW", status=pywowcher.DISPATCHED)
+        ]
+        with pytest.raises(requests.HTTPError):
+            pywowcher.reconcile_order_status(updates, [make_order("NEW")])
+        report = pywowcher.reconcile_order_status(
+            updates, [make_order("NEW")], raise_errors=False
+        )
+        assert report.ok is False
+        assert report.failed_orders == updates
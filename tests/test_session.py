@@ -1,6 +1,7 @@
 """Tests for the session class."""
 
-
+import base64
+import json
 import os
 
 import pytest
@@ -151,3 +152,119 @@ class TestSession(BasePywowcherTest):
         assert pywowcher.session.staging_key == staging_key
         assert pywowcher.session.staging_secret_token == staging_secret_token
         assert pywowcher.session.use_staging == use_staging
+
+    def test_set_json_decoder(self, mock_echo_test):
+        """Test that API responses are decoded with the session's JSON decoder."""
+        decoded = []
+
+        def decoder(content):
+            decoded.append(content)
+            return json.loads(content.decode("utf-8"))
+
+        message = {"one": "1"}
+        mock_echo_test(message)
+        pywowcher.session.set_json_decoder(decoder)
+        try:
+            assert pywowcher.echo_test(message) == message
+        finally:
+            pywowcher.session.set_json_decoder()
+        assert len(decoded) == 1
+        assert isinstance(decoded[0], bytes)
+        assert pywowcher.session.json_decoder is (
+            pywowcher.wowcher_session.get_default_json_decoder()
+        )
+
+    def test_fallback_json_decoder_accepts_bytes(self):
+        """Test the json module fallback decodes UTF-8 bytes."""
+        assert pywowcher.wowcher_session.loads_utf8('{"name": "Café"}'.encode()) == {
+            "name": "Café"
+        }
+
+    def test_auth_headers_are_cached_until_credentials_change(self):
+        """Test that auth headers are reused until the credentials are changed."""
+        pywowcher.session.get_credentials()
+        headers = pywowcher.session.get_auth_headers()
+        cached = pywowcher.session._auth_headers["staging"][1]
+        assert pywowcher.session.get_auth_headers() == headers
+        assert pywowcher.session._auth_headers["staging"][1] is cached
+        pywowcher.session.set_credentials(staging_key="NEW STAGING KEY")
+        new_headers = pywowcher.session.get_auth_headers()
+        assert new_headers != headers
+        expected = base64.b64encode(
+            "NEW STAGING KEY:{}".format(self.fake_staging_secret_token).encode("utf-8")
+        )
+        assert new_headers == {"Authorization": expected}
+
+    def test_auth_headers_for_live_and_staging(self):
+        """Test that auth headers use the credentials for the selected server."""
+        pywowcher.session.get_credentials()
+        staging_headers = pywowcher.session.get_auth_headers()
+        pywowcher.session.use_staging = False
+        live_headers = pywowcher.session.get_auth_headers()
+        assert live_headers != staging_headers
+        assert live_headers == {
+            "Authorization": base64.b64encode(
+                "{}:{}".format(self.fake_live_key, self.fake_live_secret_token).encode(
+                    "utf-8"
+                )
+            )
+        }
+
+    def test_environment_credential_provider(self, no_config_file):
+        """Test that credentials can be loaded from environment variables."""
+        environ = {
+            "WOWCHER_LIVE_KEY": "ENV LIVE KEY",
+            "WOWCHER_LIVE_SECRET_TOKEN": "ENV LIVE TOKEN",
+            "WOWCHER_USE_STAGING": "false",
+        }
+        pywowcher.session.clear()
+        pywowcher.session.set_credential_providers(
+            [pywowcher.credentials.EnvironmentCredentialProvider(environ)]
+        )
+        try:
+            pywowcher.session.get_credentials()
+        finally:
+            pywowcher.session.set_credential_providers()
+        assert pywowcher.session.live_key == "ENV LIVE KEY"
+        assert pywowcher.session.live_secret_token == "ENV LIVE TOKEN"
+        assert pywowcher.session.use_staging is False
+        assert pywowcher.session.missing_credentials() is False
+
+    def test_unset_use_staging_is_not_missing_credentials(self, no_config_file):
+        """Test that a session with live credentials but no server raises ValueError."""
+        pywowcher.session.clear()
+        pywowcher.session.live_key = "KEY"
+        pywowcher.session.live_secret_token = "TOKEN"
+        assert pywowcher.session.missing_credentials() is False
+        pywowcher.session.get_credentials()
+        with pytest.raises(ValueError):
+            pywowcher.session.domain
+
+    def test_static_credential_provider_does_not_need_file(self, no_config_file):
+        """Test that credentials can be provided from memory without a file."""
+        provider = pywowcher.credentials.StaticCredentialProvider(
+            staging_key="KEY", staging_secret_token="TOKEN", use_staging=True
+        )
+        pywowcher.session.clear()
+        pywowcher.session.set_credential_providers([provider])
+        try:
+            pywowcher.session.get_credentials()
+        finally:
+            pywowcher.session.set_credential_providers()
+        assert pywowcher.session.staging_key == "KEY"
+        assert pywowcher.session.staging_secret_token == "TOKEN"
+
+    def test_credential_providers_are_used_in_order(self):
+        """Test that earlier providers take precedence over later providers."""
+        providers = [
+            pywowcher.credentials.StaticCredentialProvider(staging_key="FIRST KEY"),
+            pywowcher.credentials.FileCredentialProvider(),
+        ]
+        pywowcher.session.clear()
+        pywowcher.session.set_credential_providers(providers)
+        try:
+            pywowcher.session.get_credentials()
+        finally:
+            pywowcher.session.set_credential_providers()
+        assert pywowcher.session.staging_key == "FIRST KEY"
+        assert pywowcher.session.staging_secret_token == self.fake_staging_secret_token
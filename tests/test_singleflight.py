@@ -0,0 +1,109 @@
+"""Tests for coalescing identical concurrent calls."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pywowcher
+from pywowcher.fakeserver import FakeWowcherServer
+from pywowcher.singleflight import SingleFlight
+
+from .basetests import BasePywowcherTest
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight class."""
+
+    def run_together(self, group, key, function, callers=4):
+        started = threading.Barrier(callers)
+        release = threading.Event()
+
+        def leader():
+            release.wait(5)
+            return function()
+
+        def call():
+            started.wait(5)
+            return group.do(key, leader)
+
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(call) for _ in range(callers)]
+            while group.coalesced < callers - 1:
+                release.wait(0.01)
+            release.set()
+        return futures
+
+    def test_result_is_shared(self):
+        """Test concurrent calls with one key share a single call's result."""
+        group = SingleFlight()
+        results = [
+            future.result()
+            for future in self.run_together(group, "key", lambda: object())
+        ]
+        assert len({id(result) for result, _ in results}) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert group.calls == 1
+        assert group.coalesced == 3
+        assert len(group) == 0
+
+    def test_exception_is_shared(self):
+        """Test every waiting caller receives the exception raised by the call."""
+        group = SingleFlight()
+
+        def fail():
+            raise ValueError("Failed")
+
+        for future in self.run_together(group, "key", fail):
+            with pytest.raises(ValueError):
+                future.result()
+        assert group.calls == 1
+        assert len(group) == 0
+
+    def test_results_are_not_kept(self):
+        """Test a call after another has finished does the work again."""
+        group = SingleFlight()
+        assert group.do("key", lambda: 1) == (1, False)
+        assert group.do("key", lambda: 2) == (2, False)
+        assert group.calls == 2
+
+
+class TestCoalescedGetOrders(BasePywowcherTest):
+    """Tests for coalesced get_orders calls."""
+
+    CALLERS = 4
+
+    def teardown_method(self):
+        """Restore the session's single flight group."""
+        super().teardown_method()
+        pywowcher.session.set_single_flight(SingleFlight())
+        pywowcher.session.close()
+
+    def get_orders_together(self, monkeypatch, **kwargs):
+        started = threading.Barrier(self.CALLERS)
+
+        def get_orders():
+            started.wait(5)
+            return pywowcher.get_orders(deal_id=1, use_cache=False, **kwargs)
+
+        with FakeWowcherServer(orders=250, per_page=100, latency=0.2) as server:
+            monkeypatch.setattr(pywowcher.session, "STAGING_DOMAIN", server.url)
+            with ThreadPoolExecutor(max_workers=self.CALLERS) as executor:
+                futures = [executor.submit(get_orders) for _ in range(self.CALLERS)]
+                results = [future.result() for future in futures]
+        return server, results
+
+    def test_identical_calls_are_coalesced(self, monkeypatch):
+        """Test identical concurrent calls make one request for each page."""
+        server, results = self.get_orders_together(monkeypatch, coalesce=True)
+        assert server.responses[200] == 3
+        assert len({id(orders) for orders in results}) == self.CALLERS
+        for orders in results:
+            assert orders == results[0]
+            assert len(orders) == 250
+
+    def test_coalescing_is_opt_in(self, monkeypatch):
+        """Test calls without coalesce=True each request every page."""
+        server, results = self.get_orders_together(monkeypatch)
+        assert server.responses[200] == 3 * self.CALLERS
+        assert all(len(orders) == 250 for orders in results)
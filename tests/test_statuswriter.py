@@ -0,0 +1,194 @@
+"""Tests for batched status updates."""
+
+import os
+import queue
+import subprocess
+import sys
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pywowcher
+from pywowcher.operations.statuswriter import StatusWriter
+
+from .basetests import BasePywowcherTest
+
+
+class TestStatusWriter(BasePywowcherTest):
+    """Tests for the StatusWriter class."""
+
+    def make_status(self, index):
+        return pywowcher.make_order_status(
+            reference="REF-{}".format(index), status=pywowcher.DISPATCHED
+        )
+
+    def sent_references(self, requests_mock):
+        return [
+            [order["reference"] for order in request.json()["orders"]]
+            for request in requests_mock.request_history
+        ]
+
+    def test_updates_are_sent_in_batches(self, requests_mock, mock_status):
+        """Test updates from several threads are sent batch_size at a time."""
+        mock_status()
+        with StatusWriter(batch_size=10, interval=60) as writer:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = list(
+                    executor.map(writer.submit, map(self.make_status, range(25)))
+                )
+        assert all(future.result().status_code == 200 for future in futures)
+        batches = self.sent_references(requests_mock)
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert sorted(sum(batches, [])) == sorted("REF-{}".format(i) for i in range(25))
+        assert writer.requests == 3
+        assert writer.sent == writer.submitted == 25
+
+    def test_batch_is_sent_after_interval(self, requests_mock, mock_status):
+        """Test a partial batch is sent once interval has passed."""
+        mock_status()
+        with StatusWriter(batch_size=100, interval=0.05) as writer:
+            future = writer.submit(self.make_status(1))
+            assert future.result(timeout=5).status_code == 200
+            assert requests_mock.call_count == 1
+
+    def test_flush(self, requests_mock, mock_status):
+        """Test flush sends queued updates at once."""
+        mock_status()
+        with StatusWriter(batch_size=100, interval=60) as writer:
+            futures = [writer.submit(self.make_status(i)) for i in range(3)]
+            assert writer.flush(timeout=5) is True
+            assert all(future.done() for future in futures)
+            assert self.sent_references(requests_mock) == [["REF-0", "REF-1", "REF-2"]]
+
+    def test_failed_batch(self, requests_mock):
+        """Test the futures of a failed batch fail and later batches are sent."""
+        status_url = pywowcher.api_methods.Status.get_URL()
+        requests_mock.put(
+            status_url, [{"status_code": 400}, {"status_code": 200, "json": {}}]
+        )
+        with StatusWriter(batch_size=1) as writer:
+            failed = writer.submit(self.make_status(1))
+            failed.exception(timeout=5)
+            sent = writer.submit(self.make_status(2))
+        assert failed.exception() is not None
+        assert sent.result().status_code == 200
+        assert writer.failed == 1
+        assert writer.sent == 1
+
+    def test_backpressure(self, requests_mock):
+        """Test submit blocks while the queue is full."""
+        release = threading.Event()
+
+        def respond(request, context):
+            release.wait(5)
+            return {}
+
+        status_url = pywowcher.api_methods.Status.get_URL()
+        requests_mock.put(status_url, json=respond)
+        writer = StatusWriter(batch_size=1, max_queued=1)
+        try:
+            writer.submit(self.make_status(1))
+            writer.submit(self.make_status(2), timeout=5)
+            with pytest.raises(queue.Full):
+                writer.submit(self.make_status(3), timeout=0.05)
+        finally:
+            release.set()
+            writer.close()
+        assert writer.sent == 2
+
+    def test_close_with_full_queue(self, requests_mock):
+        """Test a close that times out leaves the writer open to be closed again."""
+        release = threading.Event()
+
+        def respond(request, context):
+            release.wait(5)
+            return {}
+
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), json=respond)
+        writer = StatusWriter(batch_size=1, max_queued=1)
+        try:
+            writer.submit(self.make_status(1))
+            writer.submit(self.make_status(2), timeout=5)
+            with pytest.raises(queue.Full):
+                writer.close(timeout=0.05)
+            assert writer.closed is False
+            assert writer.flush(timeout=0.05) is False
+        finally:
+            release.set()
+        writer.close()
+        assert writer.closed is True
+        assert writer.flush(timeout=5) is True
+        assert writer.sent == 2
+
+    def test_flush_and_close_timeouts_while_submit_blocks(self, requests_mock):
+        """Test flush and close honour their timeout while a submit holds the lock."""
+        release = threading.Event()
+
+        def respond(request, context):
+            release.wait(5)
+            return {}
+
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), json=respond)
+        writer = StatusWriter(batch_size=1, max_queued=1)
+        blocked = threading.Thread(
+            target=lambda: [writer.submit(self.make_status(i)) for i in range(3)]
+        )
+        blocked.start()
+        try:
+            while writer._queue.qsize() < 1:
+                release.wait(0.01)
+            assert writer.flush(timeout=0.1) is False
+            with pytest.raises(queue.Full):
+                writer.close(timeout=0.1)
+        finally:
+            release.set()
+        blocked.join(5)
+        writer.close()
+        assert writer.sent == 3
+
+    def test_open_writers_are_closed_at_exit(self):
+        """Test updates queued in a writer that was never closed are sent at exit."""
+        script = textwrap.dedent("""
+            import atexit
+
+            # Registered before pywowcher is imported so that it runs after the
+            # writers are closed.
+            atexit.register(lambda: print(server.status_updates))
+
+            import pywowcher
+            from pywowcher.fakeserver import FakeWowcherServer
+
+            server = FakeWowcherServer()
+            server.start()
+            pywowcher.session.STAGING_DOMAIN = server.url
+            pywowcher.session.set_credentials(
+                staging_key="KEY", staging_secret_token="TOKEN", use_staging=True
+            )
+            writer = pywowcher.StatusWriter(interval=60)
+            for i in range(3):
+                writer.submit(
+                    pywowcher.make_order_status(
+                        reference=str(i), status=pywowcher.DISPATCHED
+                    )
+                )
+            """)
+        output = subprocess.check_output(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.dirname(pywowcher.__file__)),
+            timeout=30,
+            universal_newlines=True,
+        )
+        assert output.strip() == "3"
+
+    def test_invalid_and_closed(self, mock_status):
+        """Test invalid updates and updates after close are refused."""
+        mock_status()
+        writer = StatusWriter()
+        with pytest.raises(ValueError):
+            writer.submit({"reference": "REF-1"})
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(self.make_status(1))
+        assert writer.flush(timeout=5) is True
@@ -0,0 +1,119 @@
+"""Tests for streamed parsing of Orders pages."""
+
+import copy
+import json
+
+import pytest
+
+import pywowcher
+from pywowcher import hooks
+from pywowcher.fakeserver import FakeWowcherServer
+from pywowcher.streaming import PageParser
+
+from .basetests import BasePywowcherTest
+
+
+def split(body, size):
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+class TestPageParser:
+    """Tests for the PageParser class."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000, 10**6])
+    def test_orders_are_parsed_from_chunks(self, chunk_size):
+        """Test items are parsed however the body is split."""
+        response_data = {
+            "message": "Orders retrieved",
+            "data": {
+                "last_page": 2,
+                "data": [{"id": "1", "name": "Café ☃"}, -1.5e3, 12345, None],
+                "total": 4,
+            },
+        }
+        body = json.dumps(response_data, indent=2, ensure_ascii=False).encode("utf-8")
+        parser = PageParser(split(body, chunk_size))
+        assert list(parser) == response_data["data"]["data"]
+        assert parser.page == {
+            "message": "Orders retrieved",
+            "data": {"last_page": 2, "data": [], "total": 4},
+        }
+        assert parser.bytes_received == len(body)
+
+    def test_orders_are_yielded_before_the_body_is_complete(self):
+        """Test each item is yielded as soon as it has been received."""
+        chunks = [b'{"data": {"data": [{"id": 1}, ', b'{"id": 2}]}}']
+        received = []
+        parser = PageParser(chunks)
+        for order in parser:
+            received.append((order, parser.bytes_received))
+        assert received == [
+            ({"id": 1}, len(chunks[0])),
+            ({"id": 2}, len(chunks[0]) + len(chunks[1])),
+        ]
+
+    def test_missing_data(self):
+        """Test a response without the array yields nothing."""
+        parser = PageParser([b'{"message": "Error", "data": null}'])
+        assert list(parser) == []
+        assert parser.page == {"message": "Error", "data": None}
+
+    def test_invalid_json(self):
+        """Test invalid or incomplete bodies raise ValueError."""
+        with pytest.raises(ValueError):
+            list(PageParser([b'{"data": {"data": [{"id": 1}']))
+        with pytest.raises(ValueError):
+            list(PageParser([b"[]"]))
+
+
+class TestStreamedOrders(BasePywowcherTest):
+    """Tests for streamed get_orders and iter_orders."""
+
+    def test_streamed_get_orders(self, mock_orders, orders_method_response):
+        """Test streamed orders match orders decoded from complete pages."""
+        response_data = copy.deepcopy(orders_method_response)
+        response_data["data"]["last_page"] = 2
+        mocker = mock_orders(response_data=response_data)
+        orders = pywowcher.get_orders(deal_id=1, stream=True)
+        assert mocker.call_count == 2
+        assert mocker.last_request.headers["Accept-Encoding"] == "gzip"
+        assert [order.order_id for order in orders] == [
+            order["id"] for order in response_data["data"]["data"] * 2
+        ]
+
+    def test_streamed_iter_orders_dispatches_hooks(self, mock_orders):
+        """Test AFTER_RESPONSE is dispatched with the size of each streamed page."""
+        mock_orders()
+        events = []
+        pywowcher.session.hooks.register(hooks.AFTER_RESPONSE, events.append)
+        try:
+            orders = list(pywowcher.iter_orders(deal_id=1, stream=True))
+            pywowcher.get_orders(deal_id=1)
+        finally:
+            pywowcher.session.hooks.clear()
+        assert len(orders) == 100
+        assert len(events) == 2
+        assert events[0].bytes_received == events[1].bytes_received > 0
+
+    def test_stream_with_max_workers(self):
+        """Test streaming cannot be combined with concurrent requests."""
+        with pytest.raises(ValueError):
+            pywowcher.iter_orders(deal_id=1, stream=True, max_workers=4)
+
+    def test_streamed_gzip_responses(self, monkeypatch):
+        """Test gzip compressed pages are decompressed as they are streamed."""
+        with FakeWowcherServer(orders=250, per_page=100, compress=True) as server:
+            monkeypatch.setattr(pywowcher.session, "STAGING_DOMAIN", server.url)
+            events = []
+            pywowcher.session.hooks.register(hooks.AFTER_RESPONSE, events.append)
+            try:
+                streamed = pywowcher.get_orders(deal_id=1, stream=True)
+                orders = pywowcher.get_orders(deal_id=1)
+            finally:
+                pywowcher.session.hooks.clear()
+                pywowcher.session.close()
+        assert [order.order_id for order in streamed] == [
+            order.order_id for order in orders
+        ]
+        assert all(key[-1] for key in server._pages)
+        assert events[0].bytes_received == events[3].bytes_received
@@ -0,0 +1,112 @@
+"""Tests for incremental order syncing."""
+
+import copy
+import os
+import tempfile
+
+import pywowcher
+from pywowcher.operations.getorders import parse_timestamp
+from pywowcher.operations.syncorders import (
+    FileWatermarkStore,
+    MemoryWatermarkStore,
+    Watermark,
+    make_watermark,
+)
+
+from .basetests import BasePywowcherTest
+
+
+class TestSyncOrders(BasePywowcherTest):
+    """Tests for the sync_orders operation."""
+
+    def test_first_sync_returns_all_orders(self, mock_orders, orders_method_response):
+        """Test the first sync returns every order and saves the newest watermark."""
+        mock_orders()
+        store = MemoryWatermarkStore()
+        orders = pywowcher.sync_orders(deal_id=1, store=store)
+        assert len(orders) == len(orders_method_response["data"]["data"])
+        watermark = store.get_watermark(1)
+        newest = [
+            order["id"]
+            for order in orders_method_response["data"]["data"]
+            if parse_timestamp(order["updated_at"]) == 1536157259
+        ]
+        assert len(newest) > 1
+        assert watermark == Watermark(1536157259, tuple(sorted(newest)))
+
+    def test_later_sync_returns_only_changed_orders(
+        self, mock_orders, orders_method_response
+    ):
+        """Test orders at or before the watermark are not returned."""
+        store = MemoryWatermarkStore()
+        mock_orders()
+        pywowcher.sync_orders(deal_id=1, store=store)
+        response_data = copy.deepcopy(orders_method_response)
+        changed = response_data["data"]["data"][3]
+        changed["updated_at"] = "2018-09-06 10:00:00"
+        mocker = mock_orders(response_data=response_data)
+        orders = pywowcher.sync_orders(deal_id=1, store=store)
+        assert [order.order_id for order in orders] == [changed["id"]]
+        assert store.get_watermark(1) == Watermark(1536228000, (changed["id"],))
+        assert "from_date=1536157259" in mocker.last_request.text.split("&")
+
+    def test_orders_updated_in_the_watermark_second_are_synced(
+        self, mock_orders, orders_method_response
+    ):
+        """Test unseen orders updated in the same second as the watermark are synced."""
+        response_data = copy.deepcopy(orders_method_response)
+        orders = response_data["data"]["data"]
+        for order in orders:
+            order["updated_at"] = "1536157259"
+        store = MemoryWatermarkStore()
+        store.set_watermark(1, make_watermark(1536157259, [orders[-1]["id"]]))
+        mock_orders(response_data=response_data)
+        synced = pywowcher.sync_orders(deal_id=1, store=store)
+        assert [order.order_id for order in synced] == [
+            order["id"] for order in orders[:-1]
+        ]
+        assert store.get_watermark(1).order_ids == tuple(
+            sorted(order["id"] for order in orders)
+        )
+        assert pywowcher.sync_orders(deal_id=1, store=store) == []
+
+    def test_mixed_order_id_types(self, mock_orders, orders_method_response):
+        """Test int and str order IDs are compared as str."""
+        response_data = copy.deepcopy(orders_method_response)
+        response_data["data"]["data"][0]["id"] = int(
+            response_data["data"]["data"][0]["id"]
+        )
+        store = MemoryWatermarkStore()
+        mock_orders(response_data=response_data)
+        assert len(pywowcher.sync_orders(deal_id=1, store=store)) == len(
+            response_data["data"]["data"]
+        )
+        assert pywowcher.sync_orders(deal_id=1, store=store) == []
+
+    def test_sync_with_no_changes(self, mock_orders):
+        """Test a sync with no changes returns no orders and keeps the watermark."""
+        store = MemoryWatermarkStore()
+        mock_orders()
+        pywowcher.sync_orders(deal_id=1, store=store)
+        watermark = store.get_watermark(1)
+        assert pywowcher.sync_orders(deal_id=1, store=store) == []
+        assert store.get_watermark(1) == watermark
+
+    def test_watermarks_are_kept_per_deal(self, mock_orders):
+        """Test each deal has its own watermark."""
+        store = MemoryWatermarkStore()
+        mock_orders()
+        pywowcher.sync_orders(deal_id=1, store=store)
+        assert store.get_watermark(2) is None
+        assert len(pywowcher.sync_orders(deal_id=2, store=store)) > 0
+
+    def test_file_watermark_store(self):
+        """Test watermarks saved to a file can be read by a new store."""
+        path = os.path.join(tempfile.mkdtemp(), "watermarks.json")
+        FileWatermarkStore(path).set_watermark(5, Watermark(100, ("20", "3")))
+        FileWatermarkStore(path).set_watermark(6, Watermark(200, 30))
+        store = FileWatermarkStore(path)
+        assert store.get_watermark(5) == Watermark(100, ("20", "3"))
+        assert store.get_watermark("6") == Watermark(200, ("30",))
+        assert store.get_watermark(7) is None
+        assert os.listdir(os.path.dirname(path)) == ["watermarks.json"]
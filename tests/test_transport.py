@@ -0,0 +1,147 @@
+"""Tests for the pywowcher HTTP transport."""
+
+import pytest
+import requests
+
+import pywowcher
+from pywowcher.transport import RetryPolicy, WowcherTransport
+
+from .basetests import BasePywowcherTest
+
+
+class TestTransport(BasePywowcherTest):
+    """Tests for the WowcherTransport class."""
+
+    def test_transport_reuses_http_session(self):
+        """Test that the transport returns the same requests session for each call."""
+        transport = WowcherTransport()
+        assert isinstance(transport.http_session, requests.Session)
+        assert transport.http_session is transport.http_session
+
+    def test_transport_pool_settings(self):
+        """Test that the pool settings are applied to the HTTP adapter."""
+        transport = WowcherTransport(
+            pool_connections=3, pool_maxsize=7, pool_block=True
+        )
+        adapter = transport.http_session.get_adapter("http://example.com")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_block is True
+
+    def test_transport_without_keep_alive(self):
+        """Test that keep_alive=False requests connections be closed."""
+        transport = WowcherTransport(keep_alive=False)
+        assert transport.http_session.headers["Connection"] == "close"
+
+    def test_transport_context_manager_closes(self):
+        """Test that the transport is closed when used as a context manager."""
+        with WowcherTransport() as transport:
+            transport.http_session
+            assert transport.closed is False
+        assert transport.closed is True
+
+    def test_api_methods_use_session_transport(self, mock_echo_test):
+        """Test that API requests are sent through the session's transport."""
+        message = {"one": "1"}
+        mock_echo_test(message)
+        http_session = pywowcher.session.transport.http_session
+        assert pywowcher.echo_test(message) == message
+        assert pywowcher.session.transport.http_session is http_session
+
+    def test_configure_transport(self):
+        """Test that configure_transport replaces and closes the existing transport."""
+        old_transport = pywowcher.session.transport
+        old_transport.http_session
+        pywowcher.session.configure_transport(pool_maxsize=20)
+        assert old_transport.closed is True
+        assert pywowcher.session.transport is not old_transport
+        assert pywowcher.session.transport.pool_maxsize == 20
+        pywowcher.session.configure_transport()
+
+
+class TestRetryPolicy(BasePywowcherTest):
+    """Tests for retrying failed requests."""
+
+    def test_get_orders_retries_only_the_failed_page(
+        self, requests_mock, orders_method_response
+    ):
+        """Test a transient error on one page retries that page only."""
+        response_data = orders_method_response
+        response_data["data"]["last_page"] = 2
+        responses = {"1": [{"json": response_data}]}
+        responses["2"] = [{"status_code": 503}, {"json": response_data}]
+        calls = []
+
+        def callback(request, context):
+            page = request.qs["page"][0]
+            calls.append(page)
+            response = responses[page][0]
+            if len(responses[page]) > 1:
+                responses[page].pop(0)
+            context.status_code = response.get("status_code", 200)
+            return response.get("json", {})
+
+        requests_mock.get(pywowcher.api_methods.Orders.get_URL(), json=callback)
+        orders = pywowcher.get_orders(deal_id=1)
+        assert calls == ["1", "2", "2"]
+        assert len(orders) == 2 * len(response_data["data"]["data"])
+
+    def test_request_gives_up_after_max_retries(self, requests_mock):
+        """Test the error is raised once max_retries is reached."""
+        requests_mock.get(pywowcher.api_methods.Orders.get_URL(), status_code=500)
+        with pytest.raises(requests.HTTPError):
+            pywowcher.get_orders(deal_id=1)
+        assert requests_mock.call_count == RetryPolicy().max_retries + 1
+
+    def test_status_is_not_retried_for_server_error(self, requests_mock):
+        """Test Status requests are not retried for errors that may have applied."""
+        requests_mock.put(pywowcher.api_methods.Status.get_URL(), status_code=500)
+        orders = [
+            pywowcher.make_order_status(reference="A", status=pywowcher.DISPATCHED)
+        ]
+        with pytest.raises(requests.RequestException):
+            pywowcher.set_order_status(orders)
+        assert requests_mock.call_count == 1
+
+    def test_status_is_retried_for_too_many_requests(self, requests_mock):
+        """Test Status requests are retried after a 429 response."""
+        requests_mock.put(
+            pywowcher.api_methods.Status.get_URL(),
+            [
+                {"status_code": 429, "headers": {"Retry-After": "0"}},
+                {"json": {"message": "Order status updated", "data": []}},
+            ],
+        )
+        orders = [
+            pywowcher.make_order_status(reference="A", status=pywowcher.DISPATCHED)
+        ]
+        assert pywowcher.set_order_status(orders).ok is True
+        assert requests_mock.call_count == 2
+
+    def test_retry_policy_can_be_set_per_api_method(self, requests_mock, monkeypatch):
+        """Test the retry policy is read from the API method."""
+        monkeypatch.setattr(
+            pywowcher.api_methods.EchoTest, "retry_policy", RetryPolicy(max_retries=1)
+        )
+        requests_mock.post(pywowcher.api_methods.EchoTest.get_URL(), status_code=502)
+        with pytest.raises(requests.HTTPError):
+            pywowcher.echo_test({"one": "1"})
+        assert requests_mock.call_count == 2
+
+    def test_retry_after_header(self):
+        """Test the Retry-After header is used as the retry delay."""
+        policy = RetryPolicy()
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "7"
+        assert policy.get_response_delay(0, response) == 7.0
+        response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert policy.get_response_delay(0, response) == 0.0
+        response.headers["Retry-After"] = "600"
+        assert policy.get_response_delay(0, response) is None
+
+    def test_no_retry_for_client_errors(self):
+        """Test responses with statuses not in retry_statuses are not retried."""
+        response = requests.Response()
+        response.status_code = 404
+        assert RetryPolicy().get_response_delay(0, response) is None